@@ -26,6 +26,27 @@ def create_app(config_name='development'):
     oauth.init_app(app)
     cors.init_app(app)
     
+    from .services.suggest_index import suggest_index
+    suggest_index.init_app(app)
+    
+    from .services.geo_index import course_geo_index
+    course_geo_index.init_app(app)
+    
+    from .services.rate_limit import rate_limiter
+    rate_limiter.init_app(app)
+    
+    from .services.password_hashing import password_hasher
+    password_hasher.init_app(app)
+    
+    from .services.tokens import token_service
+    token_service.init_app(app)
+    
+    from .services.circuit_breaker import golf_api_breaker
+    golf_api_breaker.init_app(app)
+    
+    from .services.job_queue import job_queue
+    job_queue.init_app(app)
+    
     # Set up login manager
     login_manager.login_view = 'auth.login'
     login_manager.login_message_category = 'info'
@@ -46,6 +67,12 @@ def create_app(config_name='development'):
     from .api.votes import votes as votes_blueprint
     app.register_blueprint(votes_blueprint, url_prefix='/api/votes')
     
+    from .api.suggest import suggest as suggest_blueprint
+    app.register_blueprint(suggest_blueprint, url_prefix='/api/suggest')
+    
+    from .api.imports import imports as imports_blueprint
+    app.register_blueprint(imports_blueprint, url_prefix='/api/imports')
+    
     # Shell context
     @app.shell_context_processor
     def make_shell_context():
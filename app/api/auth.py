@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, flash, current_app, session
 from flask_login import login_user, logout_user, login_required, current_user
 from datetime import datetime
+import os
 
 # Helper function for URL parsing compatibility with different Werkzeug versions
 def safe_url_parse(url):
@@ -14,19 +15,34 @@ def safe_url_parse(url):
         from werkzeug.urls import url_parse
         return url_parse(url)
 
+from sqlalchemy import or_, and_
+from sqlalchemy.exc import IntegrityError
+
 from .. import db, oauth
-from ..models.user import User, Role, init_roles
+from ..models.user import User, Role
+from ..services.password_hashing import HasherBusy
+from ..services.tokens import token_service, TokenError
+from ..services.oauth_metadata import ProviderMetadataCache, CachedMetadataOAuth2App
 
 auth = Blueprint('auth', __name__)
 
-# OAuth setup for Google with Authlib
+# OAuth setup for Google with Authlib; provider metadata and signing keys
+# come from a disk cache shared by all workers
 def setup_oauth(app):
+    discovery_url = app.config.get('GOOGLE_DISCOVERY_URL')
     oauth.register(
         name='google',
         client_id=app.config.get('GOOGLE_ID'),
         client_secret=app.config.get('GOOGLE_SECRET'),
-        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-        client_kwargs={'scope': 'openid email profile'}
+        server_metadata_url=discovery_url,
+        client_kwargs={'scope': 'openid email profile'},
+        client_cls=CachedMetadataOAuth2App
+    )
+    oauth.google.metadata_cache = ProviderMetadataCache(
+        discovery_url,
+        app.config.get('OAUTH_METADATA_CACHE_DIR') or os.path.join(app.instance_path, 'oauth_cache'),
+        default_ttl=app.config.get('OAUTH_METADATA_TTL', 3600),
+        refresh_margin=app.config.get('OAUTH_METADATA_REFRESH_MARGIN', 300)
     )
 
 @auth.record_once
@@ -47,7 +63,13 @@ def login():
         
         user = User.query.filter_by(email=email).first()
         
-        if user is not None and user.verify_password(password):
+        try:
+            authenticated = user is not None and user.verify_password(password)
+        except HasherBusy:
+            flash('The server is busy, please try again in a moment.')
+            return render_template('auth/login.html'), 503
+        
+        if authenticated:
             login_user(user, remember=remember)
             user.last_login = datetime.utcnow()
             db.session.commit()
@@ -88,31 +110,23 @@ def register():
             flash('Passwords do not match.')
             return render_template('auth/register.html')
         
-        if User.query.filter_by(email=email).first():
-            flash('Email already registered.')
-            return render_template('auth/register.html')
-        
-        if User.query.filter_by(username=username).first():
-            flash('Username already taken.')
-            return render_template('auth/register.html')
-        
-        # Get the user role
-        user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
-        if not user_role:
-            # Initialize roles if they don't exist
-            init_roles()
-            user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
-        
-        # Create new user
+        # Create new user; the unique constraints on email and username
+        # reject duplicates, so the happy path is a single INSERT
         user = User(
             username=username,
             email=email,
-            role=user_role
+            role_id=Role.id_for(Role.USER_ROLE)
         )
-        user.password = password
+        try:
+            user.password = password
+        except HasherBusy:
+            flash('The server is busy, please try again in a moment.')
+            return render_template('auth/register.html'), 503
         
-        db.session.add(user)
-        db.session.commit()
+        conflict = _insert_user(user)
+        if conflict:
+            flash(f'{SIGNUP_CONFLICT_MESSAGES[conflict]}.')
+            return render_template('auth/register.html')
         
         flash('You have successfully registered! Please log in.')
         return redirect(url_for('auth.login'))
@@ -120,6 +134,47 @@ def register():
     return render_template('auth/register.html')
 
 
+SIGNUP_CONFLICT_MESSAGES = {
+    'email': 'Email already registered',
+    'username': 'Username already taken'
+}
+
+
+def _insert_user(user):
+    """Insert a new user in one statement, relying on the unique constraints.
+    
+    Returns None on success, or 'email' / 'username' for the conflicting field.
+    """
+    db.session.add(user)
+    try:
+        db.session.commit()
+        return None
+    except IntegrityError:
+        db.session.rollback()
+    
+    # Only the failure path pays for a lookup to name the conflict
+    if user.email is not None and User.query.filter_by(email=user.email).first():
+        return 'email'
+    return 'username'
+
+
+def _free_username(base_username):
+    """First of base, base1, base2, ... not yet taken, found with a single query"""
+    pattern = base_username.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    taken = set(
+        username for (username,) in db.session.query(User.username).filter(
+            User.username.like(pattern, escape='\\')
+        )
+    )
+    
+    username = base_username
+    counter = 1
+    while username in taken:
+        username = f"{base_username}{counter}"
+        counter += 1
+    return username
+
+
 # OAuth routes
 @auth.route('/login/google')
 def google_login():
@@ -137,48 +192,47 @@ def google_authorized():
         flash(f'Access denied: {str(e)}')
         return redirect(url_for('auth.login'))
     
-    # Check if user exists with this OAuth ID
-    user = User.query.filter_by(oauth_id=user_info['sub'], oauth_provider='google').first()
+    # Find the user by OAuth ID or email in one query, preferring the OAuth match
+    candidates = User.query.filter(or_(
+        and_(User.oauth_id == user_info['sub'], User.oauth_provider == 'google'),
+        User.email == user_info['email']
+    )).all()
+    user = next((u for u in candidates if u.oauth_id == user_info['sub'] and u.oauth_provider == 'google'), None)
+    created = False
     
     if not user:
-        # Check if user exists with this email
-        user = User.query.filter_by(email=user_info['email']).first()
+        user = candidates[0] if candidates else None
         
         if user:
             # Update existing user with OAuth info
             user.oauth_id = user_info['sub']
             user.oauth_provider = 'google'
         else:
-            # Create new user
-            username = user_info['email'].split('@')[0]
-            base_username = username
-            counter = 1
-            
-            # Ensure username is unique
-            while User.query.filter_by(username=username).first():
-                username = f"{base_username}{counter}"
-                counter += 1
+            # Create new user under the first free username; retry only if a
+            # concurrent signup claims the same name between lookup and insert
+            base_username = user_info['email'].split('@')[0]
+            for _ in range(3):
+                user = User(
+                    username=_free_username(base_username),
+                    email=user_info['email'],
+                    oauth_id=user_info['sub'],
+                    oauth_provider='google',
+                    profile_picture=user_info.get('picture'),
+                    role_id=Role.id_for(Role.USER_ROLE),
+                    last_login=datetime.utcnow()
+                )
+                conflict = _insert_user(user)
+                if conflict != 'username':
+                    break
+            created = conflict is None
             
-            # Get the user role
-            user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
-            if not user_role:
-                # Initialize roles if they don't exist
-                init_roles()
-                user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
-            
-            user = User(
-                username=username,
-                email=user_info['email'],
-                oauth_id=user_info['sub'],
-                oauth_provider='google',
-                profile_picture=user_info.get('picture'),
-                role=user_role
-            )
-            
-            db.session.add(user)
+            if conflict:
+                flash('Could not create your account, please try again.')
+                return redirect(url_for('auth.login'))
     
-    user.last_login = datetime.utcnow()
-    db.session.commit()
+    if not created:
+        user.last_login = datetime.utcnow()
+        db.session.commit()
     
     login_user(user)
     flash('You have been logged in.')
@@ -191,6 +245,13 @@ def google_authorized():
 
 
 # API routes for authentication
+def _server_busy():
+    return jsonify({
+        'success': False,
+        'message': 'Server busy, please retry shortly'
+    }), 503, {'Retry-After': '1'}
+
+
 @auth.route('/api/login', methods=['POST'])
 def api_login():
     data = request.get_json()
@@ -199,12 +260,17 @@ def api_login():
     
     user = User.query.filter_by(email=email).first()
     
-    if user is not None and user.verify_password(password):
+    try:
+        authenticated = user is not None and user.verify_password(password)
+    except HasherBusy:
+        return _server_busy()
+    
+    if authenticated:
         login_user(user)
         user.last_login = datetime.utcnow()
         db.session.commit()
         
-        return jsonify({
+        response = {
             'success': True,
             'user': {
                 'id': user.id,
@@ -213,7 +279,11 @@ def api_login():
                 'profile_url': user.profile_url,
                 'role': user.role.name
             }
-        }), 200
+        }
+        if token_service.secret:
+            response.update(token_service.issue_tokens(user))
+        
+        return jsonify(response), 200
     
     return jsonify({
         'success': False,
@@ -228,46 +298,87 @@ def api_register():
     email = data.get('email')
     password = data.get('password')
     
-    # Validate data
-    if User.query.filter_by(email=email).first():
+    # Create new user; duplicates are rejected by the unique constraints
+    user = User(
+        username=username,
+        email=email,
+        role_id=Role.id_for(Role.USER_ROLE)
+    )
+    try:
+        user.password = password
+    except HasherBusy:
+        return _server_busy()
+    
+    conflict = _insert_user(user)
+    if conflict:
         return jsonify({
             'success': False,
-            'message': 'Email already registered'
+            'message': SIGNUP_CONFLICT_MESSAGES[conflict]
         }), 400
     
-    if User.query.filter_by(username=username).first():
+    return jsonify({
+        'success': True,
+        'message': 'User registered successfully'
+    }), 201
+
+
+@auth.route('/api/token/refresh', methods=['POST'])
+def api_refresh_token():
+    """Exchange a refresh token for a new access/refresh pair (the old one is revoked)"""
+    data = request.get_json() or {}
+    refresh_token = data.get('refresh_token')
+    
+    if not refresh_token:
         return jsonify({
             'success': False,
-            'message': 'Username already taken'
+            'message': 'refresh_token is required'
         }), 400
     
-    # Get the user role
-    user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
-    if not user_role:
-        # Initialize roles if they don't exist
-        init_roles()
-        user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
+    try:
+        tokens = token_service.refresh(refresh_token)
+    except TokenError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 401
     
-    # Create new user
-    user = User(
-        username=username,
-        email=email,
-        role=user_role
-    )
-    user.password = password
+    return jsonify(dict(success=True, **tokens)), 200
+
+
+@auth.route('/api/token/revoke', methods=['POST'])
+def api_revoke_token():
+    """Revoke the bearer access token and, if given, the refresh token's whole family"""
+    data = request.get_json(silent=True) or {}
+    
+    access_claims = token_service.bearer_claims()
+    if access_claims:
+        token_service.revoke(access_claims['jti'], access_claims['exp'], commit=False)
+    
+    refresh_token = data.get('refresh_token')
+    if refresh_token:
+        try:
+            refresh_claims = token_service.decode(refresh_token, 'refresh')
+        except TokenError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        token_service.revoke_family(refresh_claims['fam'], commit=False)
     
-    db.session.add(user)
     db.session.commit()
     
     return jsonify({
         'success': True,
-        'message': 'User registered successfully'
-    }), 201
+        'message': 'Token revoked'
+    }), 200
 
 
 @auth.route('/api/logout', methods=['POST'])
 @login_required
 def api_logout():
+    access_claims = token_service.bearer_claims()
+    if access_claims:
+        token_service.revoke(access_claims['jti'], access_claims['exp'])
     logout_user()
     return jsonify({
         'success': True,
@@ -8,6 +8,8 @@ from .. import db
 from ..models.club import Club, ClubBrand, ClubType
 from ..models.user import Role
 from ..models.vote import Vote
+from ..services.suggest_index import suggest_index
+from ..services.rate_limit import rate_limit
 
 clubs = Blueprint('clubs', __name__)
 
@@ -29,7 +31,7 @@ def employee_required(f):
 def get_clubs():
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
-    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name'
+    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name', 'discussed'
     brand_id = request.args.get('brand_id', type=int)
     club_type_id = request.args.get('club_type_id', type=int)
     
@@ -48,6 +50,8 @@ def get_clubs():
         query = query.order_by(desc(Club.created_at))
     elif sort_by == 'name':
         query = query.order_by(Club.name)
+    elif sort_by == 'discussed':
+        query = query.order_by(desc(Club.comment_count), desc(Club.id))
     else:  # Default: sort by votes
         # This is a simplified version - would need a subquery for accurate vote sorting
         # For now, using a simple approach
@@ -78,6 +82,7 @@ def get_clubs():
                 'brand': club.brand.name if club.brand else None,
                 'type': club.club_type.name if club.club_type else None,
                 'vote_score': vote_score,
+                'comment_count': club.comment_count,
                 'upvotes': club.upvote_count,
                 'downvotes': club.downvote_count
             })
@@ -106,6 +111,7 @@ def get_clubs():
             'brand': club.brand.name if club.brand else None,
             'type': club.club_type.name if club.club_type else None,
             'vote_score': club.vote_score,
+            'comment_count': club.comment_count,
             'upvotes': club.upvote_count,
             'downvotes': club.downvote_count
         })
@@ -161,6 +167,7 @@ def get_club(club_id):
             'description': club.club_type.description
         } if club.club_type else None,
         'vote_score': club.vote_score,
+        'comment_count': club.comment_count,
         'upvotes': club.upvote_count,
         'downvotes': club.downvote_count,
         'user_vote': user_vote,
@@ -225,8 +232,14 @@ def create_club():
         club.approved_by = current_user.id
     
     db.session.add(club)
+    if club.is_approved:
+        # Other processes' copies of the index rebuild once this commits
+        suggest_index.mark_changed()
     db.session.commit()
     
+    if club.is_approved:
+        suggest_index.add('club', club.id, club.name)
+    
     return jsonify({
         'success': True,
         'message': 'Club created successfully',
@@ -276,8 +289,14 @@ def update_club(club_id):
             club.approved_by = current_user.id
     
     club.updated_at = datetime.utcnow()
+    suggest_index.mark_changed()
     db.session.commit()
     
+    if club.is_approved:
+        suggest_index.add('club', club.id, club.name)
+    else:
+        suggest_index.remove('club', club.id)
+    
     return jsonify({
         'success': True,
         'message': 'Club updated successfully',
@@ -291,8 +310,11 @@ def delete_club(club_id):
     club = Club.query.get_or_404(club_id)
     
     db.session.delete(club)
+    suggest_index.mark_changed()
     db.session.commit()
     
+    suggest_index.remove('club', club_id)
+    
     return jsonify({
         'success': True,
         'message': 'Club deleted successfully'
@@ -301,6 +323,7 @@ def delete_club(club_id):
 
 @clubs.route('/<int:club_id>/vote', methods=['POST'])
 @login_required
+@rate_limit('vote')
 def vote_club(club_id):
     club = Club.query.get_or_404(club_id)
     
@@ -331,12 +354,16 @@ def vote_club(club_id):
         # Remove vote if it exists
         if existing_vote:
             db.session.delete(existing_vote)
+            suggest_index.mark_changed()
             db.session.commit()
         
+        vote_score = club.vote_score
+        suggest_index.set_weight('club', club.id, vote_score)
+        
         return jsonify({
             'success': True,
             'message': 'Vote removed',
-            'vote_score': club.vote_score,
+            'vote_score': vote_score,
             'upvotes': club.upvote_count,
             'downvotes': club.downvote_count
         })
@@ -356,12 +383,16 @@ def vote_club(club_id):
         )
         db.session.add(vote)
     
+    suggest_index.mark_changed()
     db.session.commit()
     
+    vote_score = club.vote_score
+    suggest_index.set_weight('club', club.id, vote_score)
+    
     return jsonify({
         'success': True,
         'message': f'Vote {"up" if vote_value else "down"} recorded',
-        'vote_score': club.vote_score,
+        'vote_score': vote_score,
         'upvotes': club.upvote_count,
         'downvotes': club.downvote_count
     })
@@ -500,6 +531,7 @@ def get_approval_queue():
             'brand': club.brand.name if club.brand else None,
             'type': club.club_type.name if club.club_type else None,
             'submitted_by': club.submitter.username if club.submitter else None,
+            'comment_count': club.comment_count,
             'created_at': club.created_at
         })
     
@@ -527,8 +559,11 @@ def approve_club(club_id):
     club.approved_by = current_user.id
     club.updated_at = datetime.utcnow()
     
+    suggest_index.mark_changed()
     db.session.commit()
     
+    suggest_index.add('club', club.id, club.name)
+    
     return jsonify({
         'success': True,
         'message': 'Club approved successfully'
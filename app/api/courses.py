@@ -8,9 +8,14 @@ from ..models.course import Course, CourseHole
 from ..models.user import Role
 from ..models.vote import Vote
 from ..services.golf_api import GolfAPIService
+from ..services.geo_index import course_geo_index
+from ..services.circuit_breaker import golf_api_breaker
 
 courses = Blueprint('courses', __name__)
 
+MAX_NEARBY_RADIUS_KM = 500
+MAX_NEARBY_LIMIT = 100
+
 # Decorator for checking if user is employee or admin
 def employee_required(f):
     @login_required
@@ -28,7 +33,7 @@ def employee_required(f):
 def get_courses():
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
-    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name'
+    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name', 'discussed'
     
     # Base query for approved courses
     query = Course.query.filter_by(is_approved=True)
@@ -38,6 +43,8 @@ def get_courses():
         query = query.order_by(desc(Course.created_at))
     elif sort_by == 'name':
         query = query.order_by(Course.name)
+    elif sort_by == 'discussed':
+        query = query.order_by(desc(Course.comment_count), desc(Course.id))
     else:  # Default: sort by votes
         # This is a simplified version - would need a subquery for accurate vote sorting
         courses_with_votes = []
@@ -61,10 +68,11 @@ def get_courses():
                 'name': course.name,
                 'location': f"{course.city}, {course.state}" if course.city and course.state else course.country,
                 'image_url': course.image_url,
-                'par': course.par,
-                'length_yards': course.length_yards,
+                'par': course.total_par,
+                'length_yards': course.total_yards,
                 'course_type': course.course_type,
                 'vote_score': vote_score,
+                'comment_count': course.comment_count,
                 'upvotes': course.upvote_count,
                 'downvotes': course.downvote_count
             })
@@ -87,10 +95,11 @@ def get_courses():
             'name': course.name,
             'location': f"{course.city}, {course.state}" if course.city and course.state else course.country,
             'image_url': course.image_url,
-            'par': course.par,
-            'length_yards': course.length_yards,
+            'par': course.total_par,
+            'length_yards': course.total_yards,
             'course_type': course.course_type,
             'vote_score': course.vote_score,
+            'comment_count': course.comment_count,
             'upvotes': course.upvote_count,
             'downvotes': course.downvote_count
         })
@@ -103,6 +112,89 @@ def get_courses():
         'pages': paginated_courses.pages
     })
 
+@courses.route('/nearby', methods=['GET'])
+def get_nearby_courses():
+    """Approved courses within `radius` km of a point, from the local geo index"""
+    latitude = request.args.get('lat', type=float)
+    longitude = request.args.get('lng', type=float)
+    radius = request.args.get('radius', 50.0, type=float)
+    limit = request.args.get('limit', current_app.config.get('ITEMS_PER_PAGE', 20), type=int)
+    sort_by = request.args.get('sort_by', 'distance')  # 'distance', 'votes'
+    
+    if latitude is None or longitude is None:
+        return jsonify({
+            'success': False,
+            'message': 'lat and lng are required'
+        }), 400
+    
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        return jsonify({
+            'success': False,
+            'message': 'lat must be within [-90, 90] and lng within [-180, 180]'
+        }), 400
+    
+    if radius <= 0 or radius > MAX_NEARBY_RADIUS_KM:
+        return jsonify({
+            'success': False,
+            'message': f'radius must be between 0 and {MAX_NEARBY_RADIUS_KM} km'
+        }), 400
+    
+    if sort_by not in ['distance', 'votes']:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid sort_by. Must be "distance" or "votes"'
+        }), 400
+    
+    limit = max(1, min(limit, MAX_NEARBY_LIMIT))
+    matches = course_geo_index.nearby(latitude, longitude, radius, limit=limit, sort_by=sort_by)
+    
+    # Load the matched courses in one query and keep the index ordering
+    courses_by_id = {}
+    if matches:
+        courses_by_id = {
+            course.id: course
+            for course in Course.query.filter(Course.id.in_([course_id for course_id, _ in matches]))
+        }
+    
+    courses_data = []
+    for course_id, distance in matches:
+        course = courses_by_id.get(course_id)
+        if course is None:
+            continue
+        courses_data.append({
+            'id': course.id,
+            'name': course.name,
+            'location': f"{course.city}, {course.state}" if course.city and course.state else course.country,
+            'image_url': course.image_url,
+            'par': course.total_par,
+            'length_yards': course.total_yards,
+            'course_type': course.course_type,
+            'latitude': course.latitude,
+            'longitude': course.longitude,
+            'distance_km': round(distance, 3),
+            'vote_score': course_geo_index.vote_score(course.id),
+            'comment_count': course.comment_count
+        })
+    
+    return jsonify({
+        'courses': courses_data,
+        'lat': latitude,
+        'lng': longitude,
+        'radius': radius,
+        'sort_by': sort_by
+    })
+
+@courses.route('/golf-api/status', methods=['GET'])
+@employee_required
+def golf_api_status():
+    """Circuit breaker state and response cache statistics for this worker"""
+    service = GolfAPIService()
+    return jsonify({
+        'success': True,
+        'breaker': golf_api_breaker.stats(),
+        'cache': service.cache.stats() if service.cache is not None else None
+    })
+
 @courses.route('/<int:course_id>', methods=['GET'])
 def get_course(course_id):
     course = Course.query.get_or_404(course_id)
@@ -125,17 +217,19 @@ def get_course(course_id):
         if vote:
             user_vote = 'up' if vote.vote_type else 'down'
     
-    # Get course holes
-    holes_data = []
-    for hole in course.holes.order_by(CourseHole.hole_number):
-        holes_data.append({
-            'hole_number': hole.hole_number,
-            'par': hole.par,
-            'yards': hole.yards,
-            'handicap': hole.handicap,
-            'description': hole.description,
-            'image_url': hole.image_url
-        })
+    # Get course holes, from the packed scorecard when it has been materialized
+    holes_data = course.scorecard_holes
+    if holes_data is None:
+        holes_data = []
+        for hole in course.holes.order_by(CourseHole.hole_number):
+            holes_data.append({
+                'hole_number': hole.hole_number,
+                'par': hole.par,
+                'yards': hole.yards,
+                'handicap': hole.handicap,
+                'description': hole.description,
+                'image_url': hole.image_url
+            })
     
     return jsonify({
         'id': course.id,
@@ -154,14 +248,15 @@ def get_course(course_id):
         'architect': course.architect,
         'course_type': course.course_type,
         'num_holes': course.num_holes,
-        'par': course.par,
-        'length_yards': course.length_yards,
+        'par': course.total_par,
+        'length_yards': course.total_yards,
         'latitude': course.latitude,
         'longitude': course.longitude,
         'image_url': course.image_url,
         'logo_url': course.logo_url,
         'holes': holes_data,
         'vote_score': course.vote_score,
+        'comment_count': course.comment_count,
         'upvotes': course.upvote_count,
         'downvotes': course.downvote_count,
         'user_vote': user_vote,
@@ -0,0 +1,115 @@
+import os
+import uuid
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+from werkzeug.utils import secure_filename
+
+from ..services.job_queue import job_queue, job_payload
+
+imports = Blueprint('imports', __name__)
+
+CSV_IMPORT_KINDS = {
+    'clubs': 'clubs_csv',
+    'players': 'players_csv',
+    'kaggle-players': 'kaggle_players'
+}
+
+# Decorator for checking if user is employee or admin
+def employee_required(f):
+    @login_required
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_employee():
+            return jsonify({
+                'success': False,
+                'message': 'Employee or admin privileges required'
+            }), 403
+        return f(*args, **kwargs)
+    decorated_function.__name__ = f.__name__
+    return decorated_function
+
+@imports.route('/<kind>', methods=['POST'])
+@employee_required
+def submit_csv_import(kind):
+    """Queue a CSV import; the upload is stored until a worker picks it up"""
+    if kind not in CSV_IMPORT_KINDS:
+        return jsonify({
+            'success': False,
+            'message': f"Unknown import type: {kind}"
+        }), 404
+    
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return jsonify({
+            'success': False,
+            'message': 'A CSV file is required'
+        }), 400
+    
+    os.makedirs(job_queue.upload_dir, exist_ok=True)
+    file_path = os.path.join(job_queue.upload_dir, f"{uuid.uuid4().hex}-{secure_filename(file.filename)}")
+    file.save(file_path)
+    
+    job_id = job_queue.submit(
+        CSV_IMPORT_KINDS[kind],
+        params={'filename': file.filename},
+        file_path=file_path,
+        submitted_by=current_user.id
+    )
+    return jsonify({
+        'success': True,
+        'job': job_payload(job_queue.get(job_id))
+    }), 202
+
+@imports.route('/golf-api', methods=['POST'])
+@employee_required
+def submit_golf_api_import():
+    """Queue a GolfAPI bulk course import for the given search criteria"""
+    data = request.get_json(silent=True) or {}
+    params = {key: data.get(key) for key in ('query', 'latitude', 'longitude', 'radius', 'limit')
+              if data.get(key) is not None}
+    
+    job_id = job_queue.submit('golf_api_courses', params=params, submitted_by=current_user.id)
+    return jsonify({
+        'success': True,
+        'job': job_payload(job_queue.get(job_id))
+    }), 202
+
+@imports.route('', methods=['GET'])
+@employee_required
+def list_imports():
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    status = request.args.get('status')
+    return jsonify({
+        'success': True,
+        'jobs': [job_payload(job) for job in job_queue.recent(limit, status)]
+    })
+
+@imports.route('/<int:job_id>', methods=['GET'])
+@employee_required
+def get_import(job_id):
+    """Status and progress (rows processed, rows/sec) of an import job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'message': 'Import job not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job_payload(job)
+    })
+
+@imports.route('/<int:job_id>/cancel', methods=['POST'])
+@employee_required
+def cancel_import(job_id):
+    """Cancel a queued job, or ask its worker to stop a running one"""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'message': 'Import job not found'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job_payload(job)
+    })
@@ -15,7 +15,7 @@ players = Blueprint('players', __name__)
 def get_players():
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
-    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name', 'rank'
+    sort_by = request.args.get('sort_by', 'votes')  # 'votes', 'newest', 'name', 'rank', 'discussed'
     
     # Base query for approved players
     query = Player.query.filter_by(is_approved=True)
@@ -25,6 +25,8 @@ def get_players():
         query = query.order_by(desc(Player.created_at))
     elif sort_by == 'name':
         query = query.order_by(Player.name)
+    elif sort_by == 'discussed':
+        query = query.order_by(desc(Player.comment_count), desc(Player.id))
     elif sort_by == 'rank':
         query = query.order_by(Player.world_ranking)
     else:  # Default: sort by votes
@@ -52,6 +54,7 @@ def get_players():
                 'country': player.country,
                 'world_ranking': player.world_ranking,
                 'vote_score': vote_score,
+                'comment_count': player.comment_count,
                 'upvotes': player.upvote_count,
                 'downvotes': player.downvote_count
             })
@@ -76,6 +79,7 @@ def get_players():
             'country': player.country,
             'world_ranking': player.world_ranking,
             'vote_score': player.vote_score,
+            'comment_count': player.comment_count,
             'upvotes': player.upvote_count,
             'downvotes': player.downvote_count
         })
@@ -136,6 +140,7 @@ def get_player(player_id):
         'world_ranking': player.world_ranking,
         'achievements': achievements,
         'vote_score': player.vote_score,
+        'comment_count': player.comment_count,
         'upvotes': player.upvote_count,
         'downvotes': player.downvote_count,
         'user_vote': user_vote,
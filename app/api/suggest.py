@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify
+
+from ..services.suggest_index import suggest_index, SUGGEST_MODELS
+
+suggest = Blueprint('suggest', __name__)
+
+MAX_SUGGESTIONS = 25
+
+
+@suggest.route('', methods=['GET'])
+def get_suggestions():
+    """Typeahead suggestions for clubs, players and courses"""
+    query = request.args.get('q', '')
+    types = request.args.get('types')
+    limit = min(request.args.get('limit', 10, type=int), MAX_SUGGESTIONS)
+    
+    if types:
+        types = set(t.strip() for t in types.split(',') if t.strip())
+        invalid_types = types - set(SUGGEST_MODELS)
+        if invalid_types:
+            return jsonify({
+                'success': False,
+                'message': 'Invalid types. Must be a comma-separated list of "club", "player", or "course"'
+            }), 400
+    
+    return jsonify({
+        'query': query,
+        'suggestions': suggest_index.suggest(query, types=types, limit=limit)
+    })
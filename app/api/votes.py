@@ -1,17 +1,40 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 
 from .. import db
 from ..models.vote import Vote, Comment
 from ..models.club import Club
 from ..models.player import Player
 from ..models.course import Course
+from ..services.suggest_index import suggest_index
+from ..services.geo_index import course_geo_index
+from ..services.rate_limit import rate_limit
 
 votes = Blueprint('votes', __name__)
 
+VOTABLE_MODELS = {
+    'club': Club,
+    'player': Player,
+    'course': Course
+}
+
+
+def _adjust_comment_count(commentable_type, commentable_id, delta):
+    """Apply a comment count change on the commented item inside the current transaction"""
+    model = VOTABLE_MODELS[commentable_type]
+    model.query.filter(
+        model.id == commentable_id,
+        model.comment_count + delta >= 0
+    ).update(
+        {model.comment_count: model.comment_count + delta},
+        synchronize_session=False
+    )
+
 @votes.route('/', methods=['POST'])
 @login_required
+@rate_limit('vote')
 def add_vote():
     """Add or update a vote on a votable item (club, player, course)"""
     data = request.get_json()
@@ -66,12 +89,20 @@ def add_vote():
         # Remove vote if it exists
         if existing_vote:
             db.session.delete(existing_vote)
+            suggest_index.mark_changed()
+            if votable_type == 'course':
+                course_geo_index.mark_changed()
             db.session.commit()
         
+        vote_score = item.vote_score
+        suggest_index.set_weight(votable_type, item.id, vote_score)
+        if votable_type == 'course':
+            course_geo_index.set_vote_score(item.id, vote_score)
+        
         return jsonify({
             'success': True,
             'message': 'Vote removed',
-            'vote_score': item.vote_score,
+            'vote_score': vote_score,
             'upvotes': item.upvote_count,
             'downvotes': item.downvote_count
         })
@@ -91,18 +122,28 @@ def add_vote():
         )
         db.session.add(vote)
     
+    # Other processes' copies of the indexes pick up the new weight once this commits
+    suggest_index.mark_changed()
+    if votable_type == 'course':
+        course_geo_index.mark_changed()
     db.session.commit()
     
+    vote_score = item.vote_score
+    suggest_index.set_weight(votable_type, item.id, vote_score)
+    if votable_type == 'course':
+        course_geo_index.set_vote_score(item.id, vote_score)
+    
     return jsonify({
         'success': True,
         'message': f'Vote {"up" if vote_value else "down"} recorded',
-        'vote_score': item.vote_score,
+        'vote_score': vote_score,
         'upvotes': item.upvote_count,
         'downvotes': item.downvote_count
     })
 
 @votes.route('/comments', methods=['POST'])
 @login_required
+@rate_limit('comment')
 def add_comment():
     """Add a comment to a votable item (club, player, course)"""
     data = request.get_json()
@@ -160,6 +201,12 @@ def add_comment():
     )
     
     db.session.add(comment)
+    _adjust_comment_count(commentable_type, item.id, 1)
+    if parent_id:
+        Comment.query.filter_by(id=parent_id).update(
+            {Comment.reply_count: Comment.reply_count + 1},
+            synchronize_session=False
+        )
     db.session.commit()
     
     return jsonify({
@@ -174,7 +221,8 @@ def add_comment():
                 'profile_picture': current_user.profile_picture
             },
             'created_at': comment.created_at,
-            'parent_id': comment.parent_id
+            'parent_id': comment.parent_id,
+            'reply_count': 0
         }
     }), 201
 
@@ -229,6 +277,16 @@ def delete_comment(comment_id):
         }), 403
     
     # Soft delete (mark as deleted but keep in DB)
+    if not comment.is_deleted:
+        _adjust_comment_count(comment.commentable_type, comment.commentable_id, -1)
+    if not comment.is_deleted and comment.parent_id:
+        Comment.query.filter(
+            Comment.id == comment.parent_id,
+            Comment.reply_count > 0
+        ).update(
+            {Comment.reply_count: Comment.reply_count - 1},
+            synchronize_session=False
+        )
     comment.is_deleted = True
     comment.content = "[deleted]"  # Optionally clear content
     db.session.commit()
@@ -240,9 +298,11 @@ def delete_comment(comment_id):
 
 @votes.route('/comments', methods=['GET'])
 def get_comments():
-    """Get comments for a votable item"""
+    """Get a page of top-level comments for a votable item, newest first, with their replies nested"""
     commentable_type = request.args.get('commentable_type')
-    commentable_id = request.args.get('commentable_id')
+    commentable_id = request.args.get('commentable_id', type=int)
+    cursor = request.args.get('cursor', type=int)
+    limit = _page_limit()
     
     if not commentable_type or not commentable_id:
         return jsonify({
@@ -256,49 +316,105 @@ def get_comments():
             'message': 'Invalid commentable_type. Must be "club", "player", or "course"'
         }), 400
     
-    # Get top-level comments (not replies)
-    comments = Comment.query.filter_by(
+    # Keyset pagination on id, which increases with created_at
+    query = Comment.query.options(joinedload(Comment.user)).filter_by(
         commentable_type=commentable_type,
         commentable_id=commentable_id,
         parent_id=None,
         is_deleted=False
-    ).order_by(Comment.created_at.desc()).all()
-    
-    comments_data = []
-    for comment in comments:
-        # Get replies for this comment
-        replies = Comment.query.filter_by(
-            parent_id=comment.id,
-            is_deleted=False
-        ).order_by(Comment.created_at).all()
-        
-        replies_data = []
-        for reply in replies:
-            replies_data.append({
-                'id': reply.id,
-                'content': reply.content,
-                'user': {
-                    'id': reply.user.id,
-                    'username': reply.user.username,
-                    'profile_picture': reply.user.profile_picture
-                },
-                'created_at': reply.created_at,
-                'updated_at': reply.updated_at
-            })
-        
-        comments_data.append({
-            'id': comment.id,
-            'content': comment.content,
-            'user': {
-                'id': comment.user.id,
-                'username': comment.user.username,
-                'profile_picture': comment.user.profile_picture
-            },
-            'created_at': comment.created_at,
-            'updated_at': comment.updated_at,
-            'replies': replies_data
-        })
+    )
+    if cursor:
+        query = query.filter(Comment.id < cursor)
+    comments = query.order_by(Comment.id.desc()).limit(limit + 1).all()
     
-    return jsonify({
-        'comments': comments_data
-    })
\ No newline at end of file
+    page = _comment_page(comments, limit)
+    page['comments'] = _build_comment_tree(page['comments'], _load_replies(page['comments']))
+    return jsonify(page)
+
+@votes.route('/comments/<int:comment_id>/replies', methods=['GET'])
+def get_comment_replies(comment_id):
+    """Get a page of direct replies to a comment, oldest first"""
+    cursor = request.args.get('cursor', type=int)
+    limit = _page_limit()
+    
+    query = Comment.query.options(joinedload(Comment.user)).filter_by(
+        parent_id=comment_id,
+        is_deleted=False
+    )
+    if cursor:
+        query = query.filter(Comment.id > cursor)
+    replies = query.order_by(Comment.id).limit(limit + 1).all()
+    
+    page = _comment_page(replies, limit)
+    page['parent_id'] = comment_id
+    return jsonify(page)
+
+
+def _page_limit():
+    per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
+    limit = request.args.get('limit', per_page, type=int)
+    return max(1, min(limit, current_app.config.get('MAX_COMMENTS_PER_PAGE', 100)))
+
+
+def _comment_page(comments, limit):
+    """Serialize a page fetched with limit + 1 rows into comments and next_cursor"""
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    return {
+        'comments': [_comment_payload(comment) for comment in comments],
+        'next_cursor': str(comments[-1].id) if has_more else None
+    }
+
+
+def _load_replies(roots):
+    """Every non-deleted reply under the given top-level comments, all depths, oldest first, in one query.
+
+    Replies under a deleted comment are dropped along with their subtree.
+    """
+    if not roots:
+        return []
+    
+    subtree = db.select(Comment.id).where(
+        Comment.parent_id.in_([root['id'] for root in roots]),
+        Comment.is_deleted == False  # noqa: E712
+    ).cte('subtree', recursive=True)
+    subtree = subtree.union_all(
+        db.select(Comment.id).where(
+            Comment.parent_id == subtree.c.id,
+            Comment.is_deleted == False  # noqa: E712
+        )
+    )
+    return Comment.query.options(joinedload(Comment.user)).filter(
+        Comment.id.in_(db.select(subtree.c.id))
+    ).order_by(Comment.id).all()
+
+
+def _build_comment_tree(roots, replies):
+    """Nest replies (oldest first) under their parents in O(n), keeping the order of `roots`"""
+    nodes = {}
+    for node in roots:
+        node['replies'] = []
+        nodes[node['id']] = node
+    
+    for reply in replies:
+        node = nodes[reply.id] = _comment_payload(reply)
+        node['replies'] = []
+        if reply.parent_id in nodes:
+            nodes[reply.parent_id]['replies'].append(node)
+    return roots
+
+
+def _comment_payload(comment):
+    return {
+        'id': comment.id,
+        'content': comment.content,
+        'user': {
+            'id': comment.user.id,
+            'username': comment.user.username,
+            'profile_picture': comment.user.profile_picture
+        },
+        'created_at': comment.created_at,
+        'updated_at': comment.updated_at,
+        'parent_id': comment.parent_id,
+        'reply_count': comment.reply_count
+    }
@@ -12,22 +12,81 @@ class Config:
     # Golf API Configuration with safe defaults
     GOLF_API_KEY = os.environ.get('GOLF_API_KEY', '')
     GOLF_API_BASE_URL = os.environ.get('GOLF_API_BASE_URL', 'https://golf-api.example.com')
+    GOLF_API_CONNECT_TIMEOUT = 3.05  # seconds
+    GOLF_API_READ_TIMEOUT = 10  # seconds
+    GOLF_API_POOL_SIZE = 10  # keep-alive connections per worker process
+    GOLF_API_MAX_RETRIES = 3  # on connection errors, 429 and 5xx
+    GOLF_API_BACKOFF_FACTOR = 0.5  # sleeps 0.5s, 1s, 2s ... plus jitter
+    GOLF_API_BACKOFF_JITTER = 0.5  # seconds of random jitter added to each backoff
+    GOLF_API_RATE_LIMIT = (10.0, 10)  # client-side quota per process: (requests per second, burst)
+    GOLF_API_CONCURRENCY = 8  # parallel upstream requests during bulk imports
+    GOLF_API_PAGE_SIZE = 100  # search results requested per page during bulk imports
+    GOLF_API_WRITE_BATCH = 50  # courses per commit during bulk imports and resyncs
+    GOLF_API_RESYNC_MAX_AGE = timedelta(days=7)  # resync courses not refreshed for this long
+    
+    # On-disk GolfAPI response cache, shared by workers; also served when the upstream is down
+    GOLF_API_CACHE_ENABLED = True
+    GOLF_API_CACHE_PATH = os.environ.get('GOLF_API_CACHE_PATH', 'pars_golf_api_cache.db')
+    GOLF_API_CACHE_MAX_BYTES = int(os.environ.get('GOLF_API_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    GOLF_API_CACHE_DEFAULT_TTL = 24 * 3600  # seconds, when the upstream sends no Cache-Control
+    
+    # Circuit breaker: open when >= FAILURE_THRESHOLD of at least MIN_CALLS calls in WINDOW seconds fail
+    GOLF_API_BREAKER_ENABLED = True
+    GOLF_API_BREAKER_WINDOW = 30  # seconds
+    GOLF_API_BREAKER_MIN_CALLS = 10
+    GOLF_API_BREAKER_FAILURE_THRESHOLD = 0.5
+    GOLF_API_BREAKER_RESET_TIMEOUT = 30  # seconds open before probing the upstream again
+    GOLF_API_BREAKER_HALF_OPEN_CALLS = 1  # successful probes needed to close again
     
     # OAuth Configuration with safe defaults
     GOOGLE_ID = os.environ.get('GOOGLE_ID', '')
     GOOGLE_SECRET = os.environ.get('GOOGLE_SECRET', '')
+    GOOGLE_DISCOVERY_URL = os.environ.get('GOOGLE_DISCOVERY_URL', 'https://accounts.google.com/.well-known/openid-configuration')
+    
+    # Provider discovery document and JWKS cache, shared by workers on disk
+    OAUTH_METADATA_CACHE_DIR = os.environ.get('OAUTH_METADATA_CACHE_DIR')  # defaults to <instance>/oauth_cache
+    OAUTH_METADATA_TTL = 3600  # seconds, when the provider sends no Cache-Control
+    OAUTH_METADATA_REFRESH_MARGIN = 300  # refresh in the background this long before expiry
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-dev-key-for-development-only')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    JWT_REVOCATION_REFRESH = 30  # seconds between reloads of the revocation list per worker
     
     # File Upload Configuration
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static/uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload
     
+    # Password hashing pool; changing the method rehashes passwords on next login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.environ.get('PASSWORD_HASH_QUEUE_DEPTH', 16))
+    PASSWORD_HASH_TIMEOUT = 10  # seconds
+    
+    # Write rate limits per endpoint class: (tokens per second, burst)
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')  # 'memory' or 'sqlite' (shared by workers)
+    RATE_LIMIT_SQLITE_PATH = os.environ.get('RATE_LIMIT_SQLITE_PATH', 'pars_golf_ratelimit.db')
+    RATE_LIMITS = {
+        'vote': (1.0, 20),
+        'comment': (0.2, 5)
+    }
+    
+    # Background import jobs, run by `flask import-worker` processes
+    IMPORT_QUEUE_PATH = os.environ.get('IMPORT_QUEUE_PATH', 'pars_golf_jobs.db')
+    IMPORT_UPLOAD_DIR = os.environ.get('IMPORT_UPLOAD_DIR')  # defaults to <instance>/imports
+    IMPORT_PROGRESS_INTERVAL = 1.0  # seconds between progress writes (and cancellation checks)
+    IMPORT_JOB_STALE_AFTER = 300  # seconds without progress before a running job is requeued
+    IMPORT_CHUNK_SIZE = 5000  # CSV rows read, converted and committed at a time
+    IMPORT_MAX_ERROR_DETAILS = 100  # per-row errors kept in an import result; the rest are only counted
+    
+    # In-process suggest and geo indexes reload when another process (e.g. an import worker) changed their data
+    INDEX_GENERATION_CHECK_INTERVAL = 5  # seconds between checks of the shared index generation per worker
+    
     # Pars.Golf Specific Configuration
     ITEMS_PER_PAGE = 20
+    MAX_COMMENTS_PER_PAGE = 100
     
     # Ensure upload directory exists
     @staticmethod
@@ -46,6 +105,9 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///pars_golf_test.db'
     WTF_CSRF_ENABLED = False
+    RATE_LIMIT_ENABLED = False
+    GOLF_API_CACHE_ENABLED = False
+    IMPORT_QUEUE_PATH = 'pars_golf_jobs_test.db'
 
 
 class ProductionConfig(Config):
@@ -43,6 +43,9 @@ class Club(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_approved = db.Column(db.Boolean, default=False)
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, index=True)  # Non-deleted comments
+    import_source_key = db.Column(db.String(255), unique=True, index=True, nullable=True)  # club_source_key() of imported clubs
+    import_hash = db.Column(db.String(40), nullable=True)  # content hash of the last imported CSV row
     
     # Foreign keys
     brand_id = db.Column(db.Integer, db.ForeignKey('club_brands.id'))
@@ -54,9 +57,9 @@ class Club(db.Model):
     club_type = db.relationship('ClubType', backref='clubs')
     submitter = db.relationship('User', foreign_keys=[submitted_by], backref='submitted_clubs')
     approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_clubs')
-    votes = db.relationship('Vote', backref='club', lazy='dynamic', 
+    votes = db.relationship('Vote', backref='club', lazy='dynamic', viewonly=True,
                           primaryjoin="and_(Vote.votable_type=='club', "
-                                      "Vote.votable_id==Club.id)")
+                                      "foreign(Vote.votable_id)==Club.id)")
     
     @property
     def vote_score(self):
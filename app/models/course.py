@@ -1,6 +1,63 @@
 from datetime import datetime
+import json
+import struct
 from .. import db
 
+# Packed scorecard layout: one record per hole of
+# (hole number, par, yards, handicap), with all-ones meaning "unknown"
+SCORECARD_HOLE = struct.Struct('<BBHB')
+_NULL_BYTE = 0xFF
+_NULL_SHORT = 0xFFFF
+
+
+def _pack_value(value, null):
+    return null if value is None else int(value)
+
+
+def _unpack_value(value, null):
+    return None if value == null else value
+
+
+def pack_scorecard(holes):
+    """Pack (hole_number, par, yards, handicap) tuples into the compact scorecard blob"""
+    return b''.join(
+        SCORECARD_HOLE.pack(
+            _pack_value(hole_number, _NULL_BYTE),
+            _pack_value(par, _NULL_BYTE),
+            _pack_value(yards, _NULL_SHORT),
+            _pack_value(handicap, _NULL_BYTE)
+        )
+        for hole_number, par, yards, handicap in holes
+    )
+
+
+def scorecard_columns(holes):
+    """Scorecard and hole_notes column values for a course, from hole dicts keyed like CourseHole columns"""
+    holes = sorted(holes, key=lambda hole: hole.get('hole_number') or 0)
+    if not holes:
+        return {'scorecard': None, 'hole_notes': None}
+    
+    scorecard = pack_scorecard(
+        (hole.get('hole_number'), hole.get('par'), hole.get('yards'), hole.get('handicap')) for hole in holes
+    )
+    notes = [[hole.get('description'), hole.get('image_url')] for hole in holes]
+    if not any(description or image_url for description, image_url in notes):
+        notes = None
+    return {'scorecard': scorecard, 'hole_notes': json.dumps(notes) if notes else None}
+
+
+def unpack_scorecard(blob):
+    """Inverse of pack_scorecard"""
+    return [
+        (
+            _unpack_value(hole_number, _NULL_BYTE),
+            _unpack_value(par, _NULL_BYTE),
+            _unpack_value(yards, _NULL_SHORT),
+            _unpack_value(handicap, _NULL_BYTE)
+        )
+        for hole_number, par, yards, handicap in SCORECARD_HOLE.iter_unpack(blob or b'')
+    ]
+
 class Course(db.Model):
     """Golf course model"""
     __tablename__ = 'courses'
@@ -33,13 +90,19 @@ class Course(db.Model):
     image_url = db.Column(db.String(255), nullable=True)
     logo_url = db.Column(db.String(255), nullable=True)
     
+    # Compact scorecard materialized from course_holes (see refresh_scorecard)
+    scorecard = db.Column(db.LargeBinary, nullable=True)
+    hole_notes = db.Column(db.Text, nullable=True)  # JSON [description, image_url] per hole, if any
+    
     # Golf API data
     golf_api_id = db.Column(db.String(64), nullable=True, unique=True)
+    golf_api_synced_at = db.Column(db.DateTime, nullable=True, index=True)  # Last import/resync from the API
     
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_approved = db.Column(db.Boolean, default=False)
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, index=True)  # Non-deleted comments
     
     # Foreign keys
     submitted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -49,9 +112,9 @@ class Course(db.Model):
     submitter = db.relationship('User', foreign_keys=[submitted_by], backref='submitted_courses')
     approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_courses')
     holes = db.relationship('CourseHole', backref='course', lazy='dynamic')
-    votes = db.relationship('Vote', backref='course', lazy='dynamic', 
+    votes = db.relationship('Vote', backref='course', lazy='dynamic', viewonly=True,
                           primaryjoin="and_(Vote.votable_type=='course', "
-                                      "Vote.votable_id==Course.id)")
+                                      "foreign(Vote.votable_id)==Course.id)")
     
     @property
     def vote_score(self):
@@ -91,6 +154,61 @@ class Course(db.Model):
             vote_type=False
         ).count()
     
+    def refresh_scorecard(self, holes=None):
+        """Rebuild the packed scorecard from this course's holes"""
+        if holes is None:
+            holes = self.holes.all()
+        
+        columns = scorecard_columns([
+            {
+                'hole_number': hole.hole_number,
+                'par': hole.par,
+                'yards': hole.yards,
+                'handicap': hole.handicap,
+                'description': hole.description,
+                'image_url': hole.image_url
+            }
+            for hole in holes
+        ])
+        self.scorecard = columns['scorecard']
+        self.hole_notes = columns['hole_notes']
+    
+    @property
+    def scorecard_holes(self):
+        """Hole data served from the packed scorecard, or None if it was never materialized"""
+        if self.scorecard is None:
+            return None
+        
+        notes = json.loads(self.hole_notes) if self.hole_notes else []
+        holes = []
+        for i, (hole_number, par, yards, handicap) in enumerate(unpack_scorecard(self.scorecard)):
+            description, image_url = notes[i] if i < len(notes) else (None, None)
+            holes.append({
+                'hole_number': hole_number,
+                'par': par,
+                'yards': yards,
+                'handicap': handicap,
+                'description': description,
+                'image_url': image_url
+            })
+        return holes
+    
+    @property
+    def total_par(self):
+        """Course par, falling back to the sum of the scorecard"""
+        if self.par is not None or self.scorecard is None:
+            return self.par
+        pars = [par for _, par, _, _ in unpack_scorecard(self.scorecard)]
+        return sum(pars) if pars and None not in pars else None
+    
+    @property
+    def total_yards(self):
+        """Course length, falling back to the sum of the scorecard"""
+        if self.length_yards is not None or self.scorecard is None:
+            return self.length_yards
+        yards = [hole_yards for _, _, hole_yards, _ in unpack_scorecard(self.scorecard)]
+        return sum(yards) if yards and None not in yards else None
+    
     @property
     def full_address(self):
         """Return the full address as a string"""
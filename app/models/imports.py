@@ -0,0 +1,69 @@
+import hashlib
+import json
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from .. import db
+
+class ImportCheckpoint(db.Model):
+    """Resume point of a long-running paged import, keyed by its source and parameters"""
+    __tablename__ = 'import_checkpoints'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), unique=True, nullable=False)
+    source = db.Column(db.String(32), nullable=False)  # e.g. 'golf_api_search'
+    params = db.Column(db.Text, nullable=True)  # JSON of the parameters the key was derived from
+    offset = db.Column(db.Integer, default=0, nullable=False)  # Everything before this is imported
+    completed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @staticmethod
+    def make_key(source, params):
+        canonical = json.dumps([source, params], sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    @classmethod
+    def for_params(cls, source, params):
+        """Load the checkpoint for these parameters, creating an unsaved one at offset 0 if absent"""
+        key = cls.make_key(source, params)
+        checkpoint = cls.query.filter_by(key=key).first()
+        if checkpoint is None:
+            checkpoint = cls(key=key, source=source, params=json.dumps(params, sort_keys=True, default=str), offset=0)
+            db.session.add(checkpoint)
+        return checkpoint
+    
+    def __repr__(self):
+        return f'<ImportCheckpoint {self.source} @{self.offset}>'
+
+
+class IndexGeneration(db.Model):
+    """Change counter for an in-process index, shared by every process using the database"""
+    __tablename__ = 'index_generations'
+    
+    name = db.Column(db.String(32), primary_key=True)  # e.g. 'suggest', 'course_geo'
+    generation = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @classmethod
+    def current(cls, name):
+        """The generation of `name`, 0 if it has never been bumped"""
+        generation = db.session.query(cls.generation).filter_by(name=name).scalar()
+        return generation or 0
+    
+    @classmethod
+    def bump(cls, name):
+        """Advance the generation of `name` as part of the caller's transaction"""
+        updated = cls.query.filter_by(name=name).update(
+            {cls.generation: cls.generation + 1, cls.updated_at: datetime.utcnow()}, synchronize_session=False
+        )
+        if updated:
+            return
+        try:
+            with db.session.begin_nested():
+                db.session.add(cls(name=name, generation=1))
+        except IntegrityError:
+            # Another process created the row first
+            cls.query.filter_by(name=name).update({cls.generation: cls.generation + 1}, synchronize_session=False)
+    
+    def __repr__(self):
+        return f'<IndexGeneration {self.name} #{self.generation}>'
@@ -1,5 +1,7 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 from .. import db
+from ..utils import normalize_name
 
 class Player(db.Model):
     """Golf player model for professionals and notable players"""
@@ -7,6 +9,8 @@ class Player(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), index=True)
+    name_key = db.Column(db.String(128), unique=True, index=True, nullable=True)  # normalize_name(name), import upsert key
+    import_hash = db.Column(db.String(40), nullable=True)  # content hash of the last imported CSV row
     profile_picture = db.Column(db.String(255), nullable=True)
     country = db.Column(db.String(64), nullable=True)
     birthdate = db.Column(db.Date, nullable=True)
@@ -19,6 +23,7 @@ class Player(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_approved = db.Column(db.Boolean, default=False)
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, index=True)  # Non-deleted comments
     
     # Foreign keys
     submitted_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -30,9 +35,14 @@ class Player(db.Model):
     approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_players')
     user_account = db.relationship('User', foreign_keys=[user_account_id], backref='player_profile')
     achievements = db.relationship('PlayerAchievement', backref='player', lazy='dynamic')
-    votes = db.relationship('Vote', backref='player', lazy='dynamic', 
+    votes = db.relationship('Vote', backref='player', lazy='dynamic', viewonly=True,
                           primaryjoin="and_(Vote.votable_type=='player', "
-                                      "Vote.votable_id==Player.id)")
+                                      "foreign(Vote.votable_id)==Player.id)")
+    
+    @validates('name')
+    def _set_name_key(self, key, name):
+        self.name_key = normalize_name(name) or None
+        return name
     
     @property
     def vote_score(self):
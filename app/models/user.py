@@ -1,7 +1,7 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from datetime import datetime
 from .. import db, login_manager
+from ..services.password_hashing import HasherBusy, password_hasher
 import uuid
 
 class Role(db.Model):
@@ -18,6 +18,21 @@ class Role(db.Model):
     ADMIN_ROLE = 'admin'
     PLAYER_ROLE = 'player'  # For VIP/Pro players
     
+    # Role ids by name; roles are reference data, so cache them per process
+    _ids_by_name = {}
+    
+    @classmethod
+    def id_for(cls, name):
+        """Id of the named role, creating the default roles on first use if needed"""
+        role_id = cls._ids_by_name.get(name)
+        if role_id is None:
+            role = cls.query.filter_by(name=name).first()
+            if role is None:
+                init_roles()
+                role = cls.query.filter_by(name=name).first()
+            role_id = cls._ids_by_name[name] = role.id
+        return role_id
+    
     def __repr__(self):
         return f'<Role {self.name}>'
 
@@ -30,7 +45,7 @@ class User(UserMixin, db.Model):
     uuid = db.Column(db.String(36), unique=True, default=lambda: str(uuid.uuid4()))
     username = db.Column(db.String(64), unique=True, index=True)
     email = db.Column(db.String(120), unique=True, index=True)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(256))
     profile_picture = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -53,10 +68,25 @@ class User(UserMixin, db.Model):
     
     @password.setter
     def password(self, password):
-        self.password_hash = generate_password_hash(password)
+        # May raise HasherBusy when the hashing pool is saturated
+        self.password_hash = password_hasher.hash(password)
     
     def verify_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Check a password, upgrading the stored hash if the KDF settings changed.
+        
+        The caller commits. May raise HasherBusy when the hashing pool is saturated
+        while verifying; a busy pool during the upgrade just skips it.
+        """
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+        
+        if password_hasher.needs_rehash(self.password_hash):
+            try:
+                self.password_hash = password_hasher.hash(password)
+            except HasherBusy:
+                # The password was right; upgrade on a later login instead of failing this one
+                pass
+        return True
     
     @property
     def profile_url(self):
@@ -83,6 +113,60 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 
+class TokenUser(UserMixin):
+    """User authenticated from signed access token claims, without a database hit.
+    
+    Identity and role come from the token. Any other attribute (email,
+    profile_picture, ...) transparently loads the User row on first access.
+    """
+    
+    def __init__(self, claims):
+        self.id = int(claims['sub'])
+        self.username = claims.get('username')
+        self.role_name = claims.get('role')
+        self.claims = claims
+        self._user = None
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._user is None:
+            self._user = User.query.get(self.id)
+            if self._user is None:
+                raise AttributeError(name)
+        return getattr(self._user, name)
+    
+    @property
+    def profile_url(self):
+        return f'pars.golf/@{self.username}'
+    
+    def has_role(self, role_name):
+        return self.role_name == role_name
+    
+    def is_admin(self):
+        return self.has_role(Role.ADMIN_ROLE)
+    
+    def is_employee(self):
+        return self.has_role(Role.EMPLOYEE_ROLE) or self.is_admin()
+    
+    def is_player(self):
+        return self.has_role(Role.PLAYER_ROLE)
+    
+    def __repr__(self):
+        return f'<TokenUser {self.username}>'
+
+
+class RevokedToken(db.Model):
+    """Revoked token ids (or refresh token family ids), kept only until they expire"""
+    __tablename__ = 'revoked_tokens'
+    
+    jti = db.Column(db.String(36), primary_key=True)
+    expires_at = db.Column(db.DateTime, index=True)
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
+
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
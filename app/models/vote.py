@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import func, case
 from .. import db
 
 class Vote(db.Model):
@@ -34,6 +35,7 @@ class Comment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_deleted = db.Column(db.Boolean, default=False)
+    reply_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Non-deleted direct replies
     
     # User relationship
     user = db.relationship('User', backref='comments')
@@ -44,5 +46,20 @@ class Comment(db.Model):
                              backref=db.backref('parent', remote_side=[id]),
                              lazy='dynamic')
     
+    # Top-level pages are read by item and replies by parent, both keyed on id
+    __table_args__ = (
+        db.Index('ix_comments_commentable', 'commentable_type', 'commentable_id', 'parent_id', 'id'),
+        db.Index('ix_comments_parent', 'parent_id', 'id'),
+    )
+    
     def __repr__(self):
-        return f'<Comment by User {self.user_id} on {self.commentable_type} {self.commentable_id}>'
\ No newline at end of file
+        return f'<Comment by User {self.user_id} on {self.commentable_type} {self.commentable_id}>'
+
+
+def vote_scores(votable_type, votable_ids=None):
+    """Return {votable_id: upvotes - downvotes} for one votable type in a single query"""
+    score = func.sum(case((Vote.vote_type == True, 1), else_=-1))  # noqa: E712
+    query = db.session.query(Vote.votable_id, score).filter(Vote.votable_type == votable_type)
+    if votable_ids is not None:
+        query = query.filter(Vote.votable_id.in_(list(votable_ids)))
+    return dict(query.group_by(Vote.votable_id).all())
\ No newline at end of file
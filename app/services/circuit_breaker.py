@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+from collections import deque
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Fail-fast guard around an unreliable upstream.
+
+    Outcomes are kept for a rolling window of `window` seconds. The circuit
+    opens when at least `min_calls` calls in the window failed at a rate of
+    `failure_threshold` or more. While it is open, calls are rejected without
+    touching the network. After `reset_timeout` seconds it turns half-open
+    and lets up to `half_open_calls` probes through, one at a time. A
+    successful probe closes the circuit; a failed one reopens it.
+    """
+
+    def __init__(self, name, app=None):
+        self.name = name
+        self.window = 30.0
+        self.min_calls = 10
+        self.failure_threshold = 0.5
+        self.reset_timeout = 30.0
+        self.half_open_calls = 1
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        prefix = f'{self.name.upper()}_BREAKER_'
+        self.window = app.config.get(prefix + 'WINDOW', self.window)
+        self.min_calls = app.config.get(prefix + 'MIN_CALLS', self.min_calls)
+        self.failure_threshold = app.config.get(prefix + 'FAILURE_THRESHOLD', self.failure_threshold)
+        self.reset_timeout = app.config.get(prefix + 'RESET_TIMEOUT', self.reset_timeout)
+        self.half_open_calls = app.config.get(prefix + 'HALF_OPEN_CALLS', self.half_open_calls)
+        self.enabled = app.config.get(prefix + 'ENABLED', True)
+        with self._lock:
+            self._reset()
+        app.extensions[f'{self.name}_breaker'] = self
+
+    def _reset(self):
+        self._state = CLOSED
+        self._outcomes = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_left = 0
+        self._probe_in_flight = False
+        self._counters = {'successes': 0, 'failures': 0, 'rejected': 0, 'trips': 0}
+        self._last_trip_at = None
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def _maybe_half_open(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes_left = self.half_open_calls
+            self._probe_in_flight = False
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+
+    def allow(self):
+        """Return True if a call may go to the upstream now; callers must then record its outcome"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_left > 0 and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._counters['successes'] += 1
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._probes_left -= 1
+                if self._probes_left <= 0:
+                    self._close()
+                return
+            self._record(time.monotonic(), False)
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._counters['failures'] += 1
+            if self._state == HALF_OPEN:
+                self._trip(now)
+                return
+            self._record(now, True)
+            calls = len(self._outcomes)
+            if self._state == CLOSED and calls >= self.min_calls and self._failures / calls >= self.failure_threshold:
+                self._trip(now)
+
+    def _record(self, now, failed):
+        self._outcomes.append((now, failed))
+        self._failures += failed
+        cutoff = now - self.window
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._failures -= self._outcomes.popleft()[1]
+
+    def _trip(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        self._failures = 0
+        self._counters['trips'] += 1
+        self._last_trip_at = time.time()
+        logger.error(f"Circuit {self.name} opened, failing fast for {self.reset_timeout:g}s")
+
+    def _close(self):
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        logger.info(f"Circuit {self.name} closed, upstream recovered")
+
+    def stats(self):
+        """State and counters for this process, for the status endpoint and metrics"""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            calls = len(self._outcomes)
+            return dict(
+                self._counters,
+                name=self.name,
+                state=self._state,
+                enabled=self.enabled,
+                window_calls=calls,
+                window_failure_rate=self._failures / calls if calls else 0.0,
+                last_trip_at=self._last_trip_at,
+                retry_in=max(0.0, self.reset_timeout - (now - self._opened_at)) if self._state == OPEN else 0.0
+            )
+
+
+golf_api_breaker = CircuitBreaker('golf_api')
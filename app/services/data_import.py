@@ -1,8 +1,14 @@
 import csv
+import hashlib
 import io
+import json
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from werkzeug.utils import secure_filename
 import os
 
@@ -10,304 +16,503 @@ from .. import db
 from ..models.club import Club, ClubBrand, ClubType
 from ..models.player import Player, PlayerAchievement
 from ..models.course import Course, CourseHole
+from ..utils import normalize_name
+from .job_queue import ImportCancelled
+from .suggest_index import suggest_index
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Field conversions applied to each CSV before any row reaches the database
+CLUB_COLUMNS = {
+    'name': 'text',
+    'brand': 'text',
+    'type': 'text',
+    'description': 'text',
+    'purchase_link': 'text',
+    'image_url': 'text',
+    'release_year': 'int',
+    'price': 'float'
+}
+PLAYER_COLUMNS = {
+    'name': 'text',
+    'country': 'text',
+    'birthdate': 'date',
+    'turned_pro': 'int',
+    'bio': 'text',
+    'website': 'text',
+    'twitter_handle': 'text',
+    'instagram_handle': 'text',
+    'world_ranking': 'int',
+    'profile_picture': 'text'
+}
+
+# Kaggle Top 1000 Golf Players headers, renamed to our field names
+KAGGLE_RENAMES = {
+    'Name': 'name',
+    'Country': 'country',
+    'BirthDate': 'birthdate',
+    'TurnedPro': 'turned_pro',
+    'Bio': 'bio',
+    'WorldRanking': 'world_ranking',
+    'MajorWins': 'major_wins'
+}
+# Dialect-specific INSERTs that support ON CONFLICT DO UPDATE, for player upserts
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
+KAGGLE_COLUMNS = {
+    'name': 'text',
+    'country': 'text',
+    'birthdate': 'date',
+    'turned_pro': 'int',
+    'bio': 'text',
+    'world_ranking': 'int',
+    'major_wins': 'int'
+}
+MAJOR_WINS_TITLE = "Major Tournament Wins"
+
+# Fields whose change makes a re-imported player row count as updated; a new spelling of the name does not
+PLAYER_HASH_FIELDS = [field for field in PLAYER_COLUMNS if field != 'name']
+KAGGLE_HASH_FIELDS = [field for field in KAGGLE_COLUMNS if field != 'name']
+
+# Player columns written when an import creates a player, never when it updates one
+PLAYER_INSERT_ONLY = ('name', 'is_approved', 'submitted_by', 'approved_by')
+
+
+def read_csv_chunks(file_stream, columns, renames=None, chunk_size=None):
+    """Yield the CSV as frames of at most `chunk_size` rows (IMPORT_CHUNK_SIZE by default).
+
+    Text columns of `columns` are kept as strings, and `renames` maps the
+    file's headers to our field names.
+    """
+    chunk_size = chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE', 5000)
+    text_fields = {field for field, kind in columns.items() if kind == 'text'}
+    if renames:
+        text_fields = {source for source, field in renames.items() if field in text_fields}
+    with pd.read_csv(file_stream, encoding='utf-8', dtype=dict.fromkeys(text_fields, str),
+                     chunksize=chunk_size) as reader:
+        for chunk in reader:
+            yield chunk.rename(columns=renames) if renames else chunk
+
+
+def _convert(values, kind):
+    if kind == 'int':
+        # int() semantics: numeric strings accepted, fractions truncated. inf, nan
+        # and values outside a 64-bit integer become NaN, i.e. a per-row error
+        numbers = np.trunc(pd.to_numeric(values, errors='coerce').astype('float64'))
+        return numbers.where(numbers.abs() < 2.0 ** 63).astype('Int64')
+    if kind == 'float':
+        numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+        return numbers.where(np.isfinite(numbers))
+    if kind == 'date':
+        return pd.to_datetime(values, errors='coerce', format='mixed').dt.date
+    return values
+
+
+def normalize_frame(csv_data, columns):
+    """Convert a raw CSV frame column by column.
+
+    Returns (rows, errors). `rows` are plain dicts keyed by the fields of
+    `columns`, with None for missing values; a column absent from the file
+    is None throughout. `errors` lists {'row', 'error'} for rows holding a
+    value that could not be converted; those rows are left out of `rows`.
+    """
+    fields = list(columns)
+    bad_field = pd.Series(None, index=csv_data.index, dtype=object)
+    converted = []
+    for field in fields:
+        if field not in csv_data.columns:
+            converted.append([None] * len(csv_data))
+            continue
+        raw = csv_data[field]
+        values = _convert(raw, columns[field])
+        valid = values.notna()
+        # Report the first unconvertible field of each row
+        bad_field[raw.notna() & ~valid & bad_field.isna()] = field
+        converted.append(values.astype(object).where(valid, None).tolist())
+    
+    rows = [dict(zip(fields, values)) for values in zip(*converted)]
+    bad = bad_field.notna().to_numpy()
+    if not bad.any():
+        return rows, []
+    
+    bad_rows = csv_data[bad].astype(object)
+    errors = [
+        {'row': raw, 'error': f"Invalid {field}: {raw[field]!r}"}
+        for raw, field in zip(bad_rows.where(bad_rows.notna(), None).to_dict('records'), bad_field[bad])
+    ]
+    return [row for row, is_bad in zip(rows, bad) if not is_bad], errors
+
+
+def content_hash(row, fields):
+    """Stable digest of an imported row's values, stored as import_hash to skip unchanged rows"""
+    payload = json.dumps([row.get(field) for field in fields], default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def club_source_key(row):
+    """Identity of an imported club across imports: normalized brand and name, or '' without a name"""
+    name = normalize_name(row['name'])
+    return f"{normalize_name(row['brand'])}:{name}" if name else ''
+
+
+def keep_error_details(error_details, errors):
+    """Append `errors` to `error_details` up to IMPORT_MAX_ERROR_DETAILS entries"""
+    room = current_app.config.get('IMPORT_MAX_ERROR_DETAILS', 100) - len(error_details)
+    if room > 0:
+        error_details.extend(errors[:room])
+
+
 class DataImportService:
-    """Service for importing data from CSV files"""
+    """Service for importing data from CSV files.
+    
+    Files are streamed in chunks of IMPORT_CHUNK_SIZE rows, and each chunk
+    is committed on its own, so memory use does not grow with the file and
+    no single transaction spans the whole import. If an import fails or is
+    cancelled, chunks already committed stay imported. Importers accept an
+    optional `progress(processed)` callback, called after each chunk; the
+    background import worker uses it to report progress and to cancel.
+    
+    Imported rows carry a source key (Club.import_source_key,
+    Player.name_key) and the content hash of the row they came from
+    (import_hash). Re-importing an unchanged row writes nothing, and results
+    report inserted, updated and unchanged counts.
+    """
+    
+    @staticmethod
+    def _missing_column(csv_data, required_columns):
+        for col in required_columns:
+            if col not in csv_data.columns:
+                logger.error(f"CSV is missing required column: {col}")
+                return {
+                    'success': False,
+                    'message': f"CSV is missing required column: {col}",
+                    'imported': 0,
+                    'errors': 0
+                }
+        return None
+    
+    @staticmethod
+    def _resolve_names(model, names, ids):
+        """Add name -> id to `ids` for `names`: one query for known rows, one insert for the rest"""
+        wanted = {name for name in names if name is not None and name not in ids}
+        if not wanted:
+            return
+        ids.update((name, id_) for id_, name in db.session.execute(
+            db.select(model.id, model.name).where(model.name.in_(wanted))
+        ))
+        missing = wanted - ids.keys()
+        if missing:
+            created = db.session.execute(
+                db.insert(model).returning(model.id, model.name), [{'name': name} for name in sorted(missing)]
+            )
+            ids.update((name, id_) for id_, name in created)
+    
+    @staticmethod
+    def _merge_by_key(rows, make_key, first_wins=()):
+        """Group rows on make_key(row), later non-null values winning.
+        
+        One statement cannot update a row twice, so duplicates within a chunk
+        are merged up front. `first_wins` fields (such as the display name)
+        keep the first non-null value seen instead. Returns ({key: row}, rows
+        whose key is empty).
+        """
+        merged = {}
+        unkeyed = []
+        for row in rows:
+            key = make_key(row)
+            if not key:
+                unkeyed.append(row)
+            elif key in merged:
+                current = merged[key]
+                current.update(
+                    (field, value) for field, value in row.items()
+                    if value is not None and not (field in first_wins and current.get(field) is not None)
+                )
+            else:
+                merged[key] = row
+        return merged, unkeyed
+    
+    @staticmethod
+    def _upsert(model, key_column, rows, insert_only=()):
+        """Write `rows` ({key: column values}) to `model`, keyed on its unique `key_column`.
+        
+        Rows whose import_hash matches the stored one are skipped. The rest go
+        out in one INSERT ... ON CONFLICT DO UPDATE, where only non-null values
+        overwrite existing ones (COALESCE) and `insert_only` columns are never
+        updated. Returns ({'inserted', 'updated', 'unchanged'}, {key: id} for
+        the rows written).
+        """
+        dialect = db.session.get_bind().dialect.name
+        if dialect not in UPSERT_INSERTS:
+            raise ValueError(f"Imports are not supported on {dialect} databases")
+        
+        # Core statements on the table: the ORM's bulk path splits batches wherever a row has a None
+        table = model.__table__
+        key = table.c[key_column]
+        stored = dict(db.session.execute(db.select(key, table.c.import_hash).where(key.in_(rows))).all())
+        changed = [values for value, values in rows.items() if stored.get(value, '') != values['import_hash']]
+        counts = {'inserted': sum(values[key_column] not in stored for values in changed)}
+        counts['updated'] = len(changed) - counts['inserted']
+        counts['unchanged'] = len(rows) - len(changed)
+        if not changed:
+            return counts, {}
+        
+        stmt = UPSERT_INSERTS[dialect](table)
+        updates = {
+            column: func.coalesce(stmt.excluded[column], table.c[column])
+            for column in changed[0] if column != key_column and column not in insert_only
+        }
+        updates['updated_at'] = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(index_elements=[key], set_=updates).returning(key, table.c.id)
+        return counts, dict(db.session.execute(stmt, changed).all())
     
     @staticmethod
-    def import_clubs_from_csv(file_stream, user_id=None):
-        """Import golf clubs from a CSV file"""
+    def _result(label, counts, error_count, error_details):
+        message = (f"Imported {sum(counts.values())} {label} ({counts['inserted']} new, {counts['updated']} updated, "
+                   f"{counts['unchanged']} unchanged) with {error_count} errors")
+        logger.info(message)
+        return dict(
+            counts,
+            success=True,
+            message=message,
+            imported=sum(counts.values()),
+            errors=error_count,
+            error_details=error_details
+        )
+    
+    @staticmethod
+    def import_clubs_from_csv(file_stream, user_id=None, progress=None, chunk_size=None):
+        """Import golf clubs from a CSV file, matching existing clubs on brand and name"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        error_count = 0
+        error_details = []
+        processed = 0
+        brand_ids = {}
+        type_ids = {}
         try:
-            # Read CSV
-            csv_data = pd.read_csv(file_stream, encoding='utf-8')
-            
-            # Ensure required columns exist
-            required_columns = ['name', 'brand']
-            for col in required_columns:
-                if col not in csv_data.columns:
-                    logger.error(f"CSV is missing required column: {col}")
-                    return {
-                        'success': False,
-                        'message': f"CSV is missing required column: {col}",
-                        'imported': 0,
-                        'errors': 0
-                    }
-            
-            imported_count = 0
-            error_count = 0
-            error_details = []
-            
-            # Process each row
-            for _, row in csv_data.iterrows():
-                try:
-                    # Get or create brand
-                    brand_name = row.get('brand')
-                    if pd.notna(brand_name):
-                        brand = ClubBrand.query.filter_by(name=brand_name).first()
-                        if not brand:
-                            brand = ClubBrand(name=brand_name)
-                            db.session.add(brand)
-                            db.session.commit()
-                    else:
-                        brand = None
-                    
-                    # Get or create club type
-                    club_type_name = row.get('type')
-                    if pd.notna(club_type_name):
-                        club_type = ClubType.query.filter_by(name=club_type_name).first()
-                        if not club_type:
-                            club_type = ClubType(name=club_type_name)
-                            db.session.add(club_type)
-                            db.session.commit()
-                    else:
-                        club_type = None
-                    
-                    # Create club
-                    club = Club(
-                        name=row.get('name'),
-                        description=row.get('description') if pd.notna(row.get('description')) else None,
-                        purchase_link=row.get('purchase_link') if pd.notna(row.get('purchase_link')) else None,
-                        image_url=row.get('image_url') if pd.notna(row.get('image_url')) else None,
-                        release_year=int(row.get('release_year')) if pd.notna(row.get('release_year')) else None,
-                        price=float(row.get('price')) if pd.notna(row.get('price')) else None,
-                        brand_id=brand.id if brand else None,
-                        club_type_id=club_type.id if club_type else None,
+            for number, csv_data in enumerate(read_csv_chunks(file_stream, CLUB_COLUMNS, chunk_size=chunk_size)):
+                # Ensure required columns exist
+                if number == 0:
+                    missing = DataImportService._missing_column(csv_data, ['name', 'brand'])
+                    if missing:
+                        return missing
+                
+                rows, errors = normalize_frame(csv_data, CLUB_COLUMNS)
+                rows, unnamed = DataImportService._merge_by_key(rows, club_source_key, first_wins=('name', 'brand'))
+                errors.extend({'row': row, 'error': 'Missing name'} for row in unnamed)
+                keep_error_details(error_details, errors)
+                
+                # Resolve brands and club types for the whole chunk, creating new ones in bulk
+                DataImportService._resolve_names(ClubBrand, (row['brand'] for row in rows.values()), brand_ids)
+                DataImportService._resolve_names(ClubType, (row['type'] for row in rows.values()), type_ids)
+                
+                clubs = {}
+                for key, row in rows.items():
+                    import_hash = content_hash(row, CLUB_COLUMNS)
+                    brand_name = row.pop('brand')
+                    club_type_name = row.pop('type')
+                    clubs[key] = dict(
+                        row,
+                        brand_id=brand_ids.get(brand_name),
+                        club_type_id=type_ids.get(club_type_name),
+                        import_source_key=key,
+                        import_hash=import_hash,
                         is_approved=True,  # Auto-approve imported clubs
                         submitted_by=user_id,
                         approved_by=user_id
                     )
-                    
-                    db.session.add(club)
-                    imported_count += 1
                 
-                except Exception as e:
-                    error_count += 1
-                    error_details.append({
-                        'row': dict(row),
-                        'error': str(e)
-                    })
-                    logger.error(f"Error importing club row: {str(e)}")
-                    continue
-            
-            db.session.commit()
+                # Insert new clubs and update changed ones in one statement
+                if clubs:
+                    chunk_counts, _ = DataImportService._upsert(
+                        Club, 'import_source_key', clubs, insert_only=('is_approved', 'submitted_by', 'approved_by')
+                    )
+                    for name, count in chunk_counts.items():
+                        counts[name] += count
+                
+                db.session.commit()
+                error_count += len(errors)
+                processed += len(csv_data)
+                if progress is not None:
+                    progress(processed)
             
-            logger.info(f"Imported {imported_count} clubs with {error_count} errors")
-            return {
-                'success': True,
-                'message': f"Imported {imported_count} clubs with {error_count} errors",
-                'imported': imported_count,
-                'errors': error_count,
-                'error_details': error_details
-            }
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            return DataImportService._result('clubs', counts, error_count, error_details)
             
+        except ImportCancelled:
+            db.session.rollback()
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            raise
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error importing clubs from CSV: {str(e)}")
-            return {
-                'success': False,
-                'message': f"Error importing clubs: {str(e)}",
-                'imported': 0,
-                'errors': 1
-            }
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            imported_count = sum(counts.values())
+            logger.error(f"Error importing clubs from CSV after {processed} rows: {str(e)}")
+            return dict(
+                counts,
+                success=False,
+                message=f"Error importing clubs after {imported_count} were imported: {str(e)}",
+                imported=imported_count,
+                errors=error_count + 1,
+                error_details=error_details
+            )
+    
+    @staticmethod
+    def _player_rows(rows, hash_fields, user_id):
+        """Key rows on normalize_name(name) and add the columns written on insert.
+        
+        Returns ({name_key: values}, rows without a usable name).
+        """
+        players, unnamed = DataImportService._merge_by_key(
+            rows, lambda row: normalize_name(row['name']), first_wins=PLAYER_INSERT_ONLY
+        )
+        for key, row in players.items():
+            row.update(
+                name_key=key,
+                import_hash=content_hash(row, hash_fields),
+                is_approved=True,  # Auto-approve imported players
+                submitted_by=user_id,
+                approved_by=user_id
+            )
+        return players, unnamed
     
     @staticmethod
-    def import_players_from_csv(file_stream, user_id=None):
-        """Import golf players from a CSV file"""
+    def import_players_from_csv(file_stream, user_id=None, progress=None, chunk_size=None):
+        """Import golf players from a CSV file, matching existing players on their normalized name"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        error_count = 0
+        error_details = []
+        processed = 0
         try:
-            # Read CSV
-            csv_data = pd.read_csv(file_stream, encoding='utf-8')
-            
-            # Ensure required columns exist
-            required_columns = ['name']
-            for col in required_columns:
-                if col not in csv_data.columns:
-                    logger.error(f"CSV is missing required column: {col}")
-                    return {
-                        'success': False,
-                        'message': f"CSV is missing required column: {col}",
-                        'imported': 0,
-                        'errors': 0
-                    }
-            
-            imported_count = 0
-            error_count = 0
-            error_details = []
-            
-            # Process each row
-            for _, row in csv_data.iterrows():
-                try:
-                    # Check if player already exists
-                    player_name = row.get('name')
-                    existing_player = Player.query.filter_by(name=player_name).first()
-                    
-                    if existing_player:
-                        # Update existing player
-                        if pd.notna(row.get('country')):
-                            existing_player.country = row.get('country')
-                        if pd.notna(row.get('birthdate')):
-                            existing_player.birthdate = pd.to_datetime(row.get('birthdate')).date()
-                        if pd.notna(row.get('turned_pro')):
-                            existing_player.turned_pro = int(row.get('turned_pro'))
-                        if pd.notna(row.get('bio')):
-                            existing_player.bio = row.get('bio')
-                        if pd.notna(row.get('website')):
-                            existing_player.website = row.get('website')
-                        if pd.notna(row.get('twitter_handle')):
-                            existing_player.twitter_handle = row.get('twitter_handle')
-                        if pd.notna(row.get('instagram_handle')):
-                            existing_player.instagram_handle = row.get('instagram_handle')
-                        if pd.notna(row.get('world_ranking')):
-                            existing_player.world_ranking = int(row.get('world_ranking'))
-                        if pd.notna(row.get('profile_picture')):
-                            existing_player.profile_picture = row.get('profile_picture')
-                        
-                        existing_player.updated_at = datetime.utcnow()
-                    else:
-                        # Create new player
-                        player = Player(
-                            name=player_name,
-                            country=row.get('country') if pd.notna(row.get('country')) else None,
-                            birthdate=pd.to_datetime(row.get('birthdate')).date() if pd.notna(row.get('birthdate')) else None,
-                            turned_pro=int(row.get('turned_pro')) if pd.notna(row.get('turned_pro')) else None,
-                            bio=row.get('bio') if pd.notna(row.get('bio')) else None,
-                            website=row.get('website') if pd.notna(row.get('website')) else None,
-                            twitter_handle=row.get('twitter_handle') if pd.notna(row.get('twitter_handle')) else None,
-                            instagram_handle=row.get('instagram_handle') if pd.notna(row.get('instagram_handle')) else None,
-                            world_ranking=int(row.get('world_ranking')) if pd.notna(row.get('world_ranking')) else None,
-                            profile_picture=row.get('profile_picture') if pd.notna(row.get('profile_picture')) else None,
-                            is_approved=True,  # Auto-approve imported players
-                            submitted_by=user_id,
-                            approved_by=user_id
-                        )
-                        db.session.add(player)
-                    
-                    imported_count += 1
+            for number, csv_data in enumerate(read_csv_chunks(file_stream, PLAYER_COLUMNS, chunk_size=chunk_size)):
+                # Ensure required columns exist
+                if number == 0:
+                    missing = DataImportService._missing_column(csv_data, ['name'])
+                    if missing:
+                        return missing
                 
-                except Exception as e:
-                    error_count += 1
-                    error_details.append({
-                        'row': dict(row),
-                        'error': str(e)
-                    })
-                    logger.error(f"Error importing player row: {str(e)}")
-                    continue
-            
-            db.session.commit()
+                rows, errors = normalize_frame(csv_data, PLAYER_COLUMNS)
+                players, unnamed = DataImportService._player_rows(rows, PLAYER_HASH_FIELDS, user_id)
+                errors.extend({'row': row, 'error': 'Missing name'} for row in unnamed)
+                keep_error_details(error_details, errors)
+                
+                # Insert new players and update changed ones in one statement; the display name is kept
+                if players:
+                    chunk_counts, _ = DataImportService._upsert(Player, 'name_key', players, insert_only=PLAYER_INSERT_ONLY)
+                    for name, count in chunk_counts.items():
+                        counts[name] += count
+                
+                db.session.commit()
+                error_count += len(errors)
+                processed += len(csv_data)
+                if progress is not None:
+                    progress(processed)
             
-            logger.info(f"Imported {imported_count} players with {error_count} errors")
-            return {
-                'success': True,
-                'message': f"Imported {imported_count} players with {error_count} errors",
-                'imported': imported_count,
-                'errors': error_count,
-                'error_details': error_details
-            }
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            return DataImportService._result('players', counts, error_count, error_details)
             
+        except ImportCancelled:
+            db.session.rollback()
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            raise
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error importing players from CSV: {str(e)}")
-            return {
-                'success': False,
-                'message': f"Error importing players: {str(e)}",
-                'imported': 0,
-                'errors': 1
-            }
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            imported_count = sum(counts.values())
+            logger.error(f"Error importing players from CSV after {processed} rows: {str(e)}")
+            return dict(
+                counts,
+                success=False,
+                message=f"Error importing players after {imported_count} were imported: {str(e)}",
+                imported=imported_count,
+                errors=error_count + 1,
+                error_details=error_details
+            )
     
     @staticmethod
-    def import_kaggle_players_dataset(file_stream, user_id=None):
+    def import_kaggle_players_dataset(file_stream, user_id=None, progress=None, chunk_size=None):
         """Import golf player data from the Kaggle Top 1000 Golf Players dataset"""
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        error_count = 0
+        error_details = []
+        processed = 0
         try:
-            # Read CSV
-            csv_data = pd.read_csv(file_stream, encoding='utf-8')
-            
-            # Map dataset columns to our model fields
-            # Adapt this to match the actual Kaggle dataset structure
-            imported_count = 0
-            error_count = 0
-            error_details = []
-            
-            # Process each row
-            for _, row in csv_data.iterrows():
-                try:
-                    # Adapt the following to match the Kaggle dataset structure
-                    player_name = row.get('Name')
-                    if not player_name or pd.isna(player_name):
-                        continue
-                    
-                    # Check if player already exists
-                    existing_player = Player.query.filter_by(name=player_name).first()
-                    
-                    if existing_player:
-                        # Update existing player
-                        if 'Country' in row and pd.notna(row.get('Country')):
-                            existing_player.country = row.get('Country')
-                        if 'BirthDate' in row and pd.notna(row.get('BirthDate')):
-                            existing_player.birthdate = pd.to_datetime(row.get('BirthDate')).date()
-                        if 'TurnedPro' in row and pd.notna(row.get('TurnedPro')):
-                            existing_player.turned_pro = int(row.get('TurnedPro'))
-                        if 'Bio' in row and pd.notna(row.get('Bio')):
-                            existing_player.bio = row.get('Bio')
-                        if 'WorldRanking' in row and pd.notna(row.get('WorldRanking')):
-                            existing_player.world_ranking = int(row.get('WorldRanking'))
-                        
-                        existing_player.updated_at = datetime.utcnow()
-                    else:
-                        # Create new player
-                        player = Player(
-                            name=player_name,
-                            country=row.get('Country') if 'Country' in row and pd.notna(row.get('Country')) else None,
-                            birthdate=pd.to_datetime(row.get('BirthDate')).date() if 'BirthDate' in row and pd.notna(row.get('BirthDate')) else None,
-                            turned_pro=int(row.get('TurnedPro')) if 'TurnedPro' in row and pd.notna(row.get('TurnedPro')) else None,
-                            bio=row.get('Bio') if 'Bio' in row and pd.notna(row.get('Bio')) else None,
-                            world_ranking=int(row.get('WorldRanking')) if 'WorldRanking' in row and pd.notna(row.get('WorldRanking')) else None,
-                            is_approved=True,  # Auto-approve imported players
-                            submitted_by=user_id,
-                            approved_by=user_id
-                        )
-                        db.session.add(player)
-                    
-                    # Import achievements if present in the dataset
-                    if 'MajorWins' in row and pd.notna(row.get('MajorWins')) and row.get('MajorWins') > 0:
-                        # Example of how to handle achievements
-                        achievement = PlayerAchievement(
-                            player_id=existing_player.id if existing_player else player.id,
-                            title="Major Tournament Wins",
-                            year=datetime.now().year,  # Use current year as default
-                            description=f"Player has won {int(row.get('MajorWins'))} major tournaments"
-                        )
-                        db.session.add(achievement)
-                    
-                    imported_count += 1
+            # Read CSV, mapping the dataset's columns to our model fields
+            chunks = read_csv_chunks(file_stream, KAGGLE_COLUMNS, renames=KAGGLE_RENAMES, chunk_size=chunk_size)
+            for csv_data in chunks:
+                rows, errors = normalize_frame(csv_data, KAGGLE_COLUMNS)
+                keep_error_details(error_details, errors)
                 
-                except Exception as e:
-                    error_count += 1
-                    error_details.append({
-                        'player': player_name,
-                        'error': str(e)
-                    })
-                    logger.error(f"Error importing Kaggle player data: {str(e)}")
-                    continue
-            
-            db.session.commit()
+                # Rows without a usable name are skipped
+                players, _ = DataImportService._player_rows(rows, KAGGLE_HASH_FIELDS, user_id)
+                major_wins = {key: row.pop('major_wins') for key, row in players.items()}
+                
+                # Insert new players and update changed ones in one statement; the display name is kept
+                player_ids = {}
+                if players:
+                    chunk_counts, player_ids = DataImportService._upsert(
+                        Player, 'name_key', players, insert_only=PLAYER_INSERT_ONLY
+                    )
+                    for name, count in chunk_counts.items():
+                        counts[name] += count
+                
+                # Rebuild the major wins achievement of players written with a MajorWins
+                # value; a blank cell (or no column at all) leaves the existing one alone
+                rebuilt_ids = [player_id for key, player_id in player_ids.items() if major_wins[key] is not None]
+                if rebuilt_ids:
+                    db.session.execute(db.delete(PlayerAchievement.__table__).where(
+                        PlayerAchievement.player_id.in_(rebuilt_ids),
+                        PlayerAchievement.title == MAJOR_WINS_TITLE
+                    ))
+                achievements = [
+                    {
+                        'player_id': player_id,
+                        'title': MAJOR_WINS_TITLE,
+                        'year': datetime.now().year,  # Use current year as default
+                        'description': f"Player has won {major_wins[key]} major tournaments"
+                    }
+                    for key, player_id in player_ids.items()
+                    if major_wins[key] is not None and major_wins[key] > 0
+                ]
+                if achievements:
+                    db.session.execute(db.insert(PlayerAchievement.__table__), achievements)
+                
+                db.session.commit()
+                error_count += len(errors)
+                processed += len(csv_data)
+                if progress is not None:
+                    progress(processed)
             
-            logger.info(f"Imported {imported_count} players from Kaggle dataset with {error_count} errors")
-            return {
-                'success': True,
-                'message': f"Imported {imported_count} players from Kaggle dataset with {error_count} errors",
-                'imported': imported_count,
-                'errors': error_count,
-                'error_details': error_details
-            }
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            return DataImportService._result('players from Kaggle dataset', counts, error_count, error_details)
             
+        except ImportCancelled:
+            db.session.rollback()
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            raise
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error importing Kaggle players dataset: {str(e)}")
-            return {
-                'success': False,
-                'message': f"Error importing Kaggle players dataset: {str(e)}",
-                'imported': 0,
-                'errors': 1
-            }
\ No newline at end of file
+            if counts['inserted'] or counts['updated']:
+                suggest_index.invalidate()
+            imported_count = sum(counts.values())
+            logger.error(f"Error importing Kaggle players dataset after {processed} rows: {str(e)}")
+            return dict(
+                counts,
+                success=False,
+                message=f"Error importing Kaggle players dataset after {imported_count} were imported: {str(e)}",
+                imported=imported_count,
+                errors=error_count + 1,
+                error_details=error_details
+            )
@@ -0,0 +1,217 @@
+import logging
+import threading
+
+import numpy as np
+
+from .. import db
+from ..models.course import Course
+from ..models.vote import vote_scores
+from .index_generation import SharedGeneration
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Great-circle distance in km from one point to arrays of points (all in degrees)"""
+    lat1 = np.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs) - np.radians(lng)
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class CourseGeoIndex:
+    """In-process spatial index over approved course coordinates.
+
+    Courses are bucketed into a fixed lat/lng grid. A radius query collects the
+    buckets overlapping the search bounding box, applies an exact bounding-box
+    mask and then refines with a vectorized haversine distance.
+    """
+
+    def __init__(self, app=None, cell_degrees=1.0):
+        self.cell_degrees = cell_degrees
+        self.n_rows = int(np.ceil(180.0 / cell_degrees))
+        self.n_cols = int(np.ceil(360.0 / cell_degrees))
+        self._lock = threading.RLock()
+        self._points = {}
+        self._scores = {}
+        self._arrays = None
+        self._built = False
+        self.generation = SharedGeneration('course_geo')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['course_geo_index'] = self
+        self.generation.init_app(app)
+
+    def build(self):
+        """(Re)load approved course coordinates and vote scores from the database"""
+        self.generation.loaded()
+        rows = db.session.query(Course.id, Course.latitude, Course.longitude).filter(
+            Course.is_approved == True,  # noqa: E712
+            Course.latitude.isnot(None),
+            Course.longitude.isnot(None)
+        ).all()
+        scores = vote_scores('course')
+
+        with self._lock:
+            self._points = {course_id: (lat, lng) for course_id, lat, lng in rows}
+            self._scores = {course_id: scores.get(course_id, 0) for course_id in self._points}
+            self._arrays = None
+            self._built = True
+
+        logger.info(f"Built course geo index with {len(rows)} courses")
+
+    def ensure_built(self):
+        if self._built and self.generation.stale():
+            logger.info("Course geo index data changed in another process, rebuilding")
+            self._built = False
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def invalidate(self):
+        """Mark the index stale in every process so it is reloaded on next use (e.g. after bulk imports)"""
+        self.mark_changed()
+        db.session.commit()
+        with self._lock:
+            self._built = False
+
+    def mark_changed(self):
+        """Bump the shared generation in the caller's transaction; other processes rebuild once it commits"""
+        self.generation.bump()
+
+    def add(self, course_id, latitude, longitude):
+        if not self._built:
+            return
+        with self._lock:
+            if latitude is None or longitude is None:
+                self._points.pop(course_id, None)
+            else:
+                self._points[course_id] = (latitude, longitude)
+                self._scores.setdefault(course_id, 0)
+            self._arrays = None
+
+    def remove(self, course_id):
+        if not self._built:
+            return
+        with self._lock:
+            if self._points.pop(course_id, None) is not None:
+                self._scores.pop(course_id, None)
+                self._arrays = None
+
+    def set_vote_score(self, course_id, vote_score):
+        with self._lock:
+            if course_id not in self._scores:
+                return
+            self._scores[course_id] = vote_score
+            if self._arrays is not None:
+                position = self._arrays['positions'].get(course_id)
+                if position is not None:
+                    self._arrays['scores'][position] = vote_score
+
+    def vote_score(self, course_id):
+        return self._scores.get(course_id, 0)
+
+    def _cell_rows(self, lats):
+        return np.clip(np.floor((lats + 90.0) / self.cell_degrees), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cell_cols(self, lngs):
+        return np.floor((lngs + 180.0) / self.cell_degrees).astype(np.int64) % self.n_cols
+
+    def _get_arrays(self):
+        """Materialize the packed arrays and grid buckets after any change"""
+        with self._lock:
+            if self._arrays is not None:
+                return self._arrays
+
+            ids = np.fromiter(self._points.keys(), dtype=np.int64, count=len(self._points))
+            coords = np.array(list(self._points.values()), dtype=np.float64).reshape(-1, 2)
+            lats, lngs = coords[:, 0], coords[:, 1]
+            scores = np.array([self._scores.get(int(i), 0) for i in ids], dtype=np.int64)
+
+            # Group positions by grid cell: sort by cell key once, then split
+            cell_keys = self._cell_rows(lats) * self.n_cols + self._cell_cols(lngs)
+            order = np.argsort(cell_keys, kind='stable')
+            unique_keys, starts = np.unique(cell_keys[order], return_index=True)
+            buckets = dict(zip(unique_keys.tolist(), np.split(order, starts[1:])))
+
+            self._arrays = {
+                'ids': ids,
+                'lats': lats,
+                'lngs': lngs,
+                'scores': scores,
+                'buckets': buckets,
+                'positions': {int(course_id): i for i, course_id in enumerate(ids)}
+            }
+            return self._arrays
+
+    def _candidate_positions(self, arrays, latitude, longitude, radius_km):
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        min_lat, max_lat = latitude - dlat, latitude + dlat
+
+        max_abs_lat = max(abs(min_lat), abs(max_lat))
+        if max_abs_lat >= 90.0:
+            dlng = 180.0
+        else:
+            dlng = min(180.0, dlat / np.cos(np.radians(max_abs_lat)))
+
+        row_range = range(
+            int(self._cell_rows(np.array([max(min_lat, -90.0)]))[0]),
+            int(self._cell_rows(np.array([min(max_lat, 90.0)]))[0]) + 1
+        )
+        if dlng >= 180.0:
+            col_range = range(self.n_cols)
+        else:
+            first_col = int(np.floor((longitude - dlng + 180.0) / self.cell_degrees))
+            last_col = int(np.floor((longitude + dlng + 180.0) / self.cell_degrees))
+            col_range = [c % self.n_cols for c in range(first_col, min(last_col, first_col + self.n_cols - 1) + 1)]
+
+        buckets = arrays['buckets']
+        parts = [buckets[key] for key in (row * self.n_cols + col for row in row_range for col in col_range)
+                 if key in buckets]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        positions = np.concatenate(parts)
+
+        # Exact bounding-box prefilter before the trigonometry
+        mask = (arrays['lats'][positions] >= min_lat) & (arrays['lats'][positions] <= max_lat)
+        if dlng < 180.0:
+            offset = (arrays['lngs'][positions] - longitude + 180.0) % 360.0 - 180.0
+            mask &= np.abs(offset) <= dlng
+        return positions[mask]
+
+    def nearby(self, latitude, longitude, radius_km, limit=20, sort_by='distance'):
+        """Return [(course_id, distance_km)] within `radius_km`, nearest or highest voted first"""
+        self.ensure_built()
+        arrays = self._get_arrays()
+
+        positions = self._candidate_positions(arrays, latitude, longitude, radius_km)
+        if positions.size == 0:
+            return []
+
+        distances = haversine_km(latitude, longitude, arrays['lats'][positions], arrays['lngs'][positions])
+        within = distances <= radius_km
+        positions, distances = positions[within], distances[within]
+
+        if sort_by == 'votes':
+            # Highest score first, nearest first among ties
+            order = np.lexsort((distances, -arrays['scores'][positions]))
+        else:
+            order = np.argsort(distances, kind='stable')
+        order = order[:limit]
+
+        return [
+            (int(course_id), float(distance))
+            for course_id, distance in zip(arrays['ids'][positions[order]], distances[order])
+        ]
+
+
+course_geo_index = CourseGeoIndex()
@@ -1,15 +1,79 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
 import json
 import logging
-from datetime import datetime
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, insert
 
 from .. import db
-from ..models.course import Course, CourseHole
+from ..models.course import Course, CourseHole, scorecard_columns
+from ..models.imports import ImportCheckpoint
+from .suggest_index import suggest_index
+from .geo_index import course_geo_index
+from .rate_limit import TokenBucketLimiter
+from .response_cache import get_response_cache
+from .circuit_breaker import golf_api_breaker
+from ..utils import cache_ttl
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Client-side throttle shared by every GolfAPIService in the process
+_upstream_limiter = TokenBucketLimiter(max_keys=16)
+
+
+class SearchPageError(Exception):
+    """Raised by iter_search_pages when a page of search results could not be fetched"""
+
+    def __init__(self, offset):
+        super().__init__(f"Search results page at offset {offset} could not be fetched")
+        self.offset = offset
+
+
+def get_session(pool_size=10, max_retries=3, backoff_factor=0.5, backoff_jitter=0.5):
+    """Shared keep-alive session for the current process.
+
+    Connections are pooled per host, and idempotent requests are retried on
+    connection errors and on 429/5xx. Retries use exponential backoff with
+    random jitter and honour Retry-After. Sessions are keyed by pid, so a
+    forked worker never reuses its parent's sockets.
+    """
+    key = (os.getpid(), pool_size, max_retries, backoff_factor, backoff_jitter)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                retry = Retry(
+                    total=max_retries,
+                    backoff_factor=backoff_factor,
+                    backoff_jitter=backoff_jitter,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(['GET', 'HEAD']),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sessions[key] = session
+    return session
+
+
 class GolfAPIService:
     """Service to interact with GolfAPI.io"""
     
@@ -22,9 +86,47 @@ class GolfAPIService:
         
         if not self.base_url:
             logger.warning("GolfAPI base URL not configured - using mock data")
+        
+        config = current_app.config if current_app else {}
+        self.timeout = (
+            config.get('GOLF_API_CONNECT_TIMEOUT', 3.05),
+            config.get('GOLF_API_READ_TIMEOUT', 10)
+        )
+        self.rate_limit = config.get('GOLF_API_RATE_LIMIT')
+        self.session = get_session(
+            pool_size=config.get('GOLF_API_POOL_SIZE', 10),
+            max_retries=config.get('GOLF_API_MAX_RETRIES', 3),
+            backoff_factor=config.get('GOLF_API_BACKOFF_FACTOR', 0.5),
+            backoff_jitter=config.get('GOLF_API_BACKOFF_JITTER', 0.5)
+        )
+        
+        self.cache = None
+        self.cache_default_ttl = config.get('GOLF_API_CACHE_DEFAULT_TTL', 24 * 3600)
+        if config.get('GOLF_API_CACHE_ENABLED') and config.get('GOLF_API_CACHE_PATH'):
+            self.cache = get_response_cache(
+                config['GOLF_API_CACHE_PATH'],
+                config.get('GOLF_API_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+            )
+    
+    def _throttle(self):
+        """Block until the upstream quota allows another request"""
+        if not self.rate_limit:
+            return
+        rate, burst = self.rate_limit
+        while True:
+            wait = _upstream_limiter.hit(self.base_url, rate, burst)
+            if not wait:
+                return
+            time.sleep(wait)
     
-    def _make_request(self, endpoint, params=None):
-        """Make a request to the Golf API"""
+    def _make_request(self, endpoint, params=None, revalidate=False):
+        """Make a request to the Golf API.
+        
+        If the upstream fails, or the circuit breaker is open, a cached copy
+        is returned whatever its age, otherwise None. With `revalidate`, a
+        fresh cache entry is still confirmed with the upstream, and a failure
+        always returns None.
+        """
         if not self.api_key or not self.base_url or self.base_url == 'https://golf-api.example.com':
             logger.info("Using mock data instead of GolfAPI")
             return self._get_mock_data(endpoint, params)
@@ -34,17 +136,79 @@ class GolfAPIService:
             'Accept': 'application/json'
         }
         
+        url = f"{self.base_url}/{endpoint}"
+        cached = cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(url, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached['fresh'] and not revalidate:
+                self.cache.record_hit(cache_key)
+                return cached['data']
+            
+            # Revalidate a stale entry instead of downloading it again
+            if cached is not None:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
+        
+        if not golf_api_breaker.allow():
+            logger.warning(f"GolfAPI circuit open, not requesting {endpoint}")
+            return self._degraded(endpoint, cached, cache_key, revalidate)
+        
+        self._throttle()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{self.base_url}/{endpoint}",
+            response = self.session.get(
+                url,
                 headers=headers,
-                params=params
+                params=params,
+                timeout=self.timeout
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error making request to GolfAPI: {str(e)}")
-            return self._get_mock_data(endpoint, params)
+            golf_api_breaker.record_failure()
+            logger.error(f"Error making request to GolfAPI {endpoint} after "
+                         f"{(time.perf_counter() - start) * 1000:.1f} ms: {str(e)}")
+            return self._degraded(endpoint, cached, cache_key, revalidate)
+        
+        logger.debug(f"GolfAPI GET {endpoint} -> {response.status_code} in "
+                     f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        # Still throttled or failing after the session's own retries
+        if response.status_code in RETRY_STATUSES:
+            golf_api_breaker.record_failure()
+            logger.error(f"GolfAPI {endpoint} returned {response.status_code}")
+            return self._degraded(endpoint, cached, cache_key, revalidate)
+        golf_api_breaker.record_success()
+        
+        if response.status_code == 304 and cached is not None:
+            self.cache.revalidated(cache_key, cache_ttl(response.headers, self.cache_default_ttl))
+            return cached['data']
+        
+        try:
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error reading GolfAPI response for {endpoint}: {str(e)}")
+            return None
+        
+        if self.cache is not None:
+            self.cache.record_miss()
+            if 'no-store' not in response.headers.get('Cache-Control', ''):
+                self.cache.put(
+                    cache_key, url, data, cache_ttl(response.headers, self.cache_default_ttl),
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+        return data
+    
+    def _degraded(self, endpoint, cached, cache_key, revalidate):
+        """Result when the upstream is unavailable: a cached copy of any age, else None"""
+        if cached is None or revalidate:
+            return None
+        logger.warning(f"Serving stale cached GolfAPI response for {endpoint}")
+        self.cache.record_stale(cache_key)
+        return cached['data']
     
     def _get_mock_data(self, endpoint, params=None):
         """Return mock data for development purposes"""
@@ -148,107 +312,458 @@ class GolfAPIService:
         
         return self._make_request('courses', params)
     
-    def get_course_details(self, course_id):
+    def get_course_details(self, course_id, revalidate=False):
         """Get detailed information about a specific course"""
-        return self._make_request(f'courses/{course_id}')
+        return self._make_request(f'courses/{course_id}', revalidate=revalidate)
     
-    def get_course_holes(self, course_id):
+    def get_course_holes(self, course_id, revalidate=False):
         """Get information about holes for a specific course"""
-        return self._make_request(f'courses/{course_id}/holes')
+        return self._make_request(f'courses/{course_id}/holes', revalidate=revalidate)
+    
+    @staticmethod
+    def _course_fields(course_data):
+        """Map a GolfAPI course payload onto Course column values"""
+        address = course_data.get('address') or {}
+        location = course_data.get('location') or {}
+        return {
+            'name': course_data.get('name'),
+            'description': course_data.get('description'),
+            'address': address.get('line1'),
+            'city': address.get('city'),
+            'state': address.get('state'),
+            'country': address.get('country'),
+            'postal_code': address.get('zip'),
+            'website': course_data.get('website'),
+            'phone': course_data.get('phone'),
+            'email': course_data.get('email'),
+            'year_built': course_data.get('year_built'),
+            'architect': course_data.get('architect'),
+            'course_type': course_data.get('type'),
+            'num_holes': course_data.get('num_holes', 18),
+            'par': course_data.get('par'),
+            'length_yards': course_data.get('length_yards'),
+            'latitude': location.get('lat'),
+            'longitude': location.get('lng'),
+            'image_url': course_data.get('image_url'),
+            'logo_url': course_data.get('logo_url')
+        }
+    
+    @staticmethod
+    def _hole_fields(hole_data):
+        """Map a GolfAPI hole payload onto CourseHole column values"""
+        return {
+            'hole_number': hole_data.get('number'),
+            'par': hole_data.get('par'),
+            'yards': hole_data.get('yards'),
+            'handicap': hole_data.get('handicap'),
+            'description': hole_data.get('description'),
+            'image_url': hole_data.get('image_url')
+        }
+    
+    def _course_row(self, course_id, course_data, holes_data, user_id, synced_at):
+        """Column values for a new course and its holes, scorecard included"""
+        holes = [self._hole_fields(hole_data) for hole_data in holes_data or []]
+        row = self._course_fields(course_data)
+        row.update(scorecard_columns(holes))
+        row.update(
+            golf_api_id=str(course_id),
+            golf_api_synced_at=synced_at,
+            is_approved=True,  # Auto-approve courses from the API
+            submitted_by=user_id,
+            approved_by=user_id
+        )
+        return row, holes
+    
+    def _insert_courses(self, rows, hole_rows):
+        """Bulk INSERT courses, then their holes; returns the new course ids in row order"""
+        course_ids = db.session.execute(
+            insert(Course).returning(Course.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        holes = [
+            dict(hole, course_id=course_id)
+            for course_id, course_holes in zip(course_ids, hole_rows)
+            for hole in course_holes
+        ]
+        if holes:
+            db.session.execute(insert(CourseHole), holes)
+        return course_ids
+    
+    def _write_batch(self, fetched, user_id, result, checkpoint=None, resume_at=None):
+        """Write a batch of fetched (course_id, course_data, holes_data) in one transaction.
+        
+        Already-imported ids are found with a single IN query. New courses and
+        their holes go in with two bulk INSERTs. If that fails, the batch is
+        retried course by course in savepoints, so one bad row is reported on
+        its own instead of failing the whole batch. Returns the new course ids.
+        """
+        golf_api_ids = [str(course_id) for course_id, _, _ in fetched]
+        skip = set(
+            golf_api_id for (golf_api_id,) in
+            db.session.query(Course.golf_api_id).filter(Course.golf_api_id.in_(golf_api_ids))
+        ) if golf_api_ids else set()
+        
+        synced_at = datetime.utcnow()
+        items = []
+        for course_id, course_data, holes_data in fetched:
+            if str(course_id) in skip:
+                result['existing'] += 1
+                continue
+            skip.add(str(course_id))
+            try:
+                items.append((course_id,) + self._course_row(course_id, course_data, holes_data, user_id, synced_at))
+            except Exception as e:
+                logger.error(f"Error importing course {course_id}: {str(e)}")
+                result['errors'] += 1
+                result['error_details'].append({'course_id': course_id, 'error': str(e)})
+        
+        inserted = []
+        if items:
+            try:
+                course_ids = self._insert_courses([row for _, row, _ in items], [holes for _, _, holes in items])
+                inserted = list(zip(course_ids, (row for _, row, _ in items)))
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"Bulk course insert failed, retrying one by one: {str(e)}")
+                for course_id, row, holes in items:
+                    try:
+                        with db.session.begin_nested():
+                            inserted.append((self._insert_courses([row], [holes])[0], row))
+                    except Exception as e:
+                        logger.error(f"Error importing course {course_id}: {str(e)}")
+                        result['errors'] += 1
+                        result['error_details'].append({'course_id': course_id, 'error': str(e)})
+        
+        if checkpoint is not None:
+            checkpoint.offset = resume_at
+        if inserted:
+            # Web processes have their own copies of the indexes updated below
+            suggest_index.mark_changed()
+            course_geo_index.mark_changed()
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error committing imported courses: {str(e)}")
+            result['errors'] += len(inserted)
+            result['error_details'].extend(
+                {'course_id': row['golf_api_id'], 'error': str(e)} for _, row in inserted
+            )
+            return []
+        
+        for course_id, row in inserted:
+            suggest_index.add('course', course_id, row['name'])
+            course_geo_index.add(course_id, row['latitude'], row['longitude'])
+        result['imported'] += len(inserted)
+        result['course_ids'].extend(course_id for course_id, _ in inserted)
+        return [course_id for course_id, _ in inserted]
     
     def import_course(self, course_id, user_id=None):
         """Import a course from the Golf API into the database"""
+        # Check if course already exists
+        existing_course = Course.query.filter_by(golf_api_id=str(course_id)).first()
+        if existing_course:
+            logger.info(f"Course already exists: {course_id}")
+            return existing_course
+        
         # Get course details
         course_data = self.get_course_details(course_id)
         if not course_data:
             logger.error(f"Failed to get course data for ID: {course_id}")
             return None
+        holes_data = self.get_course_holes(course_id)
         
-        # Check if course already exists
-        existing_course = Course.query.filter_by(golf_api_id=str(course_id)).first()
-        if existing_course:
-            logger.info(f"Course already exists: {course_id}")
-            return existing_course
+        result = {'imported': 0, 'existing': 0, 'errors': 0, 'error_details': [], 'course_ids': []}
+        course_ids = self._write_batch([(course_id, course_data, holes_data)], user_id, result)
+        if not course_ids:
+            return Course.query.filter_by(golf_api_id=str(course_id)).first() if result['existing'] else None
         
-        # Create new course
-        try:
-            course = Course(
-                name=course_data.get('name'),
-                description=course_data.get('description'),
-                address=course_data.get('address', {}).get('line1'),
-                city=course_data.get('address', {}).get('city'),
-                state=course_data.get('address', {}).get('state'),
-                country=course_data.get('address', {}).get('country'),
-                postal_code=course_data.get('address', {}).get('zip'),
-                website=course_data.get('website'),
-                phone=course_data.get('phone'),
-                email=course_data.get('email'),
-                year_built=course_data.get('year_built'),
-                architect=course_data.get('architect'),
-                course_type=course_data.get('type'),
-                num_holes=course_data.get('num_holes', 18),
-                par=course_data.get('par'),
-                length_yards=course_data.get('length_yards'),
-                latitude=course_data.get('location', {}).get('lat'),
-                longitude=course_data.get('location', {}).get('lng'),
-                image_url=course_data.get('image_url'),
-                logo_url=course_data.get('logo_url'),
-                golf_api_id=str(course_id),
-                is_approved=True,  # Auto-approve courses from the API
-                submitted_by=user_id,
-                approved_by=user_id
+        course = db.session.get(Course, course_ids[0])
+        logger.info(f"Successfully imported course: {course.name} (ID: {course.id})")
+        return course
+    
+    def _fetch_concurrently(self, course_ids, concurrency, revalidate=False):
+        """Yield (course_id, details, holes) in order, fetching up to `concurrency` requests at once.
+
+        Details and holes for a course are requested in parallel. At most
+        2 * concurrency courses are in flight, so memory stays bounded however
+        many ids are fed in.
+        """
+        window = deque()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='golf-api') as pool:
+            for course_id in course_ids:
+                window.append((
+                    course_id,
+                    pool.submit(self.get_course_details, course_id, revalidate),
+                    pool.submit(self.get_course_holes, course_id, revalidate)
+                ))
+                if len(window) >= 2 * concurrency:
+                    yield window.popleft()
+            while window:
+                yield window.popleft()
+    
+    def iter_search_pages(self, query=None, latitude=None, longitude=None, radius=None, page_size=None, offset=0):
+        """Lazily yield (offset, courses) for each page of search results, starting at `offset`.
+        
+        Only one page is held at a time. Iteration stops at the first short or
+        empty page, or if the upstream ignores `offset` and repeats a page.
+        A page that cannot be fetched raises SearchPageError rather than
+        looking like the end of the results.
+        """
+        page_size = page_size or current_app.config.get('GOLF_API_PAGE_SIZE', 100)
+        previous_ids = None
+        while True:
+            results = self.search_courses(
+                query=query,
+                latitude=latitude,
+                longitude=longitude,
+                radius=radius,
+                limit=page_size,
+                offset=offset
             )
+            if not results or 'courses' not in results:
+                logger.error(f"Search results page at offset {offset} could not be fetched")
+                raise SearchPageError(offset)
             
-            db.session.add(course)
-            db.session.commit()
-            
-            # Import hole data
-            holes_data = self.get_course_holes(course_id)
-            if holes_data:
-                for hole_data in holes_data:
-                    hole = CourseHole(
-                        course_id=course.id,
-                        hole_number=hole_data.get('number'),
-                        par=hole_data.get('par'),
-                        yards=hole_data.get('yards'),
-                        handicap=hole_data.get('handicap'),
-                        description=hole_data.get('description'),
-                        image_url=hole_data.get('image_url')
-                    )
-                    db.session.add(hole)
-                
-                db.session.commit()
+            courses = results['courses']
+            page_ids = [course_data.get('id') for course_data in courses]
+            if not courses or page_ids == previous_ids:
+                return
+            yield offset, courses
             
-            logger.info(f"Successfully imported course: {course.name} (ID: {course.id})")
-            return course
+            if len(courses) < page_size:
+                return
+            previous_ids = page_ids
+            offset += len(courses)
+    
+    def bulk_import_courses(self, query=None, latitude=None, longitude=None, radius=None, limit=None,
+                            user_id=None, concurrency=None, batch_size=None, page_size=None, resume=False,
+                            progress=None):
+        """Import all courses matching search criteria (at most `limit`).
+        
+        Search pages are streamed into a thread pool that fetches details and
+        holes, throttled by the client-side rate limiter. All database writes
+        happen on the calling thread through _write_batch, one transaction
+        per `batch_size` courses. With `resume`, progress is kept in an ImportCheckpoint for
+        these search parameters, and an interrupted import restarts from the
+        last committed page instead of from the beginning. If a search page
+        cannot be fetched, the courses before it are still written, but the
+        result is a failure and the checkpoint is not marked completed, so a
+        resumed run picks up from there. `progress` is called with the number
+        of courses handled after every full batch.
+        """
+        concurrency = concurrency or current_app.config.get('GOLF_API_CONCURRENCY', 8)
+        batch_size = batch_size or current_app.config.get('GOLF_API_WRITE_BATCH', 50)
+        result = {
+            'success': True,
+            'imported': 0,
+            'existing': 0,
+            'errors': 0,
+            'error_details': [],
+            'course_ids': []
+        }
+        
+        checkpoint = None
+        offset = 0
+        if resume:
+            checkpoint = ImportCheckpoint.for_params('golf_api_search', {
+                'query': query, 'latitude': latitude, 'longitude': longitude, 'radius': radius, 'limit': limit
+            })
+            # Persist a new checkpoint now so a rolled-back batch cannot discard it
+            db.session.commit()
+            if checkpoint.completed_at is not None:
+                result['message'] = f"Import already completed at {checkpoint.completed_at.isoformat()}"
+                return result
+            offset = checkpoint.offset
+            if offset:
+                logger.info(f"Resuming course import at offset {offset}")
+        
+        # For each course id handed to the fetch pool, the offset to resume
+        # from once that course is committed, consumed in the same order
+        resume_offsets = deque()
+        search_failed = []
+        
+        def course_ids():
+            # The checkpoint offset counts the search results already handled
+            # by earlier runs, which all count towards `limit`
+            remaining = limit - offset if limit is not None else None
+            if remaining is not None and remaining <= 0:
+                return
+            try:
+                for page_offset, courses in self.iter_search_pages(
+                        query, latitude, longitude, radius, page_size=page_size, offset=offset):
+                    if remaining is not None:
+                        courses = courses[:remaining]
+                        remaining -= len(courses)
+                    for i, course_data in enumerate(courses):
+                        resume_offsets.append(page_offset + len(courses) if i == len(courses) - 1 else page_offset)
+                        yield course_data.get('id')
+                    if remaining == 0:
+                        return
+            except SearchPageError as e:
+                search_failed.append(e)
+        
+        start = time.perf_counter()
+        fetched = []
+        resume_at = offset
+        
+        for course_id, details, holes in self._fetch_concurrently(course_ids(), concurrency):
+            resume_at = resume_offsets.popleft()
+            try:
+                course_data, holes_data = details.result(), holes.result()
+                if not course_data:
+                    raise ValueError('No course data returned')
+                fetched.append((course_id, course_data, holes_data))
+            except Exception as e:
+                logger.error(f"Error importing course {course_id}: {str(e)}")
+                result['errors'] += 1
+                result['error_details'].append({'course_id': course_id, 'error': str(e)})
             
-        except Exception as e:
-            db.session.rollback()
-            logger.error(f"Error importing course: {str(e)}")
-            return None
+            if len(fetched) >= batch_size:
+                self._write_batch(fetched, user_id, result, checkpoint, resume_at)
+                fetched = []
+                if progress is not None:
+                    progress(result['imported'] + result['existing'] + result['errors'])
+        
+        if search_failed:
+            result['success'] = False
+            result['error_details'].append({'course_id': None, 'error': str(search_failed[0])})
+        elif checkpoint is not None:
+            checkpoint.completed_at = datetime.utcnow()
+        self._write_batch(fetched, user_id, result, checkpoint, resume_at)
+        
+        elapsed = time.perf_counter() - start
+        result['message'] = (f"Imported {result['imported']} courses ({result['existing']} already present) "
+                             f"with {result['errors']} errors in {elapsed:.1f}s")
+        if search_failed:
+            result['message'] += f"; stopped early: {search_failed[0]}"
+        logger.info(result['message'])
+        return result
     
-    def bulk_import_courses(self, query=None, latitude=None, longitude=None, radius=None, limit=100, user_id=None):
-        """Import multiple courses matching search criteria"""
-        courses = []
-        
-        # Get courses matching search criteria
-        search_results = self.search_courses(
-            query=query,
-            latitude=latitude,
-            longitude=longitude,
-            radius=radius,
-            limit=limit
-        )
+    def _diff_holes(self, course, holes, holes_data):
+        """Apply upstream hole data to existing CourseHoles; return True if anything changed"""
+        by_number = {hole.hole_number: hole for hole in holes}
+        changed = False
+        seen = set()
         
-        if not search_results or 'courses' not in search_results:
-            logger.error("No courses found or error in search results")
-            return []
+        for hole_data in holes_data:
+            fields = self._hole_fields(hole_data)
+            seen.add(fields['hole_number'])
+            hole = by_number.get(fields['hole_number'])
+            if hole is None:
+                hole = CourseHole(course_id=course.id, **fields)
+                db.session.add(hole)
+                holes.append(hole)
+                changed = True
+                continue
+            for name, value in fields.items():
+                if getattr(hole, name) != value:
+                    setattr(hole, name, value)
+                    changed = True
+        
+        for hole in [hole for hole in holes if hole.hole_number not in seen]:
+            db.session.delete(hole)
+            holes.remove(hole)
+            changed = True
         
-        # Import each course
-        for course_data in search_results['courses']:
-            course_id = course_data.get('id')
-            course = self.import_course(course_id, user_id)
-            if course:
-                courses.append(course)
+        if changed:
+            course.refresh_scorecard(holes)
+        return changed
+    
+    def resync_courses(self, max_age=None, batch_size=None, concurrency=None, limit=None):
+        """Refresh imported courses whose last sync is older than `max_age`.
+        
+        Courses are walked in id order, one batch at a time. Each course is
+        fetched with a conditional request (304s are answered from the
+        response cache). Only columns and holes that differ from the stored
+        values are written. golf_api_synced_at is stamped on every course
+        that was fetched successfully, so the next run skips it until it is
+        stale again. One commit per batch.
+        """
+        if max_age is None:
+            max_age = current_app.config.get('GOLF_API_RESYNC_MAX_AGE', timedelta(days=7))
+        batch_size = batch_size or current_app.config.get('GOLF_API_WRITE_BATCH', 50)
+        concurrency = concurrency or current_app.config.get('GOLF_API_CONCURRENCY', 8)
+        cutoff = datetime.utcnow() - max_age
+        result = {
+            'success': True,
+            'checked': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'holes_updated': 0,
+            'errors': 0,
+            'error_details': []
+        }
+        start = time.perf_counter()
+        last_id = 0
+        
+        while limit is None or result['checked'] + result['errors'] < limit:
+            size = batch_size if limit is None else min(batch_size, limit - result['checked'] - result['errors'])
+            batch = Course.query.filter(
+                Course.id > last_id,
+                Course.golf_api_id.isnot(None),
+                or_(Course.golf_api_synced_at.is_(None), Course.golf_api_synced_at < cutoff)
+            ).order_by(Course.id).limit(size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            
+            courses = {course.golf_api_id: course for course in batch}
+            holes_by_course = {course.id: [] for course in batch}
+            for hole in CourseHole.query.filter(CourseHole.course_id.in_(holes_by_course)):
+                holes_by_course[hole.course_id].append(hole)
+            
+            reindexed = []
+            # Only merged into the result once the batch has committed
+            counts = {'checked': 0, 'updated': 0, 'unchanged': 0, 'holes_updated': 0}
+            now = datetime.utcnow()
+            for golf_api_id, details, holes in self._fetch_concurrently(list(courses), concurrency, revalidate=True):
+                course = courses[golf_api_id]
+                course_data, holes_data = details.result(), holes.result()
+                if not course_data or holes_data is None:
+                    result['errors'] += 1
+                    result['error_details'].append({'course_id': golf_api_id, 'error': 'Upstream request failed'})
+                    continue
+                
+                changes = {
+                    name: value for name, value in self._course_fields(course_data).items()
+                    if getattr(course, name) != value
+                }
+                for name, value in changes.items():
+                    setattr(course, name, value)
+                holes_changed = self._diff_holes(course, holes_by_course[course.id], holes_data)
+                course.golf_api_synced_at = now
+                
+                counts['checked'] += 1
+                if changes or holes_changed:
+                    counts['updated'] += 1
+                    counts['holes_updated'] += int(holes_changed)
+                    if 'name' in changes or 'latitude' in changes or 'longitude' in changes:
+                        reindexed.append(course)
+                else:
+                    counts['unchanged'] += 1
+            
+            if reindexed:
+                suggest_index.mark_changed()
+                course_geo_index.mark_changed()
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error committing course resync batch: {str(e)}")
+                result['success'] = False
+                # Courses that failed to fetch were already counted as errors
+                result['errors'] += counts['checked']
+                result['error_details'].append({'course_id': None, 'error': str(e)})
+                continue
+            
+            for name, value in counts.items():
+                result[name] += value
+            for course in reindexed:
+                suggest_index.add('course', course.id, course.name)
+                course_geo_index.add(course.id, course.latitude, course.longitude)
         
-        return courses
\ No newline at end of file
+        elapsed = time.perf_counter() - start
+        result['message'] = (f"Resynced {result['checked']} courses: {result['updated']} updated, "
+                             f"{result['unchanged']} unchanged, {result['errors']} errors in {elapsed:.1f}s")
+        logger.info(result['message'])
+        return result
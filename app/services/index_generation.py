@@ -0,0 +1,38 @@
+import time
+
+from ..models.imports import IndexGeneration
+
+
+class SharedGeneration:
+    """Notices when another process changed the data behind an in-process index.
+
+    Writers bump a counter row in the index_generations table in the same
+    transaction as their change. Each process remembers the generation its
+    copy was built from and re-reads the row at most every `interval`
+    seconds, so staying in sync costs one small query per interval rather
+    than one per request.
+    """
+
+    def __init__(self, name, interval=5):
+        self.name = name
+        self.interval = interval
+        self._built_from = None
+        self._checked_at = 0.0
+
+    def init_app(self, app):
+        self.interval = app.config.get('INDEX_GENERATION_CHECK_INTERVAL', self.interval)
+
+    def loaded(self):
+        """Record the current generation; call before a build reads its rows"""
+        self._built_from = IndexGeneration.current(self.name)
+        self._checked_at = time.monotonic()
+
+    def stale(self):
+        """True if the generation moved since the last build, checked at most every `interval` seconds"""
+        if time.monotonic() - self._checked_at < self.interval:
+            return False
+        self._checked_at = time.monotonic()
+        return IndexGeneration.current(self.name) != self._built_from
+
+    def bump(self):
+        IndexGeneration.bump(self.name)
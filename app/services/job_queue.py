@@ -0,0 +1,341 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_COLUMNS = ('id', 'kind', 'status', 'params', 'file_path', 'submitted_by', 'created_at', 'started_at',
+            'finished_at', 'heartbeat_at', 'worker_id', 'processed', 'total', 'cancel_requested', 'result', 'error')
+
+
+class ImportCancelled(Exception):
+    """Raised from a progress callback when the job has been cancelled"""
+
+
+class JobQueue:
+    """Persistent queue of long-running import jobs in a SQLite file.
+
+    There is no broker: web workers insert rows, and `flask import-worker`
+    processes claim the oldest queued job with one IMMEDIATE transaction.
+    They write progress back while it runs. The queue lives in its own
+    file, so progress updates never contend with the import's
+    long-running transaction on the application database.
+    """
+
+    def __init__(self, app=None):
+        self.path = None
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.path = app.config.get('IMPORT_QUEUE_PATH', 'pars_golf_jobs.db')
+        self.upload_dir = app.config.get('IMPORT_UPLOAD_DIR') or os.path.join(app.instance_path, 'imports')
+        self.stale_after = app.config.get('IMPORT_JOB_STALE_AFTER', 300)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS import_jobs ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, status TEXT NOT NULL, '
+                'params TEXT, file_path TEXT, submitted_by INTEGER, created_at REAL NOT NULL, '
+                'started_at REAL, finished_at REAL, heartbeat_at REAL, worker_id TEXT, '
+                'processed INTEGER NOT NULL DEFAULT 0, total INTEGER, '
+                'cancel_requested INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_import_jobs_status ON import_jobs (status, id)')
+        app.extensions['job_queue'] = self
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind, params=None, file_path=None, submitted_by=None):
+        cursor = self._connect().execute(
+            'INSERT INTO import_jobs (kind, status, params, file_path, submitted_by, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (kind, QUEUED, json.dumps(params or {}), file_path, submitted_by, time.time())
+        )
+        logger.info(f"Queued {kind} import job {cursor.lastrowid}")
+        return cursor.lastrowid
+
+    def claim(self, worker_id):
+        """Atomically move the oldest queued job to running and return it, or None"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT id FROM import_jobs WHERE status = ? ORDER BY id LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                conn.execute(
+                    'UPDATE import_jobs SET status = ?, worker_id = ?, started_at = ?, heartbeat_at = ? '
+                    'WHERE id = ?',
+                    (RUNNING, worker_id, now, now, row[0])
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return self.get(row[0]) if row is not None else None
+
+    def update_progress(self, job_id, processed, total=None, worker_id=None):
+        """Record progress and heartbeat; returns True if the job should stop.
+
+        With `worker_id`, nothing is written unless that worker still owns the
+        job. A job that was requeued and claimed elsewhere also returns True.
+        """
+        conn = self._connect()
+        query = 'UPDATE import_jobs SET processed = ?, total = COALESCE(?, total), heartbeat_at = ? WHERE id = ?'
+        args = (processed, total, time.time(), job_id)
+        if worker_id is not None:
+            query += ' AND worker_id = ? AND status = ?'
+            args += (worker_id, RUNNING)
+        if not conn.execute(query, args).rowcount:
+            return True
+        row = conn.execute('SELECT cancel_requested FROM import_jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def heartbeat(self, job_id, worker_id):
+        """Refresh a running job's heartbeat; returns False if `worker_id` no longer owns it"""
+        cursor = self._connect().execute(
+            'UPDATE import_jobs SET heartbeat_at = ? WHERE id = ? AND worker_id = ? AND status = ?',
+            (time.time(), job_id, worker_id, RUNNING)
+        )
+        return cursor.rowcount > 0
+
+    def finish(self, job_id, status, result=None, error=None, worker_id=None):
+        """Record the outcome; with `worker_id`, only if that worker still owns the job. Returns True if written"""
+        query = 'UPDATE import_jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?'
+        args = (status, time.time(), json.dumps(result, default=str) if result is not None else None, error, job_id)
+        if worker_id is not None:
+            query += ' AND worker_id = ? AND status = ?'
+            args += (worker_id, RUNNING)
+        return self._connect().execute(query, args).rowcount > 0
+
+    def cancel(self, job_id):
+        """Cancel a queued job outright, or ask a running one to stop; returns the job"""
+        conn = self._connect()
+        conn.execute(
+            'UPDATE import_jobs SET status = ?, finished_at = ?, cancel_requested = 1 WHERE id = ? AND status = ?',
+            (CANCELLED, time.time(), job_id, QUEUED)
+        )
+        conn.execute('UPDATE import_jobs SET cancel_requested = 1 WHERE id = ? AND status = ?', (job_id, RUNNING))
+        return self.get(job_id)
+
+    def requeue_stale(self):
+        """Put running jobs whose worker stopped heartbeating back in the queue"""
+        cursor = self._connect().execute(
+            'UPDATE import_jobs SET status = ?, worker_id = NULL WHERE status = ? AND heartbeat_at < ?',
+            (QUEUED, RUNNING, time.time() - self.stale_after)
+        )
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} stale import jobs")
+        return cursor.rowcount
+
+    def get(self, job_id):
+        row = self._connect().execute(
+            f'SELECT {", ".join(_COLUMNS)} FROM import_jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row is not None else None
+
+    def recent(self, limit=50, status=None):
+        query = f'SELECT {", ".join(_COLUMNS)} FROM import_jobs'
+        args = ()
+        if status:
+            query += ' WHERE status = ?'
+            args = (status,)
+        rows = self._connect().execute(query + ' ORDER BY id DESC LIMIT ?', args + (limit,)).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+
+job_queue = JobQueue()
+
+
+def job_payload(job):
+    """JSON-friendly view of a job row, with throughput"""
+    now = time.time()
+    elapsed = None
+    if job['started_at']:
+        elapsed = (job['finished_at'] or now) - job['started_at']
+    return {
+        'id': job['id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'params': json.loads(job['params']) if job['params'] else {},
+        'submitted_by': job['submitted_by'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'rows_processed': job['processed'],
+        'rows_total': job['total'],
+        'rows_per_second': round(job['processed'] / elapsed, 1) if elapsed else None,
+        'cancel_requested': bool(job['cancel_requested']),
+        'result': json.loads(job['result']) if job['result'] else None,
+        'error': job['error']
+    }
+
+
+class JobProgress:
+    """Progress callback handed to importers: progress(processed, total=None).
+
+    Writes to the queue at most every `interval` seconds. When the job has
+    been cancelled, the next write raises ImportCancelled.
+    """
+
+    def __init__(self, queue, job_id, interval=1.0, worker_id=None):
+        self.queue = queue
+        self.job_id = job_id
+        self.interval = interval
+        self.worker_id = worker_id
+        self.processed = 0
+        self.total = None
+        self._written_at = 0.0
+
+    def __call__(self, processed, total=None):
+        self.processed = processed
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if now - self._written_at < self.interval:
+            return
+        self._written_at = now
+        if self.queue.update_progress(self.job_id, processed, total, self.worker_id):
+            raise ImportCancelled()
+
+
+class JobHeartbeat:
+    """Keeps a running job's heartbeat fresh from a side thread.
+
+    Progress is only reported between chunks, so a slow chunk would otherwise
+    look like a dead worker and get the job requeued while it still runs.
+    """
+
+    def __init__(self, queue, job_id, worker_id, interval):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name=f'import-job-{self.job_id}-heartbeat', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    logger.warning(f"Import job {self.job_id} is no longer owned by {self.worker_id}")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"Heartbeat for import job {self.job_id} failed: {str(e)}")
+
+
+def _run_job(job, progress):
+    from .data_import import DataImportService
+    from .golf_api import GolfAPIService
+
+    params = json.loads(job['params']) if job['params'] else {}
+    user_id = job['submitted_by']
+    if job['kind'] == 'golf_api_courses':
+        return GolfAPIService().bulk_import_courses(user_id=user_id, progress=progress, resume=True, **params)
+
+    importers = {
+        'clubs_csv': DataImportService.import_clubs_from_csv,
+        'players_csv': DataImportService.import_players_from_csv,
+        'kaggle_players': DataImportService.import_kaggle_players_dataset
+    }
+    progress(0, _count_rows(job['file_path']))
+    with open(job['file_path'], 'rb') as file_stream:
+        return importers[job['kind']](file_stream, user_id, progress=progress)
+
+
+def _count_rows(path):
+    """Data lines in a CSV, as the job's expected total (quoted newlines make it an overestimate)"""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def run_worker(app, poll_interval=2.0, once=False):
+    """Process queued import jobs until interrupted (or until the queue is empty with `once`)"""
+    from .. import db
+
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    interval = app.config.get('IMPORT_PROGRESS_INTERVAL', 1.0)
+    heartbeat_interval = min(30.0, job_queue.stale_after / 3)
+    logger.info(f"Import worker {worker_id} started")
+
+    while True:
+        job_queue.requeue_stale()
+        job = job_queue.claim(worker_id)
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} running {job['kind']} import job {job['id']}")
+        progress = JobProgress(job_queue, job['id'], interval, worker_id)
+        status, result, error = SUCCEEDED, None, None
+        with app.app_context(), JobHeartbeat(job_queue, job['id'], worker_id, heartbeat_interval):
+            try:
+                result = _run_job(job, progress)
+            except ImportCancelled:
+                db.session.rollback()
+                status = CANCELLED
+            except Exception as e:
+                db.session.rollback()
+                logger.exception(f"Import job {job['id']} failed")
+                status, error = FAILED, str(e)
+            finally:
+                db.session.remove()
+
+        processed = progress.processed
+        if result is not None:
+            # The last progress call may have been throttled, and GolfAPI imports
+            # do not report their final partial batch
+            counted = result.get('imported', 0) + result.get('existing', 0) + result.get('errors', 0)
+            processed = max(processed, counted)
+            if not result.get('success'):
+                status, error = FAILED, result.get('message')
+
+        # A job requeued as stale may have been claimed by another worker,
+        # which now owns its outcome and its upload file
+        job_queue.update_progress(job['id'], processed, worker_id=worker_id)
+        if not job_queue.finish(job['id'], status, result=result, error=error, worker_id=worker_id):
+            logger.warning(f"Import job {job['id']} was requeued while {worker_id} ran it; leaving it to its new owner")
+            continue
+        if status == CANCELLED:
+            logger.info(f"Import job {job['id']} cancelled")
+        if job['file_path'] and os.path.exists(job['file_path']):
+            os.remove(job['file_path'])
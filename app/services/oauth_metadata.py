@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from authlib.integrations.flask_client.apps import FlaskOAuth2App
+
+from ..utils import cache_ttl
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to per-process locking only
+    fcntl = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ProviderMetadataCache:
+    """Disk-backed cache of an OpenID provider's discovery document and JWKS.
+
+    The document and key set are stored together in one JSON file that all
+    worker processes share. An entry expires at the shorter of the two
+    upstream max-ages. From `refresh_margin` seconds before expiry a
+    background thread refreshes it, so logins normally never wait on the
+    provider. Only one process fetches at a time (flock on a sidecar lock
+    file), and if the provider cannot be reached the last copy keeps being
+    served, retried every `retry_interval` seconds.
+    """
+
+    def __init__(self, discovery_url, cache_dir, default_ttl=3600, refresh_margin=300, timeout=5,
+                 retry_interval=30):
+        self.discovery_url = discovery_url
+        self.default_ttl = default_ttl
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+
+        self.cache_dir = cache_dir
+        name = hashlib.sha256(discovery_url.encode()).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f'oidc-{name}.json')
+        self.lock_path = self.path + '.lock'
+
+        self._entry = None
+        self._lock = threading.Lock()
+        # Separate from _lock, which refresh() holds for the whole fetch
+        self._background = threading.Lock()
+
+    def get(self):
+        """Return {'metadata': ..., 'jwks': ...}, fetching only when nothing usable is cached"""
+        entry = self._entry
+        now = time.time()
+        if entry is None or entry['refresh_at'] <= now:
+            entry = self._read_disk() or entry
+            if entry is None or (entry['expires_at'] <= now and entry['refresh_at'] <= now):
+                entry = self.refresh(stale=entry)
+            self._entry = entry
+
+        if entry['refresh_at'] <= time.time():
+            self._refresh_in_background()
+        return entry
+
+    def refresh(self, stale=None, force=False):
+        """Fetch from the provider under the cross-process lock and persist the result"""
+        # Created on first use, not at app startup, so CLI runs leave no directory behind
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock, self._file_lock():
+            # Another worker may have refreshed while we waited for the lock
+            entry = self._read_disk()
+            if not force and entry and entry['refresh_at'] > time.time():
+                self._entry = entry
+                return entry
+
+            try:
+                entry = self._fetch()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                stale = entry or stale
+                if stale is None:
+                    raise
+                logger.error(f"Refreshing OIDC metadata failed, serving stale copy: {str(e)}")
+                # Back off instead of hitting a failing provider on every login
+                stale = dict(stale, refresh_at=time.time() + self.retry_interval)
+                self._entry = stale
+                return stale
+
+            self._write_disk(entry)
+            self._entry = entry
+            return entry
+
+    def _fetch(self):
+        start = time.perf_counter()
+        response = requests.get(self.discovery_url, timeout=self.timeout)
+        response.raise_for_status()
+        metadata = response.json()
+        ttl = cache_ttl(response.headers, self.default_ttl)
+
+        jwks = None
+        if metadata.get('jwks_uri'):
+            response = requests.get(metadata['jwks_uri'], timeout=self.timeout)
+            response.raise_for_status()
+            jwks = response.json()
+            ttl = min(ttl, cache_ttl(response.headers, self.default_ttl))
+
+        logger.info(f"Fetched OIDC metadata from {self.discovery_url} in "
+                    f"{(time.perf_counter() - start) * 1000:.0f} ms (ttl {ttl}s)")
+        now = time.time()
+        # Short upstream TTLs would otherwise sit permanently inside the margin
+        refresh_in = max(ttl - self.refresh_margin, ttl / 2)
+        return {
+            'metadata': metadata,
+            'jwks': jwks,
+            'fetched_at': now,
+            'refresh_at': now + refresh_in,
+            'expires_at': now + ttl
+        }
+
+    def _refresh_in_background(self):
+        if not self._background.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.refresh(stale=self._entry)
+            except Exception as e:
+                logger.error(f"Background OIDC metadata refresh failed: {str(e)}")
+            finally:
+                self._background.release()
+
+        threading.Thread(target=run, name='oidc-metadata-refresh', daemon=True).start()
+
+    def _read_disk(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, entry):
+        # Write-then-rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.path)
+
+    def _file_lock(self):
+        return _FileLock(self.lock_path)
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._file = open(self.path, 'a')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class CachedMetadataOAuth2App(FlaskOAuth2App):
+    """Authlib client that reads provider metadata and JWKS from a ProviderMetadataCache"""
+
+    metadata_cache = None
+
+    def load_server_metadata(self):
+        if self.metadata_cache is None:
+            return super().load_server_metadata()
+
+        entry = self.metadata_cache.get()
+        self.server_metadata.update(entry['metadata'])
+        if entry['jwks'] is not None:
+            self.server_metadata['jwks'] = entry['jwks']
+        return self.server_metadata
+
+    def fetch_jwk_set(self, force=False):
+        if self.metadata_cache is None:
+            return super().fetch_jwk_set(force=force)
+
+        # Authlib forces a refetch when an ID token names an unknown key id,
+        # i.e. after the provider rotated its keys
+        if force:
+            entry = self.metadata_cache.refresh(force=True)
+            self.server_metadata['jwks'] = entry['jwks']
+        return self.load_server_metadata().get('jwks')
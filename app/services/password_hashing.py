@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class HasherBusy(Exception):
+    """Raised when the password hashing pool is saturated"""
+
+
+class PasswordHasher:
+    """Runs the deliberately slow password KDF on a dedicated, bounded pool.
+
+    At most PASSWORD_HASH_WORKERS hashes run at once and at most
+    PASSWORD_HASH_QUEUE_DEPTH may be queued or running. Beyond that callers
+    get HasherBusy immediately instead of tying up a request worker, so a
+    credential-stuffing burst cannot starve ordinary API traffic.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'scrypt:32768:8:1'
+        self.timeout = None
+        self.method_prefix = self.method
+        self._executor = None
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        # werkzeug fills in defaults ('scrypt' becomes 'scrypt:32768:8:1'), so
+        # learn the stored prefix from a real hash rather than the setting
+        self.method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 4)
+        queue_depth = max(workers, app.config.get('PASSWORD_HASH_QUEUE_DEPTH', 16))
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        app.extensions['password_hasher'] = self
+
+    def _run(self, fn, *args):
+        # Without an app (e.g. one-off scripts) hash inline
+        if self._executor is None:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            logger.warning("Password hashing pool saturated, rejecting request")
+            raise HasherBusy()
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            logger.warning("Timed out waiting for password hashing pool")
+            raise HasherBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        if not password_hash or password is None:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with different KDF parameters than configured"""
+        return bool(password_hash) and password_hash.split('$', 1)[0] != self.method_prefix
+
+
+password_hasher = PasswordHasher()
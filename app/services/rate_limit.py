@@ -0,0 +1,170 @@
+import logging
+import math
+import sqlite3
+import threading
+import time
+
+from flask import current_app, jsonify, request
+from flask_login import current_user
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_monotonic = time.monotonic
+
+
+class TokenBucketLimiter:
+    """In-process token buckets, one per key.
+
+    Each bucket is a [tokens, last_refill, refill_seconds] list in a dict;
+    refill_seconds (burst / rate of the bucket's own scope) tells pruning
+    when the bucket is full again. A check is a
+    single locked read-modify-write, so it is only shared by the threads of
+    one worker process.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key, rate, burst):
+        """Take one token from `key`; return 0.0 if allowed, else seconds until a token is available"""
+        now = _monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [burst, now, burst / rate]
+                tokens = burst
+            else:
+                tokens = bucket[0] + (now - bucket[1]) * rate
+                if tokens > burst:
+                    tokens = burst
+            bucket[1] = now
+
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+    def _prune(self, now):
+        """Drop buckets that have refilled completely, they are equivalent to absent ones"""
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket[1] < bucket[2]
+        }
+
+
+class SQLiteTokenBucketLimiter:
+    """Token buckets in a SQLite file shared by all worker processes on a host.
+
+    A check is one short IMMEDIATE transaction. That is far slower than the
+    in-process limiter, but limits hold across every worker.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, rate, burst):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+
+            if tokens >= 1.0:
+                retry_after = 0.0
+                tokens -= 1.0
+            else:
+                retry_after = (1.0 - tokens) / rate
+
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+
+class RateLimiter:
+    """Per-user and per-IP write rate limiting, configured per endpoint class.
+
+    RATE_LIMITS maps an endpoint class (e.g. 'vote') to a
+    (tokens per second, burst) pair. A request is allowed only if both the
+    bucket for the current user and the bucket for the client IP have a token.
+    """
+
+    def __init__(self, app=None):
+        self.backend = TokenBucketLimiter()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        storage = app.config.get('RATE_LIMIT_STORAGE', 'memory')
+        if storage == 'sqlite':
+            self.backend = SQLiteTokenBucketLimiter(app.config['RATE_LIMIT_SQLITE_PATH'])
+        elif storage == 'memory':
+            self.backend = TokenBucketLimiter()
+        else:
+            raise ValueError(f"Unknown RATE_LIMIT_STORAGE: {storage}")
+        app.extensions['rate_limiter'] = self
+
+    def check(self, scope):
+        """Return 0.0 if the current request may proceed, else the Retry-After in seconds"""
+        limits = current_app.config.get('RATE_LIMITS', {}).get(scope)
+        if not limits or not current_app.config.get('RATE_LIMIT_ENABLED', True):
+            return 0.0
+        rate, burst = limits
+
+        retry_after = self.backend.hit(f'{scope}:ip:{request.remote_addr}', rate, burst)
+        if current_user.is_authenticated:
+            retry_after = max(retry_after, self.backend.hit(f'{scope}:user:{current_user.id}', rate, burst))
+        return retry_after
+
+
+rate_limiter = RateLimiter()
+
+
+# Decorator for throttling write endpoints; apply below @login_required
+def rate_limit(scope):
+    def decorator(f):
+        def decorated_function(*args, **kwargs):
+            retry_after = rate_limiter.check(scope)
+            if retry_after:
+                logger.info(f"Rate limited {scope} request from {request.remote_addr}")
+                response = jsonify({
+                    'success': False,
+                    'message': 'Too many requests, please slow down'
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response
+            return f(*args, **kwargs)
+        decorated_function.__name__ = f.__name__
+        return decorated_function
+    return decorator
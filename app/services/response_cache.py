@@ -0,0 +1,196 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """On-disk cache of upstream JSON responses in a SQLite file.
+
+    Entries are keyed by endpoint and query parameters and keep the
+    upstream ETag / Last-Modified validators. A stale entry is revalidated
+    with a conditional request. When the upstream is unavailable, it is
+    served as-is. The file is shared by every worker process on the host.
+    Once it grows past `max_bytes`, least recently used entries are evicted.
+    Triggers keep the total size in a one-row meta table, so checking it
+    on every store does not scan the cache.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stale_served': 0, 'stores': 0, 'evictions': 0}
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS http_cache ('
+                'key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body BLOB NOT NULL, '
+                'etag TEXT, last_modified TEXT, stored_at REAL NOT NULL, expires_at REAL NOT NULL, '
+                'last_access REAL NOT NULL, size INTEGER NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_http_cache_last_access ON http_cache (last_access)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS http_cache_meta (id INTEGER PRIMARY KEY CHECK (id = 1), '
+                'total_bytes INTEGER NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS http_cache_size_insert AFTER INSERT ON http_cache BEGIN '
+                'UPDATE http_cache_meta SET total_bytes = total_bytes + NEW.size WHERE id = 1; END'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS http_cache_size_update AFTER UPDATE OF size ON http_cache BEGIN '
+                'UPDATE http_cache_meta SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 1; END'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS http_cache_size_delete AFTER DELETE ON http_cache BEGIN '
+                'UPDATE http_cache_meta SET total_bytes = total_bytes - OLD.size WHERE id = 1; END'
+            )
+            # Seeds the total for cache files created before the meta table existed
+            conn.execute(
+                'INSERT OR IGNORE INTO http_cache_meta (id, total_bytes) '
+                'SELECT 1, COALESCE(SUM(size), 0) FROM http_cache'
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        canonical = json.dumps([endpoint, sorted((params or {}).items())], default=str, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key):
+        """Return the cached entry dict for `key` (fresh or stale), or None"""
+        row = self._connect().execute(
+            'SELECT body, etag, last_modified, expires_at FROM http_cache WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'data': json.loads(row[0]),
+            'etag': row[1],
+            'last_modified': row[2],
+            'fresh': row[3] > time.time()
+        }
+
+    def record_hit(self, key):
+        self._count('hits')
+        self._connect().execute('UPDATE http_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+
+    def record_miss(self):
+        self._count('misses')
+
+    def record_stale(self, key):
+        self._count('stale_served')
+        self._connect().execute('UPDATE http_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+
+    def revalidated(self, key, ttl):
+        """Extend a stale entry after the upstream answered 304 Not Modified"""
+        self._count('revalidated')
+        now = time.time()
+        self._connect().execute(
+            'UPDATE http_cache SET expires_at = ?, last_access = ? WHERE key = ?', (now + ttl, now, key)
+        )
+
+    def put(self, key, endpoint, data, ttl, etag=None, last_modified=None):
+        body = json.dumps(data, separators=(',', ':')).encode()
+        now = time.time()
+        conn = self._connect()
+        # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete skips the size triggers
+        conn.execute(
+            'INSERT INTO http_cache '
+            '(key, endpoint, body, etag, last_modified, stored_at, expires_at, last_access, size) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET endpoint = excluded.endpoint, body = excluded.body, '
+            'etag = excluded.etag, last_modified = excluded.last_modified, stored_at = excluded.stored_at, '
+            'expires_at = excluded.expires_at, last_access = excluded.last_access, size = excluded.size',
+            (key, endpoint, body, etag, last_modified, now, now + ttl, now, len(body))
+        )
+        self._count('stores')
+        self._evict(conn)
+
+    def _evict(self, conn):
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+
+        # Evict down to 90% of the cap so we don't evict on every store
+        target = total - int(self.max_bytes * 0.9)
+        freed = evicted = 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for key, size in conn.execute('SELECT key, size FROM http_cache ORDER BY last_access').fetchall():
+                if freed >= target:
+                    break
+                conn.execute('DELETE FROM http_cache WHERE key = ?', (key,))
+                freed += size
+                evicted += 1
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        with self._lock:
+            self._stats['evictions'] += evicted
+        logger.info(f"Evicted {evicted} GolfAPI cache entries ({freed} bytes)")
+
+    @staticmethod
+    def _total_bytes(conn):
+        return conn.execute('SELECT total_bytes FROM http_cache_meta WHERE id = 1').fetchone()[0]
+
+    def clear(self):
+        self._connect().execute('DELETE FROM http_cache')
+
+    def stats(self):
+        """Hit/miss counters for this process plus the size of the shared cache"""
+        conn = self._connect()
+        entries = conn.execute('SELECT COUNT(*) FROM http_cache').fetchone()[0]
+        size = self._total_bytes(conn)
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats.update({
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hit_ratio': (stats['hits'] + stats['revalidated']) / lookups if lookups else None
+        })
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path, max_bytes):
+    """Per-process ResponseCache for `path`"""
+    key = (os.getpid(), path)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = ResponseCache(path, max_bytes)
+    return cache
@@ -0,0 +1,165 @@
+import bisect
+import heapq
+import logging
+import threading
+
+from .. import db
+from ..utils import normalize_name
+from ..models.club import Club
+from ..models.player import Player
+from ..models.course import Course
+from ..models.vote import vote_scores
+from .index_generation import SharedGeneration
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SUGGEST_MODELS = {
+    'club': Club,
+    'player': Player,
+    'course': Course
+}
+
+
+class SuggestIndex:
+    """In-process prefix index over approved club, player and course names.
+
+    Every name is stored once per word start ("rory mcilroy" is reachable from
+    "rory" and from "mcilroy") in a sorted list of (key, type, id) tuples, so a
+    prefix lookup is two bisects plus a scan of the matching range. Items carry
+    their vote score as a popularity weight for ranking.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.RLock()
+        self._keys = []
+        self._items = {}
+        self._built = False
+        self.generation = SharedGeneration('suggest')
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['suggest_index'] = self
+        self.generation.init_app(app)
+
+    @staticmethod
+    def _name_keys(name):
+        """All word-start suffixes of a normalized name"""
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+        words = normalized.split(' ')
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def build(self):
+        """(Re)build the index from the database, one query per item type plus vote tallies"""
+        self.generation.loaded()
+        keys = []
+        items = {}
+        for item_type, model in SUGGEST_MODELS.items():
+            scores = vote_scores(item_type)
+            rows = db.session.query(model.id, model.name).filter(model.is_approved == True).all()  # noqa: E712
+            for item_id, name in rows:
+                items[(item_type, item_id)] = [name, scores.get(item_id, 0)]
+                keys.extend((key, item_type, item_id) for key in self._name_keys(name))
+        keys.sort()
+
+        with self._lock:
+            self._keys = keys
+            self._items = items
+            self._built = True
+
+        logger.info(f"Built suggest index with {len(items)} items and {len(keys)} keys")
+
+    def ensure_built(self):
+        if self._built and self.generation.stale():
+            logger.info("Suggest index data changed in another process, rebuilding")
+            self._built = False
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def invalidate(self):
+        """Mark the index stale in every process so it is rebuilt on next use (e.g. after bulk imports)"""
+        self.mark_changed()
+        db.session.commit()
+        with self._lock:
+            self._built = False
+
+    def mark_changed(self):
+        """Bump the shared generation in the caller's transaction; other processes rebuild once it commits"""
+        self.generation.bump()
+
+    def add(self, item_type, item_id, name, weight=None):
+        """Insert or rename an approved item"""
+        if not self._built:
+            return
+        with self._lock:
+            existing = self._items.get((item_type, item_id))
+            if existing is not None:
+                self._remove_keys(item_type, item_id, existing[0])
+                if weight is None:
+                    weight = existing[1]
+            self._items[(item_type, item_id)] = [name, weight or 0]
+            for key in self._name_keys(name):
+                bisect.insort(self._keys, (key, item_type, item_id))
+
+    def remove(self, item_type, item_id):
+        """Drop an item that was deleted or unapproved"""
+        if not self._built:
+            return
+        with self._lock:
+            existing = self._items.pop((item_type, item_id), None)
+            if existing is not None:
+                self._remove_keys(item_type, item_id, existing[0])
+
+    def _remove_keys(self, item_type, item_id, name):
+        for key in self._name_keys(name):
+            entry = (key, item_type, item_id)
+            pos = bisect.bisect_left(self._keys, entry)
+            if pos < len(self._keys) and self._keys[pos] == entry:
+                del self._keys[pos]
+
+    def set_weight(self, item_type, item_id, weight):
+        """Update the popularity weight of an item after a vote"""
+        item = self._items.get((item_type, item_id))
+        if item is not None:
+            item[1] = weight
+
+    def suggest(self, query, types=None, limit=10):
+        """Return the top `limit` items whose name has a word starting with `query`"""
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        self.ensure_built()
+
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (prefix,))
+            end = bisect.bisect_left(self._keys, (prefix + '\uffff',))
+            matches = self._keys[start:end]
+            items = self._items
+
+        candidates = {}
+        for _, item_type, item_id in matches:
+            if types and item_type not in types:
+                continue
+            item = items.get((item_type, item_id))
+            if item is not None and (item_type, item_id) not in candidates:
+                name, weight = item
+                candidates[(item_type, item_id)] = (weight, -len(name), name)
+
+        top = heapq.nlargest(limit, candidates.items(), key=lambda c: c[1][:2])
+        return [
+            {
+                'type': item_type,
+                'id': item_id,
+                'name': name,
+                'vote_score': weight
+            }
+            for (item_type, item_id), (weight, _, name) in top
+        ]
+
+
+suggest_index = SuggestIndex()
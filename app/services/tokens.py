@@ -0,0 +1,222 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import request
+
+from .. import db, login_manager
+from ..models.user import User, TokenUser, RevokedToken
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_JWT_HEADER = {'alg': 'HS256', 'typ': 'JWT'}
+
+
+class TokenError(Exception):
+    """Raised for malformed, forged, expired or revoked tokens"""
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data):
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def encode_jwt(claims, secret):
+    """Encode claims as an HS256-signed JWT"""
+    signing_input = '.'.join((
+        _b64encode(json.dumps(_JWT_HEADER, separators=(',', ':')).encode()),
+        _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+    ))
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f'{signing_input}.{_b64encode(signature)}'
+
+
+def decode_jwt(token, secret):
+    """Verify an HS256 JWT's signature and expiry and return its claims"""
+    try:
+        header_b64, claims_b64, signature_b64 = token.split('.')
+        header = json.loads(_b64decode(header_b64))
+        signature = _b64decode(signature_b64)
+    except (ValueError, TypeError, AttributeError):
+        raise TokenError('Malformed token')
+
+    if not isinstance(header, dict) or header.get('alg') != 'HS256':
+        raise TokenError('Unsupported token algorithm')
+
+    expected = hmac.new(secret.encode(), f'{header_b64}.{claims_b64}'.encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise TokenError('Invalid token signature')
+
+    try:
+        claims = json.loads(_b64decode(claims_b64))
+    except ValueError:
+        raise TokenError('Malformed token')
+    if not isinstance(claims, dict):
+        raise TokenError('Malformed token')
+    if not isinstance(claims.get('exp'), (int, float)) or claims['exp'] <= time.time():
+        raise TokenError('Token expired')
+    return claims
+
+
+class TokenService:
+    """Stateless access/refresh tokens for the JSON API.
+
+    Access tokens carry the user id, username and role, so API requests
+    with an `Authorization: Bearer` header are authenticated from the
+    signature alone. Refresh tokens are single-use: every refresh revokes
+    the presented token, and presenting a revoked one revokes its whole
+    family. Revocations live in the small `revoked_tokens` table, pruned as
+    entries expire. Each worker mirrors it in memory, re-reading it at most
+    every JWT_REVOCATION_REFRESH seconds.
+    """
+
+    def __init__(self, app=None):
+        self._revoked = set()
+        self._revoked_loaded_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.secret = app.config.get('JWT_SECRET_KEY')
+        self.access_expires = int(app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+        self.refresh_expires = int(app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds())
+        self.revocation_refresh = app.config.get('JWT_REVOCATION_REFRESH', 30)
+
+        if not self.secret:
+            logger.warning("JWT_SECRET_KEY not configured - bearer token authentication disabled")
+
+        login_manager.request_loader(self._load_user_from_request)
+        app.extensions['token_service'] = self
+
+    def issue_tokens(self, user, family=None):
+        """Issue an access/refresh pair for a User"""
+        now = int(time.time())
+        access_token = encode_jwt({
+            'type': 'access',
+            'sub': str(user.id),
+            'username': user.username,
+            'role': user.role.name if user.role else None,
+            'jti': str(uuid.uuid4()),
+            'iat': now,
+            'exp': now + self.access_expires
+        }, self.secret)
+        refresh_token = encode_jwt({
+            'type': 'refresh',
+            'sub': str(user.id),
+            'jti': str(uuid.uuid4()),
+            'fam': family or str(uuid.uuid4()),
+            'iat': now,
+            'exp': now + self.refresh_expires
+        }, self.secret)
+        return {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'token_type': 'Bearer',
+            'expires_in': self.access_expires
+        }
+
+    def decode(self, token, token_type):
+        if not self.secret:
+            raise TokenError('Token authentication is not configured')
+        claims = decode_jwt(token, self.secret)
+        if claims.get('type') != token_type:
+            raise TokenError(f'Expected a {token_type} token')
+        if self.is_revoked(claims.get('jti')) or self.is_revoked(claims.get('fam')):
+            raise TokenError('Token revoked')
+        return claims
+
+    def refresh(self, refresh_token):
+        """Rotate a refresh token: revoke it and issue a new pair in the same family"""
+        if not self.secret:
+            raise TokenError('Token authentication is not configured')
+        claims = decode_jwt(refresh_token, self.secret)
+        if claims.get('type') != 'refresh':
+            raise TokenError('Expected a refresh token')
+
+        # Refresh is rare, so check revocations against the database directly
+        if RevokedToken.query.get(claims['fam']) is not None:
+            raise TokenError('Token revoked')
+        if RevokedToken.query.get(claims['jti']) is not None:
+            # A rotated-out token was replayed: assume theft and kill the family
+            logger.warning(f"Refresh token reuse detected for user {claims['sub']}")
+            self.revoke_family(claims['fam'])
+            raise TokenError('Token revoked')
+
+        user = User.query.get(int(claims['sub']))
+        if user is None:
+            raise TokenError('Unknown user')
+
+        self.revoke(claims['jti'], claims['exp'], commit=False)
+        tokens = self.issue_tokens(user, family=claims['fam'])
+        db.session.commit()
+        return tokens
+
+    def revoke(self, jti, expires, commit=True):
+        """Add a token id or family id to the revocation list until `expires` (epoch seconds)"""
+        now = datetime.utcnow()
+        expires_at = datetime.utcfromtimestamp(expires)
+        RevokedToken.query.filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+        revoked = RevokedToken.query.get(jti)
+        if revoked is None:
+            db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        elif revoked.expires_at < expires_at:
+            revoked.expires_at = expires_at
+        if commit:
+            db.session.commit()
+        with self._lock:
+            self._revoked.add(jti)
+
+    def revoke_family(self, family, commit=True):
+        """Revoke every refresh token in a family.
+
+        Tokens rotated later in the family expire after the one presented, so
+        the entry has to outlive any token the family can still hold.
+        """
+        self.revoke(family, int(time.time()) + self.refresh_expires, commit=commit)
+
+    def is_revoked(self, jti):
+        if jti is None:
+            return False
+        if time.monotonic() - self._revoked_loaded_at > self.revocation_refresh:
+            self._load_revocations()
+        return jti in self._revoked
+
+    def _load_revocations(self):
+        with self._lock:
+            if time.monotonic() - self._revoked_loaded_at <= self.revocation_refresh:
+                return
+            self._revoked = set(
+                jti for (jti,) in db.session.query(RevokedToken.jti).filter(
+                    RevokedToken.expires_at > datetime.utcnow()
+                )
+            )
+            self._revoked_loaded_at = time.monotonic()
+
+    def bearer_claims(self):
+        """Claims of a valid bearer access token on the current request, or None"""
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer '):
+            return None
+        try:
+            return self.decode(header[len('Bearer '):].strip(), 'access')
+        except TokenError as e:
+            logger.info(f"Rejected bearer token: {str(e)}")
+            return None
+
+    def _load_user_from_request(self, _request):
+        claims = self.bearer_claims()
+        return TokenUser(claims) if claims else None
+
+
+token_service = TokenService()
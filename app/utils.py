@@ -0,0 +1,32 @@
+import re
+import time
+import unicodedata
+from email.utils import parsedate_to_datetime
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+def normalize_name(name):
+    """Normalize a display name for matching (accents, case and punctuation folded)"""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', stripped.casefold()).strip()
+
+
+def cache_ttl(headers, default_ttl):
+    """Seconds an HTTP response may be cached for, from Cache-Control max-age or Expires"""
+    cache_control = headers.get('Cache-Control', '')
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return int(match.group(1))
+    if headers.get('Expires'):
+        try:
+            return max(0, int(parsedate_to_datetime(headers['Expires']).timestamp() - time.time()))
+        except (TypeError, ValueError):
+            pass
+    return default_ttl
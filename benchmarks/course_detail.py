@@ -0,0 +1,99 @@
+"""Course detail latency with and without the packed scorecard.
+
+Seeds an in-memory SQLite database with courses and 18 holes each, then
+times GET /api/courses/<id> for courses served from `course_holes` and for
+courses served from `Course.scorecard`.
+
+    python -m benchmarks.course_detail --courses 2000 --requests 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import event
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.course import Course, CourseHole
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ECHO = False
+
+
+def seed(num_courses):
+    rng = random.Random(42)
+    db.session.execute(db.insert(Course), [
+        {'name': f'Course {i}', 'city': 'Golf City', 'state': 'GA', 'is_approved': True}
+        for i in range(num_courses)
+    ])
+    db.session.execute(db.insert(CourseHole), [
+        {
+            'course_id': course_id,
+            'hole_number': number,
+            'par': rng.choice((3, 4, 4, 5)),
+            'yards': rng.randint(120, 620),
+            'handicap': number,
+            'description': f'Hole {number}'
+        }
+        for course_id in range(1, num_courses + 1)
+        for number in range(1, 19)
+    ])
+    db.session.commit()
+    
+    # Materialize scorecards for the even-numbered half of the courses
+    for course in Course.query.filter(Course.id % 2 == 0):
+        course.refresh_scorecard()
+    db.session.commit()
+
+
+def run(client, course_ids, statement_counter):
+    latencies = []
+    statement_counter[0] = 0
+    for course_id in course_ids:
+        start = time.perf_counter()
+        response = client.get(f'/api/courses/{course_id}')
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    latencies.sort()
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1],
+        'queries_per_request': statement_counter[0] / len(course_ids)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    
+    config_by_name['benchmark'] = BenchmarkConfig
+    app = create_app('benchmark')
+    
+    with app.app_context():
+        db.create_all()
+        seed(args.courses)
+        
+        statement_counter = [0]
+        
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(*_):
+            statement_counter[0] += 1
+        
+        client = app.test_client()
+        rng = random.Random(7)
+        odd_ids = [rng.randrange(1, args.courses + 1, 2) for _ in range(args.requests)]
+        even_ids = [rng.randrange(2, args.courses + 1, 2) for _ in range(args.requests)]
+        
+        for label, ids in (('course_holes', odd_ids), ('scorecard', even_ids)):
+            result = run(client, ids, statement_counter)
+            print(f"{label:>12}: p50 {result['p50_ms']:.3f} ms, p95 {result['p95_ms']:.3f} ms, "
+                  f"{result['queries_per_request']:.1f} queries/request")
+
+
+if __name__ == '__main__':
+    main()
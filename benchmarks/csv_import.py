@@ -0,0 +1,238 @@
+"""CSV import throughput for DataImportService.
+
+Writes a synthetic players CSV (with some blank and malformed cells) and
+times three things:
+
+  legacy     the old per-cell loop: iterrows() with pd.notna, pd.to_datetime
+             and int() on every cell, on the first --legacy-rows rows
+  normalize  read_csv + normalize_frame on the whole file
+  import     import_players_from_csv on the first --import-rows rows, in
+             chunks of --chunk-size rows, into a temporary SQLite file
+  reimport   the same players import again; every row is unchanged
+  clubs      import_clubs_from_csv on --import-rows synthetic clubs spread
+             over --brands brands, into the same database, then again
+
+The import phases report SQL statements executed and the process's peak
+RSS. Run the import phase on its own
+with different --import-rows to check that memory does not grow with the
+file size:
+
+    python -m benchmarks.csv_import --rows 1000000 --legacy-rows 50000 --import-rows 20000
+    python -m benchmarks.csv_import --phases import --rows 200000 --import-rows 200000
+"""
+import argparse
+import io
+import os
+import random
+import resource
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.club import Club
+from app.models.player import Player
+from app.services.data_import import PLAYER_COLUMNS, DataImportService, normalize_frame
+
+COUNTRIES = ['USA', 'England', 'Northern Ireland', 'Spain', 'Japan', 'Australia', 'South Africa', 'Sweden']
+HEADER = ['name', 'country', 'birthdate', 'turned_pro', 'bio', 'website', 'twitter_handle',
+          'instagram_handle', 'world_ranking', 'profile_picture']
+TEXT_FIELDS = [field for field, kind in PLAYER_COLUMNS.items() if kind == 'text']
+CLUB_TYPES = ['Driver', 'Fairway Wood', 'Hybrid', 'Iron Set', 'Wedge', 'Putter']
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    SQLALCHEMY_ECHO = False
+
+
+def write_players_csv(path, rows, seed=42):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(HEADER) + '\n')
+        for i in range(rows):
+            birthdate = f'{rng.randint(1960, 2004)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+            turned_pro = str(rng.randint(1980, 2024))
+            ranking = str(i + 1)
+            roll = rng.random()
+            if roll < 0.05:
+                birthdate = ''
+            elif roll < 0.06:
+                turned_pro = 'unknown'  # malformed: reported as a row error
+            elif roll < 0.10:
+                ranking = ''
+            f.write(','.join([
+                f'Player {i}',
+                rng.choice(COUNTRIES),
+                birthdate,
+                turned_pro,
+                f'"Professional golfer number {i}, known for a steady short game"',
+                f'https://player{i}.example.com',
+                f'@player{i}',
+                '' if rng.random() < 0.3 else f'player.{i}',
+                ranking,
+                ''
+            ]) + '\n')
+
+
+def write_clubs_csv(path, rows, brands, seed=42):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('name,brand,type,description,release_year,price\n')
+        for i in range(rows):
+            f.write(f'Club {i},Brand {rng.randrange(brands)},{rng.choice(CLUB_TYPES)},'
+                    f'"A forgiving club, model {i}",{rng.randint(2000, 2025)},{rng.uniform(50, 700):.2f}\n')
+
+
+def legacy_normalize(csv_data):
+    """The pre-vectorization conversion work of import_players_from_csv, without the database"""
+    rows = errors = 0
+    for _, row in csv_data.iterrows():
+        try:
+            dict(
+                name=row.get('name'),
+                country=row.get('country') if pd.notna(row.get('country')) else None,
+                birthdate=pd.to_datetime(row.get('birthdate')).date() if pd.notna(row.get('birthdate')) else None,
+                turned_pro=int(row.get('turned_pro')) if pd.notna(row.get('turned_pro')) else None,
+                bio=row.get('bio') if pd.notna(row.get('bio')) else None,
+                website=row.get('website') if pd.notna(row.get('website')) else None,
+                twitter_handle=row.get('twitter_handle') if pd.notna(row.get('twitter_handle')) else None,
+                instagram_handle=row.get('instagram_handle') if pd.notna(row.get('instagram_handle')) else None,
+                world_ranking=int(row.get('world_ranking')) if pd.notna(row.get('world_ranking')) else None,
+                profile_picture=row.get('profile_picture') if pd.notna(row.get('profile_picture')) else None
+            )
+            rows += 1
+        except Exception:
+            errors += 1
+    return rows, errors
+
+
+def head_csv(path, rows):
+    with open(path, encoding='utf-8') as f:
+        return io.StringIO(''.join(line for _, line in zip(range(rows + 1), f)))
+
+
+def head_file(path, rows):
+    fd, head_path = tempfile.mkstemp(suffix='.csv')
+    with open(path, encoding='utf-8') as src, os.fdopen(fd, 'w', encoding='utf-8') as dst:
+        for _, line in zip(range(rows + 1), src):
+            dst.write(line)
+    return head_path
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def report(label, rows, elapsed, extra=''):
+    print(f"{label:>9}: {rows} rows in {elapsed:.2f}s = {rows / elapsed:10.0f} rows/s{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--legacy-rows', type=int, default=50000)
+    parser.add_argument('--import-rows', type=int, default=20000)
+    parser.add_argument('--chunk-size', type=int, default=5000, help='IMPORT_CHUNK_SIZE')
+    parser.add_argument('--brands', type=int, default=200, help='distinct brands in the clubs file')
+    parser.add_argument('--phases', default='legacy,normalize,import,reimport,clubs')
+    parser.add_argument('--csv', help='reuse this file instead of generating one')
+    args = parser.parse_args()
+    phases = args.phases.split(',')
+
+    path = args.csv
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        start = time.perf_counter()
+        write_players_csv(path, args.rows)
+        print(f"wrote {args.rows} rows ({os.path.getsize(path) / 1e6:.0f} MB) in {time.perf_counter() - start:.1f}s")
+
+    try:
+        if 'legacy' in phases:
+            csv_data = pd.read_csv(head_csv(path, args.legacy_rows), encoding='utf-8')
+            start = time.perf_counter()
+            rows, errors = legacy_normalize(csv_data)
+            report('legacy', rows + errors, time.perf_counter() - start, f" | {errors} errors")
+
+        if 'normalize' in phases:
+            start = time.perf_counter()
+            csv_data = pd.read_csv(path, encoding='utf-8', dtype=dict.fromkeys(TEXT_FIELDS, str))
+            read_at = time.perf_counter()
+            rows, errors = normalize_frame(csv_data, PLAYER_COLUMNS)
+            elapsed = time.perf_counter() - start
+            report('normalize', len(rows) + len(errors), elapsed,
+                   f" | {len(errors)} errors | read_csv {read_at - start:.2f}s")
+            del csv_data, rows, errors
+
+        if 'import' in phases or 'clubs' in phases:
+            # A file database, so the rows imported do not count towards RSS
+            fd, db_path = tempfile.mkstemp(suffix='.db')
+            os.close(fd)
+            BenchmarkConfig.SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+            BenchmarkConfig.IMPORT_CHUNK_SIZE = args.chunk_size
+            config_by_name['benchmark'] = BenchmarkConfig
+            app = create_app('benchmark')
+            try:
+                with app.app_context():
+                    db.create_all()
+                    statements = [0]
+                    
+                    @event.listens_for(db.engine, 'before_cursor_execute')
+                    def count_statement(*_):
+                        statements[0] += 1
+                    
+                    if 'import' in phases:
+                        import_path = head_file(path, args.import_rows)
+                        try:
+                            rss_before = peak_rss_mb()
+                            statements[0] = 0
+                            start = time.perf_counter()
+                            result = DataImportService.import_players_from_csv(import_path)
+                            report('import', args.import_rows, time.perf_counter() - start,
+                                   f" | {result['errors']} errors | {statements[0]} statements"
+                                   f" | peak RSS {rss_before:.0f} -> {peak_rss_mb():.0f} MB")
+                            assert Player.query.count() == result['inserted']
+                            
+                            if 'reimport' in phases:
+                                statements[0] = 0
+                                start = time.perf_counter()
+                                result = DataImportService.import_players_from_csv(import_path)
+                                report('reimport', args.import_rows, time.perf_counter() - start,
+                                       f" | {result['unchanged']} unchanged, {result['updated']} updated"
+                                       f" | {statements[0]} statements")
+                        finally:
+                            os.remove(import_path)
+                    
+                    if 'clubs' in phases:
+                        fd, clubs_path = tempfile.mkstemp(suffix='.csv')
+                        os.close(fd)
+                        write_clubs_csv(clubs_path, args.import_rows, args.brands)
+                        try:
+                            for label in ('clubs', 'reimport'):
+                                statements[0] = 0
+                                start = time.perf_counter()
+                                result = DataImportService.import_clubs_from_csv(clubs_path)
+                                report(label, args.import_rows, time.perf_counter() - start,
+                                       f" | {result['inserted']} new, {result['unchanged']} unchanged"
+                                       f" | {statements[0]} statements")
+                        finally:
+                            os.remove(clubs_path)
+                        assert Club.query.count() == args.import_rows
+            finally:
+                os.remove(db_path)
+    finally:
+        if args.csv is None:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""GolfAPI client overhead: bare requests.get versus the pooled session.
+
+Starts the local stand-in server and fetches course details and holes
+sequentially, first with a new connection per call (the old behaviour) and
+then through GolfAPIService's shared keep-alive session. Reports requests
+per second and latency percentiles for each.
+
+    python -m benchmarks.golf_api_client --requests 2000 --latency-ms 0
+"""
+import argparse
+import time
+
+import requests
+
+from app import create_app
+from app.config import TestingConfig, config_by_name
+from app.services.golf_api import GolfAPIService
+from benchmarks.golf_api_standin import start_server
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    GOLF_API_KEY = 'benchmark'
+    GOLF_API_RATE_LIMIT = None  # measure connection overhead, not the client-side quota
+
+
+def run(label, fetch, n):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        course_id = i // 2 + 1
+        endpoint = f'courses/{course_id}' if i % 2 else f'courses/{course_id}/holes'
+        t0 = time.perf_counter()
+        fetch(endpoint)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:>8}: {n / elapsed:8.1f} req/s  p50 {latencies[n // 2]:.2f} ms  "
+          f"p95 {latencies[int(n * 0.95) - 1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=0, help='stand-in server latency per request')
+    args = parser.parse_args()
+    
+    # Each course is fetched twice (details and holes); the stand-in 404s unknown ids
+    server, base_url = start_server(latency_ms=args.latency_ms, total_courses=(args.requests + 1) // 2)
+    BenchmarkConfig.GOLF_API_BASE_URL = base_url
+    config_by_name['benchmark'] = BenchmarkConfig
+    app = create_app('benchmark')
+    
+    headers = {'Authorization': 'Bearer benchmark', 'Accept': 'application/json'}
+    
+    def bare(endpoint):
+        response = requests.get(f'{base_url}/{endpoint}', headers=headers)
+        response.raise_for_status()
+        return response.json()
+    
+    with app.app_context():
+        service = GolfAPIService()
+        run('bare', bare, args.requests)
+        run('pooled', service._make_request, args.requests)
+    
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
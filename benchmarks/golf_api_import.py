@@ -0,0 +1,144 @@
+"""GolfAPI import throughput against the local stand-in server.
+
+Starts benchmarks.golf_api_standin with synthetic courses and drives
+GolfAPIService against it with an in-memory SQLite database:
+
+  search  pages through every search result with iter_search_pages
+  single  imports --single courses one at a time with import_course
+  bulk    imports --bulk courses with bulk_import_courses
+
+For each phase it reports courses (or pages) per second, p50/p95 latency
+per upstream request and, for single imports, p95 per course.
+
+    python -m benchmarks.golf_api_import --courses 5000 --bulk 2000 --latency-ms 20 --concurrency 16
+"""
+import argparse
+import threading
+import time
+
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.course import Course
+from app.services.circuit_breaker import golf_api_breaker
+from app.services.golf_api import GolfAPIService
+from benchmarks.golf_api_standin import start_server
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    SQLALCHEMY_ECHO = False
+    GOLF_API_KEY = 'benchmark'
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)] if values else 0.0
+
+
+class TimedService(GolfAPIService):
+    """GolfAPIService that records the latency of every upstream request"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+        self._latency_lock = threading.Lock()
+
+    def _make_request(self, endpoint, params=None, revalidate=False):
+        start = time.perf_counter()
+        try:
+            return super()._make_request(endpoint, params, revalidate)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._latency_lock:
+                self.latencies.append(elapsed)
+
+    def take_latencies(self):
+        with self._latency_lock:
+            latencies, self.latencies = self.latencies, []
+        return latencies
+
+
+def report(label, count, unit, elapsed, latencies, extra=''):
+    print(f"{label:>7}: {count} {unit} in {elapsed:.2f}s = {count / elapsed:8.1f} {unit}/s | "
+          f"request p50 {percentile(latencies, 0.5):.1f} ms p95 {percentile(latencies, 0.95):.1f} ms"
+          f"{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, default=5000, help='synthetic courses served by the stand-in')
+    parser.add_argument('--single', type=int, default=100, help='courses to import with import_course')
+    parser.add_argument('--bulk', type=int, default=1000, help='courses to import with bulk_import_courses')
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--server-rate-limit', type=float, default=None, help='stand-in requests/sec before 429')
+    parser.add_argument('--client-rate-limit', type=float, default=None, help='GOLF_API_RATE_LIMIT requests/sec')
+    parser.add_argument('--concurrency', type=int, default=8, help='GOLF_API_CONCURRENCY')
+    parser.add_argument('--page-size', type=int, default=100, help='GOLF_API_PAGE_SIZE')
+    parser.add_argument('--batch-size', type=int, default=50, help='GOLF_API_WRITE_BATCH')
+    parser.add_argument('--phases', default='search,single,bulk')
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        total_courses=args.courses,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.server_rate_limit
+    )
+    BenchmarkConfig.GOLF_API_BASE_URL = base_url
+    BenchmarkConfig.GOLF_API_RATE_LIMIT = (args.client_rate_limit, args.client_rate_limit) \
+        if args.client_rate_limit else None
+    BenchmarkConfig.GOLF_API_CONCURRENCY = args.concurrency
+    BenchmarkConfig.GOLF_API_PAGE_SIZE = args.page_size
+    BenchmarkConfig.GOLF_API_WRITE_BATCH = args.batch_size
+    config_by_name['benchmark'] = BenchmarkConfig
+    app = create_app('benchmark')
+    phases = args.phases.split(',')
+
+    with app.app_context():
+        db.create_all()
+        service = TimedService()
+
+        if 'search' in phases:
+            start = time.perf_counter()
+            pages = found = 0
+            for _, courses in service.iter_search_pages():
+                pages += 1
+                found += len(courses)
+            report('search', pages, 'pages', time.perf_counter() - start, service.take_latencies(),
+                   f" | {found} results")
+
+        if 'single' in phases:
+            per_course = []
+            start = time.perf_counter()
+            for course_id in range(1, args.single + 1):
+                t0 = time.perf_counter()
+                service.import_course(str(course_id))
+                per_course.append((time.perf_counter() - t0) * 1000)
+            report('single', args.single, 'courses', time.perf_counter() - start, service.take_latencies(),
+                   f" | course p95 {percentile(per_course, 0.95):.1f} ms")
+
+        if 'bulk' in phases:
+            imported_before = Course.query.count()
+            start = time.perf_counter()
+            result = service.bulk_import_courses(limit=args.bulk + args.single)
+            elapsed = time.perf_counter() - start
+            report('bulk', result['imported'], 'courses', elapsed, service.take_latencies(),
+                   f" | {result['existing']} existing, {result['errors']} errors")
+            assert Course.query.count() == imported_before + result['imported']
+
+    print(f"stand-in: {server.state.counts}")
+    print(f"breaker: state={golf_api_breaker.state} trips={golf_api_breaker.stats()['trips']}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
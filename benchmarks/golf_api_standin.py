@@ -0,0 +1,233 @@
+"""Local stand-in for the GolfAPI.io endpoints used by GolfAPIService.
+
+Serves GET /courses (paged with limit/offset), /courses/<id> and
+/courses/<id>/holes over HTTP/1.1 keep-alive. Courses and holes are
+synthetic but deterministic: course N always has the same name, location
+and scorecard for a given --seed. Latency, error rate and a server-side
+rate limit are tunable. Responses carry an ETag (answering If-None-Match
+with 304) and, optionally, a Cache-Control max-age. Run it standalone, or
+start it in-process from a benchmark with `start_server()`.
+
+    python -m benchmarks.golf_api_standin --port 8800 --courses 20000 \
+        --latency-ms 20 --jitter-ms 10 --error-rate 0.01 --rate-limit 50
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+PREFIXES = ['Pine', 'Oak', 'Eagle', 'Heron', 'Cedar', 'Willow', 'Stone', 'Lake', 'River', 'Prairie', 'Ridge', 'Harbor']
+SUFFIXES = ['Valley', 'Creek', 'Hills', 'Dunes', 'Links', 'Meadows', 'Point', 'Bluffs', 'Hollow', 'Springs']
+KINDS = ['Golf Club', 'Country Club', 'Golf Course', 'Golf Links', 'Golf Resort']
+CITIES = [('Augusta', 'GA'), ('Pinehurst', 'NC'), ('Scottsdale', 'AZ'), ('Monterey', 'CA'), ('Kiawah', 'SC'),
+          ('Bandon', 'OR'), ('Kohler', 'WI'), ('Orlando', 'FL'), ('Austin', 'TX'), ('Boise', 'ID')]
+TYPES = ['Public', 'Private', 'Resort', 'Semi-Private', 'Municipal']
+HOLE_PARS = [4, 4, 3, 5, 4, 3, 4, 5, 4, 4, 3, 4, 5, 4, 4, 3, 5, 4]
+YARDS_BY_PAR = {3: (120, 240), 4: (310, 480), 5: (480, 620)}
+
+
+def _rng(seed, course_id, salt=''):
+    return random.Random(f'{seed}:{course_id}:{salt}')
+
+
+def course_holes(course_id, seed=0):
+    """Deterministic hole list for a course"""
+    rng = _rng(seed, course_id, 'holes')
+    num_holes = 9 if rng.random() < 0.1 else 18
+    pars = HOLE_PARS[:num_holes]
+    rng.shuffle(pars)
+    handicaps = list(range(1, num_holes + 1))
+    rng.shuffle(handicaps)
+    holes = []
+    for number, (par, handicap) in enumerate(zip(pars, handicaps), start=1):
+        hole = {'number': number, 'par': par, 'yards': rng.randint(*YARDS_BY_PAR[par]), 'handicap': handicap}
+        if rng.random() < 0.2:
+            hole['description'] = f'{rng.choice(["Dogleg left", "Dogleg right", "Island green", "Uphill"])} par {par}'
+        holes.append(hole)
+    return holes
+
+
+def course_payload(course_id, seed=0):
+    """Deterministic course detail payload"""
+    rng = _rng(seed, course_id)
+    city, state = rng.choice(CITIES)
+    holes = course_holes(course_id, seed)
+    return {
+        'id': str(course_id),
+        'name': f'{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)} {rng.choice(KINDS)} {course_id}',
+        'description': f'A {rng.choice(["parkland", "links", "desert", "mountain", "heathland"])} course',
+        'address': {
+            'line1': f'{rng.randint(1, 9999)} Fairway Drive',
+            'city': city,
+            'state': state,
+            'country': 'USA',
+            'zip': f'{rng.randint(10000, 99999)}'
+        },
+        'website': f'https://course{course_id}.example.com',
+        'year_built': rng.randint(1890, 2020),
+        'type': rng.choice(TYPES),
+        'num_holes': len(holes),
+        'par': sum(hole['par'] for hole in holes),
+        'length_yards': sum(hole['yards'] for hole in holes),
+        'location': {'lat': round(rng.uniform(25.0, 49.0), 6), 'lng': round(rng.uniform(-124.0, -67.0), 6)}
+    }
+
+
+def search_payload(offset, limit, total, seed=0):
+    ids = range(offset + 1, min(offset + limit, total) + 1)
+    courses = []
+    for course_id in ids:
+        course = course_payload(course_id, seed)
+        courses.append({
+            'id': course['id'],
+            'name': course['name'],
+            'city': course['address']['city'],
+            'state': course['address']['state'],
+            'type': course['type']
+        })
+    return {'courses': courses, 'total': total}
+
+
+class StandInState:
+    """Knobs and counters shared by all handler threads of one server"""
+
+    def __init__(self, total_courses=20, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=None,
+                 max_age=None, seed=0):
+        self.total_courses = total_courses
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.max_age = max_age
+        self.seed = seed
+        self.counts = {'requests': 0, 'ok': 0, 'not_modified': 0, 'errors': 0, 'throttled': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit or 0)
+        self._refilled = time.monotonic()
+
+    def admit(self):
+        """Return (delay seconds, None) or (0, status code) for an injected failure"""
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+                self._refilled = now
+                if self._tokens < 1.0:
+                    self.counts['throttled'] += 1
+                    return 0.0, 429
+                self._tokens -= 1.0
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.counts['errors'] += 1
+                return delay, 503
+            return delay, None
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, data=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        state = self.state
+        delay, failure = state.admit()
+        if delay:
+            time.sleep(delay)
+        if failure == 429:
+            self._send(429, b'{"error":"rate limited"}', {'Retry-After': '1', 'Content-Type': 'application/json'})
+            return
+        if failure:
+            self._send(failure, b'{"error":"upstream unavailable"}', {'Content-Type': 'application/json'})
+            return
+
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        if parts == ['courses']:
+            query = parse_qs(url.query)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', ['20'])[0])
+            body = search_payload(offset, limit, state.total_courses, state.seed)
+        elif len(parts) in (2, 3) and parts[0] == 'courses' and parts[1].isdigit() \
+                and 0 < int(parts[1]) <= state.total_courses:
+            if len(parts) == 2:
+                body = course_payload(int(parts[1]), state.seed)
+            elif parts[2] == 'holes':
+                body = course_holes(int(parts[1]), state.seed)
+            else:
+                self._send(404)
+                return
+        else:
+            self._send(404)
+            return
+
+        data = json.dumps(body).encode()
+        headers = {'ETag': '"%s"' % hashlib.sha1(data).hexdigest()}
+        if state.max_age is not None:
+            headers['Cache-Control'] = f'max-age={state.max_age}'
+        if self.headers.get('If-None-Match') == headers['ETag']:
+            state.count('not_modified')
+            self._send(304, headers=headers)
+            return
+        state.count('ok')
+        headers['Content-Type'] = 'application/json'
+        self._send(200, data, headers)
+
+
+def start_server(port=0, latency_ms=0, max_age=None, total_courses=20, jitter_ms=0, error_rate=0.0,
+                 rate_limit=None, seed=0):
+    """Start the stand-in on a daemon thread; returns (server, base_url). Counters are on server.state"""
+    state = StandInState(total_courses, latency_ms, jitter_ms, error_rate, rate_limit, max_age, seed)
+    handler = type('Handler', (StandInHandler,), {'state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--courses', type=int, default=20, help='number of courses the search pages through')
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0, help='extra random latency, uniform in [0, jitter]')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second before answering 429')
+    parser.add_argument('--max-age', type=int, default=None, help='Cache-Control max-age to send')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.latency_ms, args.max_age, args.courses, args.jitter_ms,
+                                    args.error_rate, args.rate_limit, args.seed)
+    print(f"GolfAPI stand-in listening on {base_url} with {args.courses} courses")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(server.state.counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Login throughput under concurrency with the bounded password hashing pool.
+
+Creates users in an in-memory SQLite database, then hammers
+POST /auth/api/login from many client threads and reports successful
+logins per second, fast 503 rejections and latency percentiles.
+
+    python -m benchmarks.login_throughput --clients 32 --seconds 10 --workers 4
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.user import User, Role, init_roles
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    SQLALCHEMY_ECHO = False
+
+
+def client_loop(app, email, deadline, results, lock):
+    client = app.test_client()
+    latencies, rejected = [], 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = client.post('/auth/api/login', json={'email': email, 'password': 'correct horse'})
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code == 200:
+            latencies.append(elapsed)
+        elif response.status_code == 503:
+            rejected += 1
+        else:
+            raise RuntimeError(f"Unexpected status {response.status_code}")
+    with lock:
+        results['latencies'].extend(latencies)
+        results['rejected'] += rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=4, help='PASSWORD_HASH_WORKERS')
+    parser.add_argument('--queue-depth', type=int, default=16, help='PASSWORD_HASH_QUEUE_DEPTH')
+    args = parser.parse_args()
+    
+    BenchmarkConfig.PASSWORD_HASH_WORKERS = args.workers
+    BenchmarkConfig.PASSWORD_HASH_QUEUE_DEPTH = args.queue_depth
+    config_by_name['benchmark'] = BenchmarkConfig
+    app = create_app('benchmark')
+    
+    with app.app_context():
+        db.create_all()
+        init_roles()
+        user_role = Role.query.filter_by(name=Role.USER_ROLE).first()
+        for i in range(args.clients):
+            user = User(username=f'user{i}', email=f'user{i}@example.com', role=user_role)
+            user.password = 'correct horse'
+            db.session.add(user)
+        db.session.commit()
+    
+    results = {'latencies': [], 'rejected': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        futures = [
+            pool.submit(client_loop, app, f'user{i}@example.com', deadline, results, lock)
+            for i in range(args.clients)
+        ]
+        for future in futures:
+            future.result()
+    
+    latencies = sorted(results['latencies'])
+    if not latencies:
+        print("No successful logins")
+        return
+    print(f"clients={args.clients} hash_workers={args.workers} queue_depth={args.queue_depth}")
+    print(f"logins/sec: {len(latencies) / args.seconds:.1f}")
+    print(f"rejected (503)/sec: {results['rejected'] / args.seconds:.1f}")
+    print(f"latency p50 {latencies[len(latencies) // 2]:.1f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
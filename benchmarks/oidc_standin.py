@@ -0,0 +1,142 @@
+"""Local stand-in for an OpenID provider's discovery and JWKS endpoints.
+
+Serves GET /.well-known/openid-configuration and /jwks over HTTP/1.1
+keep-alive, both with a Cache-Control max-age, so ProviderMetadataCache
+can be exercised without reaching Google. Latency and error rate are
+tunable, and `rotate_keys()` swaps the signing key id the way a provider
+rotation would. Point GOOGLE_DISCOVERY_URL at it, or start it in-process
+with `start_server()`.
+
+    python -m benchmarks.oidc_standin --port 8900 --latency-ms 200 --max-age 60
+    GOOGLE_DISCOVERY_URL=http://127.0.0.1:8900/.well-known/openid-configuration flask run
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DISCOVERY_PATH = '/.well-known/openid-configuration'
+
+
+class StandInState:
+    """Knobs and counters shared by all handler threads of one server"""
+
+    def __init__(self, latency_ms=0, error_rate=0.0, max_age=3600, seed=0):
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self.max_age = max_age
+        self.base_url = None
+        self.key_version = 1
+        self.counts = {'discovery': 0, 'jwks': 0, 'errors': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def admit(self, name):
+        """Count a request; returns True if it should fail with 503"""
+        with self._lock:
+            self.counts[name] += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.counts['errors'] += 1
+                return True
+            return False
+
+    def rotate_keys(self):
+        with self._lock:
+            self.key_version += 1
+
+    def discovery(self):
+        return {
+            'issuer': self.base_url,
+            'authorization_endpoint': f'{self.base_url}/authorize',
+            'token_endpoint': f'{self.base_url}/token',
+            'userinfo_endpoint': f'{self.base_url}/userinfo',
+            'jwks_uri': f'{self.base_url}/jwks',
+            'response_types_supported': ['code'],
+            'subject_types_supported': ['public'],
+            'id_token_signing_alg_values_supported': ['RS256']
+        }
+
+    def jwks(self):
+        return {'keys': [{
+            'kty': 'RSA',
+            'alg': 'RS256',
+            'use': 'sig',
+            'kid': f'standin-{self.key_version}',
+            'n': 'sXchDaQebHnPiGvyDOAT4saGEUetSyo9MKLOoWFsueri23bOdgWp4Dy1WlUzewbgBHod5pcM9H95GQRV3JDXboIRROSBigeC5yjU1hGzHHyXss8UDprecbAYxknTcQkhslANGRUZmdTOQ5qTRsLAt6BTYuyvVRdhS8exSZEy_c4gs_7svlJJQ4H9_NxsiIoLwAEk7-Q3UXERGYw_75IDrGA84-lA_-Ct4eTlXHBIY2EaV7t7LjJaynVJCpkv4LKjTTAumiGUIuQhrNhZLuF_RJLqHpM2kgWFLU7-VTdL1VbC2tejvcI2BlMkEpk1BzBZI0KQB0GaDWFLN-aEAw3vRw',
+            'e': 'AQAB'
+        }]}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, data=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        state = self.state
+        if self.path == DISCOVERY_PATH:
+            name, body = 'discovery', state.discovery
+        elif self.path == '/jwks':
+            name, body = 'jwks', state.jwks
+        else:
+            self._send(404)
+            return
+
+        failed = state.admit(name)
+        if state.latency:
+            time.sleep(state.latency)
+        if failed:
+            self._send(503, b'{"error":"provider unavailable"}', {'Content-Type': 'application/json'})
+            return
+        self._send(200, json.dumps(body()).encode(), {
+            'Content-Type': 'application/json',
+            'Cache-Control': f'public, max-age={state.max_age}'
+        })
+
+
+def start_server(port=0, latency_ms=0, error_rate=0.0, max_age=3600, seed=0):
+    """Start the stand-in on a daemon thread; returns (server, discovery_url). Counters are on server.state"""
+    state = StandInState(latency_ms, error_rate, max_age, seed)
+    handler = type('Handler', (StandInHandler,), {'state': state})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.state = state
+    state.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state.base_url + DISCOVERY_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--max-age', type=int, default=3600, help='Cache-Control max-age to send')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server, discovery_url = start_server(args.port, args.latency_ms, args.error_rate, args.max_age, args.seed)
+    print(f"OIDC stand-in listening on {discovery_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(server.state.counts)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,14 @@
 import os
+from datetime import timedelta
+
+import click
 from app import create_app, db
 from app.models.user import User, Role, init_roles
 from app.models.club import Club, ClubBrand, ClubType, init_club_types
 from app.models.player import Player, PlayerAchievement
 from app.models.course import Course, CourseHole
 from app.models.vote import Vote, Comment
+from app.models.imports import ImportCheckpoint, IndexGeneration
 from flask_migrate import Migrate
 
 app = create_app(os.getenv('FLASK_CONFIG', 'development'))
@@ -25,7 +29,9 @@ def make_shell_context():
         Course=Course,
         CourseHole=CourseHole,
         Vote=Vote,
-        Comment=Comment
+        Comment=Comment,
+        ImportCheckpoint=ImportCheckpoint,
+        IndexGeneration=IndexGeneration
     )
 
 @app.cli.command("init-db")
@@ -42,6 +48,112 @@ def init_db():
     
     print("Database initialized with initial data.")
 
+@app.cli.command("build-scorecards")
+def build_scorecards():
+    """Materialize packed scorecards for courses that have holes but no scorecard"""
+    course_ids = [course_id for (course_id,) in
+                  db.session.query(Course.id).filter(Course.scorecard.is_(None)).all()]
+    built = 0
+    
+    # Two queries and one commit per batch of courses
+    for start in range(0, len(course_ids), 500):
+        batch_ids = course_ids[start:start + 500]
+        holes_by_course = {}
+        for hole in CourseHole.query.filter(CourseHole.course_id.in_(batch_ids)):
+            holes_by_course.setdefault(hole.course_id, []).append(hole)
+        
+        for course in Course.query.filter(Course.id.in_(batch_ids)):
+            holes = holes_by_course.get(course.id)
+            if holes:
+                course.refresh_scorecard(holes)
+                built += 1
+        
+        db.session.commit()
+    
+    print(f"Built scorecards for {built} courses.")
+
+@app.cli.command("recount-comments")
+def recount_comments():
+    """Recompute denormalized comment and reply counts from the comments table"""
+    from sqlalchemy import func
+    
+    for commentable_type, model in (('club', Club), ('player', Player), ('course', Course)):
+        count = db.session.query(func.count(Comment.id)).filter(
+            Comment.commentable_type == commentable_type,
+            Comment.commentable_id == model.id,
+            Comment.is_deleted == False  # noqa: E712
+        ).scalar_subquery()
+        model.query.update({model.comment_count: count}, synchronize_session=False)
+    
+    replies = db.aliased(Comment)
+    reply_count = db.session.query(func.count(replies.id)).filter(
+        replies.parent_id == Comment.id,
+        replies.is_deleted == False  # noqa: E712
+    ).scalar_subquery()
+    Comment.query.update({Comment.reply_count: reply_count}, synchronize_session=False)
+    
+    db.session.commit()
+    
+    print("Comment counts recomputed.")
+
+@app.cli.command("build-import-keys")
+def build_import_keys():
+    """Fill Player.name_key and Club.import_source_key for rows created before imports keyed on them"""
+    from app.services.data_import import club_source_key
+    from app.utils import normalize_name
+    
+    def build(label, model, key_column, rows):
+        taken = {key for (key,) in db.session.query(key_column).filter(key_column.isnot(None))}
+        built = 0
+        duplicates = []
+        
+        # The lowest id keeps a contested key; later duplicates are listed for merging by hand
+        for item, key in rows:
+            if not key:
+                continue
+            if key in taken:
+                duplicates.append(item)
+                continue
+            setattr(item, key_column.key, key)
+            taken.add(key)
+            built += 1
+        
+        db.session.commit()
+        
+        print(f"Built keys for {built} {label}.")
+        for item in duplicates:
+            print(f"  duplicate: #{item.id} {item.name!r}")
+    
+    players = Player.query.filter(Player.name_key.is_(None)).order_by(Player.id)
+    build('players', Player, Player.name_key, ((player, normalize_name(player.name)) for player in players))
+    
+    brands = dict(db.session.query(ClubBrand.id, ClubBrand.name))
+    clubs = Club.query.filter(Club.import_source_key.is_(None)).order_by(Club.id)
+    build('clubs', Club, Club.import_source_key, (
+        (club, club_source_key({'name': club.name, 'brand': brands.get(club.brand_id)})) for club in clubs
+    ))
+
+@app.cli.command("resync-courses")
+@click.option('--max-age-hours', type=float, default=None, help='Resync courses last synced longer ago than this')
+@click.option('--batch-size', type=int, default=None)
+@click.option('--limit', type=int, default=None, help='Stop after this many courses')
+def resync_courses(max_age_hours, batch_size, limit):
+    """Refresh imported courses from GolfAPI, writing only what changed"""
+    from app.services.golf_api import GolfAPIService
+    
+    max_age = timedelta(hours=max_age_hours) if max_age_hours is not None else None
+    result = GolfAPIService().resync_courses(max_age=max_age, batch_size=batch_size, limit=limit)
+    print(result['message'])
+
+@app.cli.command("import-worker")
+@click.option('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the queue is empty')
+@click.option('--once', is_flag=True, help='Exit when the queue is empty')
+def import_worker(poll_interval, once):
+    """Run queued CSV and GolfAPI import jobs; start several for parallelism"""
+    from app.services.job_queue import run_worker
+    
+    run_worker(app, poll_interval=poll_interval, once=once)
+
 @app.cli.command("create-admin")
 def create_admin():
     """Create an admin user"""
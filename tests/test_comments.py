@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.user import Role, User
+from app.models.vote import Comment
+
+
+class CommentTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def app(tmp_path):
+    CommentTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['comment_test'] = CommentTestConfig
+    app = create_app('comment_test')
+    with app.app_context():
+        db.create_all()
+        Role._ids_by_name.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    Role._ids_by_name.clear()
+
+
+@pytest.fixture
+def statements(app):
+    executed = []
+
+    def count_statement(conn, cursor, statement, *_):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+
+def comment(user, content, parent=None, is_deleted=False):
+    comment = Comment(user=user, commentable_type='club', commentable_id=1, content=content,
+                      parent=parent, is_deleted=is_deleted)
+    db.session.add(comment)
+    db.session.flush()
+    return comment
+
+
+def get_page(client, **params):
+    params = {'commentable_type': 'club', 'commentable_id': 1, **params}
+    response = client.get('/api/votes/comments', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_page_nests_replies_of_every_depth_in_two_queries(app, statements):
+    user = User(username='rory', email='rory@example.com', password='secret-pw')
+    oldest = comment(user, 'oldest')
+    comment(user, 'reply on the next page', parent=oldest)
+    first = comment(user, 'first')
+    reply = comment(user, 'reply', parent=first)
+    comment(user, 'nested reply', parent=reply)
+    hidden = comment(user, 'deleted reply', parent=first, is_deleted=True)
+    comment(user, 'under a deleted reply', parent=hidden)
+    second = comment(user, 'second')
+    comment(user, 'another reply', parent=second)
+    db.session.commit()
+
+    client = app.test_client()
+    statements.clear()
+    page = get_page(client, limit=2)
+    assert len(statements) == 2, statements
+
+    assert [root['content'] for root in page['comments']] == ['second', 'first']
+    first_replies = page['comments'][1]['replies']
+    assert [node['content'] for node in first_replies] == ['reply']
+    assert [node['content'] for node in first_replies[0]['replies']] == ['nested reply']
+    assert page['comments'][0]['replies'][0]['content'] == 'another reply'
+
+    page = get_page(client, limit=2, cursor=page['next_cursor'])
+    assert [root['content'] for root in page['comments']] == ['oldest']
+    assert page['comments'][0]['replies'][0]['content'] == 'reply on the next page'
+    assert page['next_cursor'] is None
@@ -0,0 +1,104 @@
+import io
+
+import pytest
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.club import Club
+from app.models.player import Player, PlayerAchievement
+from app.services.data_import import DataImportService
+
+
+class ImportTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+
+
+@pytest.fixture
+def app(tmp_path):
+    ImportTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['import_test'] = ImportTestConfig
+    app = create_app('import_test')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def csv(text):
+    return io.BytesIO(text.encode())
+
+
+def test_duplicate_players_keep_the_first_spelling(app):
+    result = DataImportService.import_players_from_csv(csv(
+        'name,country,world_ranking\n'
+        'Rory McIlroy,,2\n'
+        '"rory mcilroy ",Northern Ireland,\n'
+    ))
+    assert result['inserted'] == 1
+
+    player = Player.query.one()
+    assert player.name == 'Rory McIlroy'
+    assert player.name_key == 'rory mcilroy'
+    # Data fields still merge, later non-null values winning
+    assert player.country == 'Northern Ireland'
+    assert player.world_ranking == 2
+
+
+def test_reimport_does_not_rename_existing_player(app):
+    DataImportService.import_players_from_csv(csv('name,country\nRory McIlroy,USA\n'))
+    result = DataImportService.import_players_from_csv(csv('name,country\nRORY MCILROY,Northern Ireland\n'))
+    assert result['updated'] == 1
+
+    player = Player.query.one()
+    assert player.name == 'Rory McIlroy'
+    assert player.country == 'Northern Ireland'
+
+
+def test_duplicate_clubs_keep_the_first_spelling(app):
+    result = DataImportService.import_clubs_from_csv(csv(
+        'name,brand,type,price\n'
+        'Stealth 2,TaylorMade,Driver,\n'
+        'STEALTH 2,taylormade,Driver,599.99\n'
+    ))
+    assert result['inserted'] == 1
+
+    club = Club.query.one()
+    assert club.name == 'Stealth 2'
+    assert club.brand.name == 'TaylorMade'
+    assert club.price == 599.99
+
+
+def test_out_of_range_numbers_are_row_errors(app):
+    result = DataImportService.import_kaggle_players_dataset(csv(
+        'Name,Country,WorldRanking,TurnedPro\n'
+        'Scottie Scheffler,USA,1,2018\n'
+        'Jon Rahm,Spain,1e30,2016\n'
+        'Xander Schauffele,USA,inf,2015\n'
+    ))
+    assert result['success'] is True
+    assert result['inserted'] == 1
+    assert result['errors'] == 2
+    assert [player.name for player in Player.query] == ['Scottie Scheffler']
+
+
+def test_blank_major_wins_keep_existing_achievement(app):
+    DataImportService.import_kaggle_players_dataset(csv(
+        'Name,Country,MajorWins\n'
+        'Rory McIlroy,Northern Ireland,4\n'
+        'Jon Rahm,Spain,2\n'
+    ))
+    assert PlayerAchievement.query.count() == 2
+
+    # A file without the column, then one with a blank cell and an updated count
+    DataImportService.import_kaggle_players_dataset(csv('Name,Country\nRory McIlroy,NIR\nJon Rahm,ESP\n'))
+    assert PlayerAchievement.query.count() == 2
+
+    DataImportService.import_kaggle_players_dataset(csv('Name,Country,MajorWins\nRory McIlroy,UK,\nJon Rahm,ES,3\n'))
+    descriptions = sorted(achievement.description for achievement in PlayerAchievement.query)
+    assert descriptions == ['Player has won 3 major tournaments', 'Player has won 4 major tournaments']
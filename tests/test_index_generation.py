@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.club import Club, ClubBrand, ClubType
+from app.models.course import Course
+from app.models.imports import IndexGeneration
+from app.models.user import Role, User
+from app.services.data_import import DataImportService
+from app.services.geo_index import CourseGeoIndex
+from app.services.suggest_index import SuggestIndex
+from app.services.tokens import token_service
+
+
+class IndexTestConfig(TestingConfig):
+    INDEX_GENERATION_CHECK_INTERVAL = 0
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def app(tmp_path):
+    # A file database, so the indexes below see each other's commits like separate processes would
+    IndexTestConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+    IndexTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['index_test'] = IndexTestConfig
+    app = create_app('index_test')
+    with app.app_context():
+        db.create_all()
+        Role._ids_by_name.clear()
+        yield app
+        db.session.remove()
+    Role._ids_by_name.clear()
+
+
+def test_web_index_sees_worker_import(app):
+    # The web process's own copy, built before the import ran elsewhere
+    web_index = SuggestIndex(app)
+    assert web_index.suggest('jpx') == []
+
+    csv_file = io.BytesIO(b'name,brand,type\nJPX 923,Mizuno,Iron Set\n')
+    assert DataImportService.import_clubs_from_csv(csv_file)['inserted'] == 1
+
+    assert [item['name'] for item in web_index.suggest('jpx')] == ['JPX 923']
+
+
+def test_web_index_sees_club_approved_in_another_process(app):
+    employee = User(username='staff', email='staff@example.com', password='secret-pw')
+    employee.role_id = Role.id_for(Role.EMPLOYEE_ROLE)
+    club = Club(name='Qi10 Max', brand=ClubBrand(name='TaylorMade'), club_type=ClubType(name='Driver'))
+    db.session.add_all([employee, club])
+    db.session.commit()
+
+    web_index = SuggestIndex(app)
+    assert web_index.suggest('qi10') == []
+
+    # The approving request is served by another worker with its own index
+    access_token = token_service.issue_tokens(employee)['access_token']
+    response = app.test_client().post(
+        f'/api/clubs/{club.id}/approve', headers={'Authorization': f'Bearer {access_token}'}
+    )
+    assert response.status_code == 200
+
+    assert [item['name'] for item in web_index.suggest('qi10')] == ['Qi10 Max']
+
+
+def test_generation_is_checked_once_per_interval(app):
+    web_index = CourseGeoIndex(app)
+    web_index.generation.interval = 3600
+    assert web_index.nearby(33.5, -82.0, 10) == []
+
+    db.session.add(Course(name='Augusta National', latitude=33.503, longitude=-82.020, is_approved=True))
+    IndexGeneration.bump('course_geo')
+    db.session.commit()
+    assert web_index.nearby(33.5, -82.0, 10) == []
+
+    web_index.generation.interval = 0
+    assert len(web_index.nearby(33.5, -82.0, 10)) == 1
+
+
+def test_bump_creates_and_advances_the_row(app):
+    assert IndexGeneration.current('suggest') == 0
+    IndexGeneration.bump('suggest')
+    IndexGeneration.bump('suggest')
+    db.session.commit()
+    assert IndexGeneration.current('suggest') == 2
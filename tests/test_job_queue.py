@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import (
+    CANCELLED, QUEUED, RUNNING, SUCCEEDED, JobHeartbeat, job_queue, run_worker
+)
+
+
+class JobQueueTestConfig(TestingConfig):
+    IMPORT_JOB_STALE_AFTER = 0.3
+
+
+@pytest.fixture
+def app(tmp_path):
+    JobQueueTestConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+    JobQueueTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['job_queue_test'] = JobQueueTestConfig
+    app = create_app('job_queue_test')
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def upload(tmp_path, text='name\nRory McIlroy\n'):
+    path = tmp_path / 'upload.csv'
+    path.write_text(text)
+    return str(path)
+
+
+def test_requeued_job_belongs_to_its_new_worker(app):
+    job_id = job_queue.submit('players_csv')
+    job_queue.claim('worker-a')
+    time.sleep(0.4)
+    assert job_queue.requeue_stale() == 1
+    assert job_queue.claim('worker-b')['id'] == job_id
+
+    # The first worker is told to stop and cannot overwrite the outcome
+    assert job_queue.update_progress(job_id, 10, worker_id='worker-a') is True
+    assert not job_queue.finish(job_id, SUCCEEDED, worker_id='worker-a')
+    assert job_queue.get(job_id)['status'] == RUNNING
+
+    assert job_queue.update_progress(job_id, 10, worker_id='worker-b') is False
+    assert job_queue.finish(job_id, SUCCEEDED, worker_id='worker-b')
+    assert job_queue.get(job_id)['status'] == SUCCEEDED
+
+
+def test_heartbeat_keeps_a_slow_job_claimed(app):
+    job_id = job_queue.submit('players_csv')
+    job_queue.claim('worker-a')
+    with JobHeartbeat(job_queue, job_id, 'worker-a', 0.05):
+        time.sleep(0.5)
+        assert job_queue.requeue_stale() == 0
+    time.sleep(0.4)
+    assert job_queue.requeue_stale() == 1
+    assert job_queue.get(job_id)['status'] == QUEUED
+
+
+def test_worker_runs_job_and_removes_upload(app, tmp_path):
+    file_path = upload(tmp_path)
+    job_id = job_queue.submit('players_csv', file_path=file_path)
+    run_worker(app, once=True)
+
+    job = job_queue.get(job_id)
+    assert job['status'] == SUCCEEDED
+    assert job['processed'] == 1
+    assert not (tmp_path / 'upload.csv').exists()
+
+
+def test_worker_leaves_a_stolen_job_and_its_upload_alone(app, tmp_path, monkeypatch):
+    file_path = upload(tmp_path)
+    job_id = job_queue.submit('players_csv', file_path=file_path)
+
+    def stolen(job, progress):
+        # Requeued as stale and claimed by another worker mid-run
+        job_queue._connect().execute(
+            'UPDATE import_jobs SET worker_id = ? WHERE id = ?', ('worker-b', job['id'])
+        )
+        progress.interval = 0
+        progress(1)
+
+    monkeypatch.setattr(job_queue_module, '_run_job', stolen)
+    run_worker(app, once=True)
+
+    job = job_queue.get(job_id)
+    assert job['status'] == RUNNING
+    assert job['worker_id'] == 'worker-b'
+    assert (tmp_path / 'upload.csv').exists()
+
+
+def test_cancelled_job_is_recorded(app, tmp_path, monkeypatch):
+    file_path = upload(tmp_path)
+    job_id = job_queue.submit('players_csv', file_path=file_path)
+
+    def cancelled(job, progress):
+        job_queue.cancel(job['id'])
+        progress.interval = 0
+        progress(1)
+
+    monkeypatch.setattr(job_queue_module, '_run_job', cancelled)
+    run_worker(app, once=True)
+
+    assert job_queue.get(job_id)['status'] == CANCELLED
+    assert not (tmp_path / 'upload.csv').exists()
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from app.services.oauth_metadata import ProviderMetadataCache
+from benchmarks.oidc_standin import start_server
+
+
+@pytest.fixture
+def provider():
+    server, discovery_url = start_server(max_age=3600)
+    yield server, discovery_url
+    server.shutdown()
+
+
+def test_cache_dir_is_created_on_first_fetch(provider, tmp_path):
+    _, discovery_url = provider
+    cache_dir = tmp_path / 'oauth_cache'
+    cache = ProviderMetadataCache(discovery_url, str(cache_dir))
+    assert not cache_dir.exists()
+
+    entry = cache.get()
+    assert entry['metadata']['jwks_uri'].endswith('/jwks')
+    assert entry['jwks']['keys'][0]['kid'] == 'standin-1'
+    assert cache_dir.exists()
+
+
+def test_workers_share_the_disk_copy(provider, tmp_path):
+    server, discovery_url = provider
+    ProviderMetadataCache(discovery_url, str(tmp_path)).get()
+    ProviderMetadataCache(discovery_url, str(tmp_path)).get()
+    assert server.state.counts['discovery'] == 1
+    assert server.state.counts['jwks'] == 1
+
+
+def test_forced_refresh_picks_up_rotated_keys(provider, tmp_path):
+    server, discovery_url = provider
+    cache = ProviderMetadataCache(discovery_url, str(tmp_path))
+    cache.get()
+    server.state.rotate_keys()
+
+    assert cache.get()['jwks']['keys'][0]['kid'] == 'standin-1'
+    assert cache.refresh(force=True)['jwks']['keys'][0]['kid'] == 'standin-2'
+
+
+def test_stale_copy_is_served_when_provider_fails(provider, tmp_path):
+    server, discovery_url = provider
+    cache = ProviderMetadataCache(discovery_url, str(tmp_path))
+    cached = cache.get()
+    server.state.error_rate = 1.0
+
+    entry = cache.refresh(force=True)
+    assert entry['metadata'] == cached['metadata']
+    assert entry['refresh_at'] > time.time()
+
+
+def test_background_refresh_does_not_block_logins(tmp_path):
+    server, discovery_url = start_server(latency_ms=300, max_age=2)
+    try:
+        cache = ProviderMetadataCache(discovery_url, str(tmp_path), refresh_margin=1)
+        cache.get()
+        time.sleep(1.1)  # into the refresh window, before expiry
+
+        cache.get()  # starts the background refresh
+        start = time.perf_counter()
+        for _ in range(5):
+            cache.get()
+        assert time.perf_counter() - start < 0.1
+    finally:
+        server.shutdown()
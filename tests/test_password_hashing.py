@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.pool import StaticPool
+from werkzeug.security import generate_password_hash
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.user import User
+from app.services.password_hashing import HasherBusy, password_hasher
+
+
+class HashingTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256'
+
+
+@pytest.fixture
+def app(tmp_path):
+    HashingTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['hashing_test'] = HashingTestConfig
+    app = create_app('hashing_test')
+    with app.app_context():
+        yield app
+
+
+def test_short_method_setting_does_not_rehash_fresh_hashes(app):
+    # Stored as 'pbkdf2:sha256:<iterations>', not as configured
+    password_hash = password_hasher.hash('secret-pw')
+    assert not password_hasher.needs_rehash(password_hash)
+    assert password_hasher.needs_rehash('pbkdf2:sha256:1000$salt$abc')
+
+
+def test_busy_pool_skips_the_upgrade_but_not_the_login(app, monkeypatch):
+    user = User(username='rory', email='rory@example.com')
+    user.password_hash = generate_password_hash('secret-pw', 'pbkdf2:sha256:1000')
+
+    def busy(password):
+        raise HasherBusy()
+
+    monkeypatch.setattr(password_hasher, 'hash', busy)
+    assert user.verify_password('secret-pw')
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
@@ -0,0 +1,18 @@
+from app.services import rate_limit
+from app.services.rate_limit import TokenBucketLimiter
+
+
+def test_prune_keeps_buckets_of_slower_scopes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, '_monotonic', lambda: now[0])
+    limiter = TokenBucketLimiter(max_keys=2)
+
+    # The comment scope refills in 25s, the vote scope in 1s
+    for _ in range(5):
+        assert limiter.hit('comment:ip:1', 0.2, 5) == 0.0
+    assert limiter.hit('vote:ip:1', 20.0, 20) == 0.0
+
+    # A new vote bucket fills the table and prunes; the comment bucket is still empty
+    now[0] += 2
+    assert limiter.hit('vote:ip:2', 20.0, 20) == 0.0
+    assert limiter.hit('comment:ip:1', 0.2, 5) > 0.0
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.user import Role, User
+
+
+class SignupTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+@pytest.fixture
+def app(tmp_path):
+    SignupTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['signup_test'] = SignupTestConfig
+    app = create_app('signup_test')
+    with app.app_context():
+        db.create_all()
+        Role._ids_by_name.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    Role._ids_by_name.clear()
+
+
+@pytest.fixture
+def statements(app):
+    executed = []
+
+    def count_statement(conn, cursor, statement, *_):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+
+def register(client, username, email):
+    return client.post('/auth/api/register', json={'username': username, 'email': email, 'password': 'secret-pw'})
+
+
+def test_warm_signup_is_one_query(app, statements):
+    client = app.test_client()
+    assert register(client, 'first', 'first@example.com').status_code == 201
+
+    statements.clear()
+    assert register(client, 'second', 'second@example.com').status_code == 201
+    assert len(statements) == 1, statements
+    assert statements[0].startswith('INSERT INTO users')
+
+
+def test_conflicting_signup_names_the_field(app, statements):
+    client = app.test_client()
+    register(client, 'taken', 'taken@example.com')
+
+    statements.clear()
+    response = register(client, 'other', 'taken@example.com')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    # The failed insert plus one lookup to name the conflict
+    assert len(statements) == 2, statements
+
+    response = register(client, 'taken', 'new@example.com')
+    assert response.status_code == 400
+    assert User.query.count() == 1
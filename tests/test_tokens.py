@@ -0,0 +1,102 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.pool import StaticPool
+
+from app import create_app, db
+from app.config import TestingConfig, config_by_name
+from app.models.user import Role
+from app.services import tokens
+from app.services.tokens import token_service
+
+
+class TokenTestConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_REVOCATION_REFRESH = 0
+
+
+class Clock:
+    """Shifts time.time() and datetime.utcnow() as seen by the token service"""
+
+    def __init__(self, monkeypatch):
+        self.offset = 0
+        real_time = time.time
+        clock = self
+
+        class ShiftedDatetime(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime.utcfromtimestamp(real_time() + clock.offset)
+
+        monkeypatch.setattr(tokens.time, 'time', lambda: real_time() + self.offset)
+        monkeypatch.setattr(tokens, 'datetime', ShiftedDatetime)
+
+    def advance(self, seconds):
+        self.offset += seconds
+
+
+@pytest.fixture
+def app(tmp_path):
+    TokenTestConfig.IMPORT_QUEUE_PATH = str(tmp_path / 'jobs.db')
+    config_by_name['token_test'] = TokenTestConfig
+    app = create_app('token_test')
+    with app.app_context():
+        db.create_all()
+        Role._ids_by_name.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    Role._ids_by_name.clear()
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post('/auth/api/register', json={'username': 'rory', 'email': 'rory@example.com', 'password': 'secret-pw'})
+    return client
+
+
+def login(client):
+    response = client.post('/auth/api/login', json={'email': 'rory@example.com', 'password': 'secret-pw'})
+    return response.get_json()['refresh_token']
+
+
+def refresh(client, refresh_token):
+    return client.post('/auth/api/token/refresh', json={'refresh_token': refresh_token})
+
+
+def test_reused_family_stays_revoked_after_the_reused_token_expires(client, monkeypatch):
+    clock = Clock(monkeypatch)
+    original = login(client)
+
+    clock.advance(1800)
+    rotated = refresh(client, original).get_json()['refresh_token']
+
+    # Replaying the rotated-out token revokes the whole family
+    clock.advance(100)
+    assert refresh(client, original).status_code == 401
+
+    # Past the original token's exp, but not the rotated one's; pruning must not drop the family
+    clock.advance(2000)
+    token_service.revoke('unrelated', int(tokens.time.time()) + 60)
+    assert refresh(client, rotated).status_code == 401
+
+
+def test_revoked_family_outlives_the_presented_token(client, monkeypatch):
+    clock = Clock(monkeypatch)
+    original = login(client)
+
+    clock.advance(1800)
+    rotated = refresh(client, original).get_json()['refresh_token']
+    assert client.post('/auth/api/token/revoke', json={'refresh_token': rotated}).status_code == 200
+
+    clock.advance(3000)
+    token_service.revoke('unrelated', int(tokens.time.time()) + 60)
+    assert refresh(client, rotated).status_code == 401